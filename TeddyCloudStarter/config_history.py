@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Configuration history for TeddyCloudStarter.
+Stores compressed, deduplicated snapshots of config.json with an index of
+timestamps, versions and changed keys.
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config_manager import GENERATION_KEY, write_file_atomic
+from .utilities.logger import logger
+
+DEFAULT_HISTORY_LIMIT = 50
+
+# Keys that change on every save and should not make two snapshots distinct
+VOLATILE_KEYS = ("last_modified", GENERATION_KEY)
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+class ConfigHistory:
+    """
+    Compressed, deduplicated history of a configuration file.
+
+    Snapshots are stored once per distinct content under ``objects/`` and
+    referenced from ``index.json``. Each index entry keeps a digest per
+    top-level key, so listing and diffing never need to open a snapshot and
+    restoring reads exactly one object.
+    """
+
+    def __init__(self, config_path, limit: int = DEFAULT_HISTORY_LIMIT):
+        """
+        Initialize the configuration history.
+
+        Args:
+            config_path: Path to the configuration file
+            limit: Maximum number of history entries to keep
+        """
+        self.config_path = str(config_path)
+        self.history_dir = Path(os.path.dirname(self.config_path)) / "history"
+        self.objects_dir = self.history_dir / "objects"
+        self.index_path = self.history_dir / "index.json"
+        self.limit = limit
+        self._index: Optional[List[Dict[str, Any]]] = None
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        if self._index is None:
+            self._index = []
+            if self.index_path.exists():
+                try:
+                    with open(self.index_path, "r", encoding="utf-8") as f:
+                        self._index = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.error(f"Could not read config history index: {e}")
+            self._migrate_legacy_backups()
+        return self._index
+
+    def _write_index(self) -> None:
+        write_file_atomic(self.index_path, json.dumps(self._index, indent=2))
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / f"{digest}.json.gz"
+
+    def _migrate_legacy_backups(self) -> None:
+        """
+        Import config.json.backup.<epoch> copies into the history.
+
+        The legacy files are only removed once the index referencing them is
+        written. The migration itself applies no retention, so every legacy
+        backup is listed at least once; the next recorded entry applies the
+        normal limit to migrated entries as well.
+        """
+        config_dir = Path(os.path.dirname(self.config_path))
+        pattern = f"{os.path.basename(self.config_path)}.backup.*"
+        legacy = sorted(config_dir.glob(pattern))
+        if not legacy:
+            return
+        logger.info(f"Migrating {len(legacy)} legacy configuration backups.")
+        migrated = []
+        for backup_path in legacy:
+            try:
+                timestamp = int(backup_path.name.rsplit(".", 1)[-1])
+            except ValueError:
+                timestamp = int(backup_path.stat().st_mtime)
+            try:
+                with open(backup_path, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping unreadable backup {backup_path}: {e}")
+                continue
+            self._add_entry(config, timestamp)
+            migrated.append(backup_path)
+        self._index.sort(key=lambda entry: entry["timestamp"])
+        self._write_index()
+        for backup_path in migrated:
+            try:
+                backup_path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove migrated backup {backup_path}: {e}")
+
+    def _add_entry(self, config: Dict[str, Any], timestamp: float) -> Dict[str, Any]:
+        stable = {k: v for k, v in config.items() if k not in VOLATILE_KEYS}
+        digest = _digest(stable)
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = object_path.with_suffix(".tmp")
+            with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+                json.dump(config, f, separators=(",", ":"))
+            os.replace(temp_path, object_path)
+
+        key_digests = {key: _digest(value)[:16] for key, value in stable.items()}
+        previous = self._index[-1]["keys"] if self._index else {}
+        changed = sorted(
+            key
+            for key in set(previous) | set(key_digests)
+            if previous.get(key) != key_digests.get(key)
+        )
+        entry = {
+            "id": f"{int(timestamp)}-{digest[:8]}",
+            "timestamp": timestamp,
+            "version": config.get("version", ""),
+            "hash": digest,
+            "changed_keys": changed,
+            "keys": key_digests,
+        }
+        self._index.append(entry)
+        return entry
+
+    def _apply_retention(self) -> None:
+        if self.limit and len(self._index) > self.limit:
+            removed = self._index[: len(self._index) - self.limit]
+            self._index = self._index[len(self._index) - self.limit :]
+            referenced = {entry["hash"] for entry in self._index}
+            for entry in removed:
+                if entry["hash"] not in referenced:
+                    try:
+                        self._object_path(entry["hash"]).unlink()
+                    except OSError:
+                        pass
+            logger.debug(f"Config history retention removed {len(removed)} entries.")
+
+    def record(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a configuration snapshot.
+
+        A snapshot identical to the latest entry is not recorded again.
+
+        Args:
+            config: The configuration dictionary
+
+        Returns:
+            Dict[str, Any]: The index entry for the snapshot
+        """
+        index = self._load_index()
+        stable = {k: v for k, v in config.items() if k not in VOLATILE_KEYS}
+        if index and index[-1]["hash"] == _digest(stable):
+            logger.debug("Configuration unchanged since last history entry.")
+            return index[-1]
+        entry = self._add_entry(config, time.time())
+        self._apply_retention()
+        self._write_index()
+        logger.info(f"Configuration history entry {entry['id']} recorded.")
+        return entry
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        List history entries, newest first.
+
+        Returns:
+            List[Dict[str, Any]]: Index entries
+        """
+        return list(reversed(self._load_index()))
+
+    def get_entry(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry with the given id, if any."""
+        for entry in self._load_index():
+            if entry["id"] == entry_id:
+                return entry
+        return None
+
+    def load(self, entry_id: str) -> Dict[str, Any]:
+        """
+        Load the configuration snapshot of a history entry.
+
+        Args:
+            entry_id: The history entry id
+
+        Returns:
+            Dict[str, Any]: The configuration dictionary
+
+        Raises:
+            KeyError: If the entry does not exist
+        """
+        entry = self.get_entry(entry_id)
+        if entry is None:
+            raise KeyError(entry_id)
+        with gzip.open(self._object_path(entry["hash"]), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def diff_keys(self, entry_id: str, config: Dict[str, Any]) -> List[str]:
+        """
+        List the top-level keys that differ between an entry and a config.
+
+        Args:
+            entry_id: The history entry id
+            config: The configuration to compare against
+
+        Returns:
+            List[str]: Sorted list of differing top-level keys
+        """
+        entry = self.get_entry(entry_id)
+        if entry is None:
+            raise KeyError(entry_id)
+        current = {
+            key: _digest(value)[:16]
+            for key, value in config.items()
+            if key not in VOLATILE_KEYS
+        }
+        stored = entry["keys"]
+        return sorted(
+            key
+            for key in set(stored) | set(current)
+            if stored.get(key) != current.get(key)
+        )
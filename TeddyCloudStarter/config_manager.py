@@ -2,13 +2,16 @@
 """
 Configuration management for TeddyCloudStarter.
 """
+import copy
 import datetime
 import json
 import os
-import shutil
-import time
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from rich.console import Console
 
@@ -21,6 +24,240 @@ DEFAULT_CONFIG_PATH = os.path.join(
     str(Path.home()), ".teddycloudstarter", "config.json"
 )
 
+# Number of journal entries after which the journal is folded into config.json
+JOURNAL_COMPACT_ENTRIES = 50
+
+# Save counter stored in config.json and in every journal entry; journal
+# entries at or below the generation of config.json are already part of it
+GENERATION_KEY = "config_generation"
+
+
+def write_file_atomic(path, data: str) -> None:
+    """
+    Write a text file atomically.
+
+    The data is written to a temporary file in the same directory, flushed and
+    fsynced, then renamed over the target so readers never see a partial file.
+
+    Args:
+        path: Destination file path
+        data: Text content to write
+    """
+    path = str(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+class ConfigStore:
+    """
+    Process-wide in-memory store for one configuration file.
+
+    All ConfigManager instances for the same path share one store, so they
+    see the same configuration dictionary. The file is only parsed again when
+    its modification time or size changes, and subscribers are notified with
+    the set of top-level keys that changed.
+    """
+
+    _instances: Dict[str, "ConfigStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self.journal_path = f"{config_path}.journal"
+        self.journal_entries = 0
+        self._config: Optional[Dict[str, Any]] = None
+        self._committed: Dict[str, Any] = {}
+        self._stamp: Optional[Tuple] = None
+        self._lock = threading.RLock()
+        self._subscribers: List[Callable[[Dict[str, Any], Set[str]], None]] = []
+        # Transactions belong to the thread that opened them, so saves from
+        # background threads are neither deferred nor rolled back with them
+        self._tx = threading.local()
+
+    def _tx_state(self) -> threading.local:
+        tx = self._tx
+        if not hasattr(tx, "depth"):
+            tx.depth = 0
+            tx.dirty = False
+            tx.failed = False
+            tx.snapshot = None
+        return tx
+
+    @classmethod
+    def for_path(cls, config_path) -> "ConfigStore":
+        """Return the shared store for a configuration file path."""
+        key = os.path.abspath(str(config_path))
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls(str(config_path))
+                cls._instances[key] = store
+            return store
+
+    @staticmethod
+    def _stat(path) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _file_stamp(self) -> Optional[Tuple]:
+        config_stamp = self._stat(self.config_path)
+        journal_stamp = self._stat(self.journal_path)
+        if config_stamp is None and journal_stamp is None:
+            return None
+        return config_stamp, journal_stamp
+
+    @property
+    def committed(self) -> Dict[str, Any]:
+        """The configuration as last read from or written to disk."""
+        return self._committed
+
+    @property
+    def in_transaction(self) -> bool:
+        """True while the calling thread has a transaction open on this store."""
+        return self._tx_state().depth > 0
+
+    def begin(self) -> None:
+        """Open a (possibly nested) transaction for the calling thread."""
+        tx = self._tx_state()
+        with self._lock:
+            if tx.depth == 0:
+                tx.snapshot = copy.deepcopy(self._config)
+                tx.dirty = False
+            tx.depth += 1
+
+    def defer_save(self) -> None:
+        """Record that a save was requested inside the open transaction."""
+        self._tx_state().dirty = True
+
+    def end(self, failed: bool = False) -> bool:
+        """
+        Close a transaction level.
+
+        A failure at any level aborts the whole transaction: when the
+        outermost level closes, the in-memory configuration is restored to
+        the state at the start of the transaction.
+
+        Args:
+            failed: True if the block being closed raised an exception
+
+        Returns:
+            bool: True if the outermost level closed with changes to write
+        """
+        tx = self._tx_state()
+        with self._lock:
+            tx.failed = tx.failed or failed
+            tx.depth -= 1
+            if tx.depth > 0:
+                return False
+            commit = tx.dirty and not tx.failed
+            if tx.failed and tx.snapshot is not None and self._config is not None:
+                self._config.clear()
+                self._config.update(tx.snapshot)
+            tx.dirty = False
+            tx.failed = False
+            tx.snapshot = None
+            return commit
+
+    def get(self, loader: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached configuration, reloading it if the file changed.
+
+        Args:
+            loader: Callable that parses the file or returns defaults
+
+        Returns:
+            Dict[str, Any]: The shared configuration dictionary
+        """
+        with self._lock:
+            stamp = self._file_stamp()
+            if self._config is None or stamp != self._stamp:
+                logger.debug(f"Config store reloading {self.config_path}")
+                self._config = loader()
+                self._stamp = stamp
+                self._commit_snapshot()
+            return self._config
+
+    def replace(self, config: Dict[str, Any]) -> None:
+        """Replace the in-memory configuration without writing it."""
+        with self._lock:
+            self._config = config
+
+    def mark_written(self) -> None:
+        """Record that the in-memory configuration was written to disk."""
+        with self._lock:
+            self._stamp = self._file_stamp()
+            self._commit_snapshot()
+
+    def invalidate(self) -> None:
+        """Force the next access to reload the configuration file."""
+        with self._lock:
+            self._config = None
+
+    def subscribe(self, callback: Callable[[Dict[str, Any], Set[str]], None]) -> None:
+        """
+        Register a callback for configuration changes.
+
+        Args:
+            callback: Called with the configuration and the changed top-level keys
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _commit_snapshot(self) -> None:
+        previous = self._committed
+        current = copy.deepcopy(self._config)
+        self._committed = current
+        changed = {
+            key
+            for key in set(previous) | set(current)
+            if key not in ("last_modified", GENERATION_KEY)
+            and previous.get(key) != current.get(key)
+        }
+        if not changed or not previous:
+            return
+        logger.debug(f"Configuration keys changed: {sorted(changed)}")
+        for callback in list(self._subscribers):
+            try:
+                callback(self._config, changed)
+            except Exception as e:
+                logger.error(f"Config subscriber {callback} failed: {e}")
+
 
 class ConfigManager:
     """Manages the configuration for TeddyCloudStarter."""
@@ -29,9 +266,141 @@ class ConfigManager:
         logger.debug(f"Initializing ConfigManager with config_path={config_path}, translator={translator}")
         self.config_path = config_path
         self.translator = translator
-        self.config = self._load_config()
+        self._store = ConfigStore.for_path(config_path)
+        self._store.get(self._load_config)
         logger.info("ConfigManager initialized.")
 
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The shared configuration, reloaded only when the file changed."""
+        return self._store.get(self._load_config)
+
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._store.replace(value)
+
+    def subscribe(self, callback) -> None:
+        """Register a callback invoked with (config, changed_keys) on changes."""
+        self._store.subscribe(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Remove a change callback."""
+        self._store.unsubscribe(callback)
+
+    def reload(self) -> Dict[str, Any]:
+        """Discard the in-memory configuration and read the file again.
+
+        Returns:
+            Dict[str, Any]: The reloaded configuration dictionary
+        """
+        logger.debug(f"Forcing reload of {self.config_path}")
+        self._store.invalidate()
+        return self.config
+
+    @contextmanager
+    def transaction(self):
+        """
+        Batch configuration changes into a single write.
+
+        save() calls made inside the block on the same thread, by this or any
+        other ConfigManager for the same file, only mark the configuration
+        dirty. The outermost
+        block writes it once on exit. If the block raises, the in-memory
+        configuration is rolled back and nothing is written.
+
+        Yields:
+            Dict[str, Any]: The shared configuration dictionary
+        """
+        self._store.begin()
+        try:
+            yield self.config
+        except BaseException:
+            logger.warning("Configuration transaction failed, rolling back.")
+            self._store.end(failed=True)
+            raise
+        if self._store.end():
+            self.save()
+
+    def _journal_enabled(self, config) -> bool:
+        return bool(config.get("app_settings", {}).get("config_journal", False))
+
+    def _replay_journal(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply journal entries written after the last full save.
+
+        Entries whose generation is not newer than config.json are skipped;
+        they remain when a full save crashed before removing the journal.
+        """
+        entries = 0
+        skipped = 0
+        journal_path = self._store.journal_path
+        if os.path.exists(journal_path):
+            with open(journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Ignoring incomplete config journal entry.")
+                        break
+                    entries += 1
+                    generation = entry.get("generation")
+                    if generation is not None and generation <= config.get(GENERATION_KEY, -1):
+                        skipped += 1
+                        continue
+                    config.update(entry.get("set", {}))
+                    for key in entry.get("unset", []):
+                        config.pop(key, None)
+                    if generation is not None:
+                        config[GENERATION_KEY] = generation
+            logger.debug(f"Replayed {entries - skipped} config journal entries, skipped {skipped}.")
+        self._store.journal_entries = entries
+        return config
+
+    def _append_journal(self, config: Dict[str, Any]) -> bool:
+        """
+        Append the top-level changes since the last write to the journal.
+
+        Returns:
+            bool: True if the change was journaled, False if a full write is needed
+        """
+        committed = self._store.committed
+        if (
+            not committed
+            or not os.path.exists(self.config_path)
+            or self._store.journal_entries >= JOURNAL_COMPACT_ENTRIES
+        ):
+            return False
+        entry = {
+            "generation": config[GENERATION_KEY],
+            "set": {
+                k: v
+                for k, v in config.items()
+                if k != GENERATION_KEY and committed.get(k) != v
+            },
+            "unset": [k for k in committed if k not in config],
+        }
+        with open(self._store.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._store.journal_entries += 1
+        return True
+
+    def compact(self) -> None:
+        """Fold pending journal entries into config.json."""
+        if os.path.exists(self._store.journal_path):
+            write_file_atomic(self.config_path, json.dumps(self.config, indent=2))
+            os.remove(self._store.journal_path)
+            self._store.journal_entries = 0
+            self._store.mark_written()
+            logger.debug(f"Config journal compacted into {self.config_path}")
+
+    def recreate_config(self, translator=None):
+        """Reload the configuration from disk, optionally switching translator."""
+        if translator is not None:
+            self.translator = translator
+        return self.reload()
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or return defaults.
 
@@ -43,8 +412,9 @@ class ConfigManager:
             try:
                 with open(self.config_path, "r") as f:
                     config = json.load(f)
-                    logger.info(f"Configuration loaded from {self.config_path}")
-                    return config
+                config = self._replay_journal(config)
+                logger.info(f"Configuration loaded from {self.config_path}")
+                return config
             except json.JSONDecodeError:
                 error_msg = "Error loading config file. Using defaults."
                 logger.error(error_msg)
@@ -82,58 +452,86 @@ class ConfigManager:
         return default_config
 
     def save(self):
-        """Save current configuration to file."""
+        """Save current configuration to file.
+
+        Inside a transaction the write is deferred to the end of the
+        outermost transaction block.
+        """
+        if self._store.in_transaction:
+            logger.debug("Save deferred until the configuration transaction ends.")
+            self._store.defer_save()
+            return
         logger.debug(f"Saving configuration to {self.config_path}")
-        self.config["version"] = __version__
-        self.config["last_modified"] = datetime.datetime.now().isoformat()
-        if "metadata" not in self.config:
+        config = self.config
+        config["version"] = __version__
+        config["last_modified"] = datetime.datetime.now().isoformat()
+        config[GENERATION_KEY] = int(config.get(GENERATION_KEY, 0)) + 1
+        if "metadata" not in config:
             logger.debug("Adding default metadata to config.")
-            self.config["metadata"] = {
+            config["metadata"] = {
                 "config_version": "1.0",
                 "description": "TeddyCloudStarter configuration",
             }
-        if "environment" not in self.config:
+        if "environment" not in config:
             logger.debug("Adding default environment to config.")
             hostname = (
                 os.environ.get("COMPUTERNAME")
                 or os.environ.get("HOSTNAME")
                 or "unknown"
             )
-            self.config["environment"] = {
+            config["environment"] = {
                 "type": "development",
                 "hostname": hostname,
                 "creation_date": datetime.datetime.now().isoformat(),
             }
-        if "user_info" not in self.config:
+        if "user_info" not in config:
             logger.debug("Adding default user_info to config.")
             current_user = (
                 os.environ.get("USERNAME") or os.environ.get("USER") or "unknown"
             )
-            self.config["user_info"] = {"modified_by": current_user}
-        if "app_settings" not in self.config:
+            config["user_info"] = {"modified_by": current_user}
+        if "app_settings" not in config:
             logger.debug("Adding default app_settings to config.")
-            self.config["app_settings"] = {
+            config["app_settings"] = {
                 "log_level": "critical",
                 "log_console": True,
                 "log_path": "",
                 "auto_update": True,
             }
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, "w") as f:
-            json.dump(self.config, f, indent=2)
+        if not (self._journal_enabled(config) and self._append_journal(config)):
+            write_file_atomic(self.config_path, json.dumps(config, indent=2))
+            if os.path.exists(self._store.journal_path):
+                os.remove(self._store.journal_path)
+            self._store.journal_entries = 0
         logger.info(f"Configuration saved to {self.config_path}")
         save_msg = f"Configuration saved to {self.config_path}"
         if self.translator:
             save_msg = self.translator.get(save_msg)
         console.print(f"[bold green]{save_msg}[/]")
-        self.config = self._load_config()
+        self._store.mark_written()
+
+    def history(self):
+        """
+        Get the configuration history for this configuration file.
+
+        Returns:
+            ConfigHistory: The history, limited by app_settings.config_history_limit
+        """
+        from .config_history import DEFAULT_HISTORY_LIMIT, ConfigHistory
+
+        limit = self.config.get("app_settings", {}).get(
+            "config_history_limit", DEFAULT_HISTORY_LIMIT
+        )
+        return ConfigHistory(self.config_path, limit=limit)
 
     def backup(self):
-        """Create a backup of the current configuration."""
+        """Record the current configuration in the configuration history."""
         logger.debug(f"Creating backup for configuration at {self.config_path}")
         if os.path.exists(self.config_path):
-            backup_path = f"{self.config_path}.backup.{int(time.time())}"
-            shutil.copy2(self.config_path, backup_path)
+            self.compact()
+            history = self.history()
+            entry = history.record(self.config)
+            backup_path = f"{history.history_dir} ({entry['id']})"
             logger.info(f"Backup created at {backup_path}")
             backup_msg = f"Backup created at {backup_path}"
             if self.translator:
@@ -144,11 +542,53 @@ class ConfigManager:
         else:
             logger.warning(f"No configuration file found at {self.config_path} to backup.")
 
+    def restore(self, entry_id: str) -> Tuple[bool, str]:
+        """
+        Restore the configuration from a history entry.
+
+        The current configuration is recorded first so the restore can be undone.
+
+        Args:
+            entry_id: The history entry id
+
+        Returns:
+            Tuple[bool, str]: (success, error_message)
+        """
+        history = self.history()
+        try:
+            snapshot = history.load(entry_id)
+        except KeyError:
+            error = f"Configuration history entry {entry_id} does not exist"
+            logger.error(error)
+            return False, error
+        except (OSError, ValueError) as e:
+            error = f"Could not load configuration history entry {entry_id}: {e}"
+            logger.error(error)
+            return False, error
+        try:
+            if os.path.exists(self.config_path):
+                self.compact()
+                history.record(self.config)
+            # Newer than any journal entry left behind if the removal below fails
+            snapshot[GENERATION_KEY] = int(self.config.get(GENERATION_KEY, 0)) + 1
+            write_file_atomic(self.config_path, json.dumps(snapshot, indent=2))
+            if os.path.exists(self._store.journal_path):
+                os.remove(self._store.journal_path)
+        except OSError as e:
+            error = f"Could not write {self.config_path}: {e}"
+            logger.error(error)
+            return False, error
+        self.reload()
+        logger.success(f"Configuration restored from history entry {entry_id}")
+        return True, ""
+
     def delete(self):
         """Delete the configuration file."""
         logger.debug(f"Deleting configuration file at {self.config_path}")
         if os.path.exists(self.config_path):
             os.remove(self.config_path)
+            if os.path.exists(self._store.journal_path):
+                os.remove(self._store.journal_path)
             logger.info(f"Configuration file {self.config_path} deleted")
             delete_msg = f"Configuration file {self.config_path} deleted"
             if self.translator:
@@ -156,7 +596,7 @@ class ConfigManager:
                     "Configuration file {path} deleted"
                 ).format(path=self.config_path)
             console.print(f"[bold red]{delete_msg}[/]")
-            self.config = self._load_config()
+            self.reload()
         else:
             logger.warning(f"No configuration file found at {self.config_path} to delete.")
 
@@ -173,18 +613,11 @@ class ConfigManager:
         """
         logger.debug(f"Getting auto_update setting from {config_path}")
         if os.path.exists(config_path):
-            try:
-                with open(config_path, "r") as f:
-                    config = json.load(f)
-                    logger.debug("Configuration file loaded for auto_update setting.")
-                    if (
-                        "app_settings" in config
-                        and "auto_update" in config["app_settings"]
-                    ):
-                        logger.info(f"auto_update setting found: {config['app_settings']['auto_update']}")
-                        return config["app_settings"]["auto_update"]
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.error(f"Error reading auto_update setting: {e}")
+            config = ConfigManager(config_path=config_path).config
+            app_settings = config.get("app_settings", {})
+            if "auto_update" in app_settings:
+                logger.info(f"auto_update setting found: {app_settings['auto_update']}")
+                return app_settings["auto_update"]
         else:
             logger.warning(f"No configuration file found at {config_path} for auto_update setting.")
         logger.info("auto_update setting not found, returning False.")
@@ -231,7 +664,7 @@ class ConfigManager:
     def reset_config(self):
         """Reset the configuration to default values."""
         logger.debug("Resetting configuration to default values.")
-        self.config = self._load_config()
+        self.reload()
 
         reset_msg = "Configuration reset to defaults"
         if self.translator:
@@ -252,6 +685,12 @@ class ConfigManager:
             bool: True if successful, False otherwise
         """
         logger.debug(f"Invalidating client certificate with serial {cert_serial}")
+        with self.transaction():
+            return self._invalidate_client_certificate(
+                cert_serial, client_cert_manager
+            )
+
+    def _invalidate_client_certificate(self, cert_serial, client_cert_manager):
         if (
             "security" not in self.config
             or "client_certificates" not in self.config["security"]
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Declarative, non-interactive configuration for TeddyCloudStarter.
+Applies a desired-state spec file to config.json, the generated artifacts and
+the running services, performing only the steps that are actually needed.
+"""
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from ..config_manager import (
+    DEFAULT_CONFIG_PATH,
+    GENERATION_KEY,
+    ConfigManager,
+    write_file_atomic,
+)
+from ..configurations import TEMPLATES
+from ..utilities.logger import logger
+from ..utilities.network import collapse_ip_networks, validate_ip_address
+from ..utilities.validation import validate_config
+from ..wizard.ui_helpers import console
+from .box_registry import BoxRegistry
+from .generator import render_docker_compose, render_nginx_configs
+from .io_profile import DEFAULT_IO_PROFILE, IO_PROFILES
+from .logging_profile import LOGGING_PROFILES
+from .performance import PERFORMANCE_PROFILES
+
+# Spec keys accepted by apply, in addition to the nested "ports" dictionary
+SPEC_KEYS = (
+    "path",
+    "mode",
+    "ports",
+    "domain",
+    "https_mode",
+    "nginx_type",
+    "performance_profile",
+    "upstream_keepalive",
+    "security",
+    "allowed_ips",
+    "auth_bypass_ips",
+    "boxes",
+    "teddycloud_image_tag",
+    "logging_profile",
+    "io",
+    "language",
+    "start",
+)
+
+# Keys that change on every save and are ignored when diffing configurations
+VOLATILE_KEYS = ("last_modified", "version", GENERATION_KEY)
+
+
+def load_spec(spec_path: str) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Load and validate a desired-state spec file.
+
+    Args:
+        spec_path: Path to the JSON spec file
+
+    Returns:
+        Tuple[Dict[str, Any], List[str]]: (spec, list_of_error_messages)
+    """
+    try:
+        with open(spec_path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return {}, [f"Could not read spec file {spec_path}: {e}"]
+
+    if not isinstance(spec, dict):
+        return {}, ["Spec file must contain a JSON object"]
+
+    errors = [
+        f"Unknown spec key: {key}" for key in spec if key not in SPEC_KEYS
+    ]
+    if "performance_profile" in spec and spec["performance_profile"] not in PERFORMANCE_PROFILES:
+        errors.append(f"Invalid performance_profile: {spec['performance_profile']}")
+    if "logging_profile" in spec and spec["logging_profile"] not in LOGGING_PROFILES:
+        errors.append(f"Invalid logging_profile: {spec['logging_profile']}")
+    if "io" in spec:
+        io_spec = spec["io"]
+        if not isinstance(io_spec, dict):
+            errors.append(f"Invalid io, expected an object: {io_spec!r}")
+        elif io_spec.get("profile", DEFAULT_IO_PROFILE) not in IO_PROFILES:
+            errors.append(f"Invalid io profile: {io_spec['profile']}")
+        elif not isinstance(io_spec.get("resource_limits", {}), dict) or not all(
+            isinstance(limits, dict) for limits in io_spec.get("resource_limits", {}).values()
+        ):
+            errors.append("Invalid io resource_limits, expected an object per service")
+    keepalive = spec.get("upstream_keepalive", 0)
+    if isinstance(keepalive, bool) or not (isinstance(keepalive, int) and keepalive >= 0):
+        errors.append(f"Invalid upstream_keepalive: {spec['upstream_keepalive']}")
+    for key in ("allowed_ips", "auth_bypass_ips"):
+        if not isinstance(spec.get(key, []), list):
+            errors.append(f"Invalid {key}, expected a list of addresses: {spec[key]!r}")
+            continue
+        for ip in spec.get(key, []):
+            if not isinstance(ip, str) or not validate_ip_address(ip):
+                errors.append(f"Invalid IP address or CIDR in {key}: {ip}")
+    return spec, errors
+
+
+def build_desired_config(config: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Overlay a spec onto the current configuration.
+
+    Args:
+        config: The current configuration dictionary
+        spec: The desired-state spec
+
+    Returns:
+        Dict[str, Any]: The desired configuration
+    """
+    desired = copy.deepcopy(config)
+    if spec.get("path"):
+        desired.setdefault("environment", {})["path"] = spec["path"]
+    for key in (
+        "mode",
+        "language",
+        "teddycloud_image_tag",
+        "logging_profile",
+    ):
+        if key in spec:
+            desired[key] = copy.deepcopy(spec[key])
+    if "io" in spec:
+        # Settings left out of the spec, such as resource_limits, are kept
+        desired["io"] = {**desired.get("io", {}), **copy.deepcopy(spec["io"])}
+    if "boxes" in spec:
+        BoxRegistry(spec["boxes"]).store(desired)
+
+    if desired.get("mode") == "direct":
+        # Ports left out of the spec keep their current mapping
+        ports = desired.setdefault(
+            "ports", {"admin_http": None, "admin_https": None, "teddycloud": None}
+        )
+        for key in ("admin_http", "admin_https", "teddycloud"):
+            if key in spec.get("ports", {}):
+                ports[key] = spec["ports"][key]
+    elif desired.get("mode") == "nginx":
+        nginx_config = desired.setdefault(
+            "nginx",
+            {"domain": "", "https_mode": "", "nginx_type": "standard", "security": {}},
+        )
+        for key in (
+            "domain",
+            "https_mode",
+            "nginx_type",
+            "performance_profile",
+            "upstream_keepalive",
+        ):
+            if key in spec:
+                nginx_config[key] = spec[key]
+        security = nginx_config.setdefault("security", {})
+        security.setdefault("type", "none")
+        security.setdefault("allowed_ips", [])
+        security.setdefault("auth_bypass_ips", [])
+        if "security" in spec:
+            security["type"] = spec["security"]
+        for key in ("allowed_ips", "auth_bypass_ips"):
+            if key in spec:
+                security[key], _ = collapse_ip_networks(spec[key])
+        nginx_config["ip_restrictions_configured"] = True
+    return desired
+
+
+def diff_config(current: Dict[str, Any], desired: Dict[str, Any]) -> List[str]:
+    """
+    List the top-level configuration keys that differ.
+
+    Args:
+        current: The current configuration
+        desired: The desired configuration
+
+    Returns:
+        List[str]: Sorted list of changed keys
+    """
+    return sorted(
+        key
+        for key in set(current) | set(desired)
+        if key not in VOLATILE_KEYS and current.get(key) != desired.get(key)
+    )
+
+
+def render_artifacts(config: Dict[str, Any], data_dir: str) -> Dict[str, str]:
+    """
+    Render every generated artifact for a configuration.
+
+    Args:
+        config: The configuration dictionary
+        data_dir: The project data directory
+
+    Returns:
+        Dict[str, str]: Mapping of absolute file path to content
+    """
+    artifacts = {
+        os.path.join(data_dir, "docker-compose.yml"): render_docker_compose(
+            config, TEMPLATES, data_dir
+        )
+    }
+    if config["mode"] == "nginx":
+        config_dir = os.path.join(data_dir, "configurations")
+        for file_name, content in render_nginx_configs(
+            config, TEMPLATES, data_dir
+        ).items():
+            artifacts[os.path.join(config_dir, file_name)] = content
+    return artifacts
+
+
+def diff_artifacts(artifacts: Dict[str, str]) -> List[str]:
+    """
+    List the artifacts whose content differs from the file on disk.
+
+    Args:
+        artifacts: Mapping of absolute file path to desired content
+
+    Returns:
+        List[str]: Paths that are missing or out of date
+    """
+    changed = []
+    for path, content in artifacts.items():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == content:
+                    continue
+        except OSError:
+            pass
+        changed.append(path)
+    return changed
+
+
+def write_artifact(path: str, content: str) -> None:
+    """
+    Write a generated artifact.
+
+    The nginx files under configurations/ are bind mounted into the containers
+    as single files. Replacing them would leave the containers reading the old
+    inode, so they are rewritten in place like generate_nginx_configs does.
+
+    Args:
+        path: Absolute file path
+        content: File content
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.basename(os.path.dirname(path)) == "configurations":
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+    else:
+        write_file_atomic(path, content)
+
+
+def plan_prerequisites(config: Dict[str, Any], data_dir: str) -> Tuple[List, List[str]]:
+    """
+    Determine which key material must be created before the services start.
+
+    Args:
+        config: The desired configuration
+        data_dir: The project data directory
+
+    Returns:
+        Tuple[List, List[str]]: (list of (description, callable) tasks, warnings)
+    """
+    tasks = []
+    warnings = []
+    if config["mode"] != "nginx":
+        return tasks, warnings
+
+    from ..security.certificate_authority import CertificateAuthority
+
+    nginx_config = config["nginx"]
+    project_path = os.path.dirname(data_dir)
+    server_certs = os.path.join(data_dir, "server_certs")
+    https_mode = nginx_config["https_mode"]
+    security_type = nginx_config["security"]["type"]
+
+    if https_mode == "self_signed" and not os.path.exists(
+        os.path.join(server_certs, "server.crt")
+    ):
+        ca = CertificateAuthority(base_dir=project_path)
+        tasks.append(
+            (
+                "self-signed server certificate",
+                lambda: ca.generate_self_signed_certificate(
+                    server_certs, nginx_config["domain"]
+                )[0],
+            )
+        )
+    elif https_mode == "user_provided" and not (
+        os.path.exists(os.path.join(server_certs, "server.crt"))
+        and os.path.exists(os.path.join(server_certs, "server.key"))
+    ):
+        warnings.append(f"Custom certificates missing: place server.crt and server.key in {server_certs}")
+
+    if security_type == "client_cert" and not os.path.exists(
+        os.path.join(data_dir, "client_certs", "ca", "ca.crt")
+    ):
+        ca = CertificateAuthority(base_dir=project_path)
+        tasks.append(
+            ("certificate authority", lambda: ca.create_ca_certificate()[0])
+        )
+    elif security_type == "basic_auth" and not os.path.exists(
+        os.path.join(data_dir, "security", ".htpasswd")
+    ):
+        warnings.append(
+            f"Basic auth requires {os.path.join(data_dir, 'security', '.htpasswd')}"
+        )
+    return tasks, warnings
+
+
+def apply_spec(spec_path: str, config_path: str = DEFAULT_CONFIG_PATH, dry_run: bool = False) -> int:
+    """
+    Apply a desired-state spec without any interactive prompt.
+
+    Args:
+        spec_path: Path to the JSON spec file
+        config_path: Path to the TeddyCloudStarter configuration file
+        dry_run: Only report the planned steps
+
+    Returns:
+        int: Process exit code (0 on success or no-op, 1 on error)
+    """
+    spec, errors = load_spec(spec_path)
+    config_manager = ConfigManager(config_path=config_path)
+    current = config_manager.config
+    desired = build_desired_config(current, spec) if not errors else {}
+    if not errors:
+        _, config_errors = validate_config(desired)
+        errors.extend(config_errors)
+    if not errors and not desired.get("environment", {}).get("path"):
+        errors.append("Spec requires a project path")
+    if errors:
+        for error in errors:
+            logger.error(error)
+            console.print(f"[bold red]{error}[/]")
+        return 1
+
+    data_dir = os.path.join(desired["environment"]["path"], "data")
+    changed_keys = diff_config(current, desired)
+    tasks, warnings = plan_prerequisites(desired, data_dir)
+    for warning in warnings:
+        logger.warning(warning)
+        console.print(f"[bold yellow]{warning}[/]")
+
+    artifacts = render_artifacts(desired, data_dir)
+    changed_artifacts = diff_artifacts(artifacts)
+    if not (changed_keys or tasks or changed_artifacts):
+        logger.info("Desired state already applied, nothing to do.")
+        console.print("[bold green]Nothing to do, configuration is up to date.[/]")
+        return 0
+
+    if dry_run:
+        console.print(f"[cyan]Config changes: {', '.join(changed_keys) or '-'}[/]")
+        for description, _ in tasks:
+            console.print(f"[cyan]Create: {description}[/]")
+        for path in changed_artifacts:
+            console.print(f"[cyan]Write: {path}[/]")
+        return 0
+
+    if changed_keys:
+        logger.info(f"Applying configuration changes: {changed_keys}")
+        config_manager.config = desired
+        config_manager.save()
+
+    # Key material is independent per task, so create it concurrently
+    if tasks:
+        os.makedirs(data_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(lambda task: (task[0], task[1]()), tasks))
+        for description, success in results:
+            if not success:
+                logger.error(f"Failed to create {description}")
+                console.print(f"[bold red]Failed to create {description}[/]")
+                return 1
+            logger.success(f"Created {description}")
+
+        # Rendering depends on files created above (e.g. the CRL)
+        artifacts = render_artifacts(desired, data_dir)
+        changed_artifacts = diff_artifacts(artifacts)
+
+    for path in changed_artifacts:
+        write_artifact(path, artifacts[path])
+        logger.info(f"Wrote {path}")
+        console.print(f"[green]Wrote {path}[/]")
+
+    # Running nginx containers pick up rewritten configuration files and new
+    # key material through their reload watcher, keeping box connections open
+    compose_file = os.path.join(data_dir, "docker-compose.yml")
+    if spec.get("start", True) and (
+        compose_file in changed_artifacts or "mode" in changed_keys
+    ):
+        from ..docker.images import ImageManager, required_images
+        from ..docker.manager import DockerManager
+
+        # Pull concurrently up front, images checked recently are skipped
+        ImageManager(config_path).ensure_images(required_images(desired))
+        # compose up only recreates services whose definition changed
+        DockerManager().start_services(project_path=desired["environment"]["path"])
+    if desired["mode"] == "nginx" and desired["nginx"]["https_mode"] == "letsencrypt":
+        console.print(
+            "[bold yellow]Let's Encrypt certificates are requested from the interactive menu.[/]"
+        )
+    logger.success("Desired state applied.")
+    console.print("[bold green]Desired state applied.[/]")
+    return 0
+
+
+def import_ips(
+    source: str,
+    key: str = "allowed_ips",
+    config_path: str = DEFAULT_CONFIG_PATH,
+    replace: bool = False,
+) -> int:
+    """
+    Bulk import IP addresses into an IP list without any interactive prompt.
+
+    The list is merged and saved once, then the nginx configuration files are
+    rewritten in place; the reload watcher in the running nginx containers
+    picks up the change.
+
+    Args:
+        source: Path to a text or CSV file, or "-" for stdin
+        key: "allowed_ips" or "auth_bypass_ips"
+        config_path: Path to the TeddyCloudStarter configuration file
+        replace: Replace the current list instead of extending it
+
+    Returns:
+        int: Process exit code (0 on success, 1 on error)
+    """
+    from ..security.ip_restrictions import import_ip_list
+
+    config_manager = ConfigManager(config_path=config_path)
+    config = copy.deepcopy(config_manager.config)
+    if config.get("mode") != "nginx" or "nginx" not in config:
+        logger.error("IP lists can only be imported in nginx mode.")
+        console.print("[bold red]IP lists can only be imported in nginx mode.[/]")
+        return 1
+
+    previous = list(config["nginx"].get("security", {}).get(key, []))
+    if import_ip_list(config["nginx"], key, source, replace=replace) is None:
+        return 1
+    if config["nginx"]["security"][key] == previous:
+        console.print("[bold green]Nothing to do, the list is up to date.[/]")
+        return 0
+
+    config_manager.config = config
+    config_manager.save()
+    project_path = config.get("environment", {}).get("path")
+    if project_path:
+        data_dir = os.path.join(project_path, "data")
+        config_dir = os.path.join(data_dir, "configurations")
+        # Only the nginx files depend on the IP lists
+        artifacts = {
+            os.path.join(config_dir, file_name): content
+            for file_name, content in render_nginx_configs(
+                config, TEMPLATES, data_dir
+            ).items()
+        }
+        for path in diff_artifacts(artifacts):
+            write_artifact(path, artifacts[path])
+            logger.info(f"Wrote {path}")
+            console.print(f"[green]Wrote {path}[/]")
+    return 0
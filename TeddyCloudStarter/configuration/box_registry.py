@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Registry of the Tonieboxes stored in config["boxes"].
+Keeps the boxes in one canonical form (a list of dictionaries with normalised
+MAC addresses) with indexes by MAC address and by certificate fingerprint, and
+a cached view of the (fingerprint, MAC) pairs the templates render.
+"""
+import copy
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..utilities.logger import logger
+
+
+def normalize_mac(mac: str) -> str:
+    """Normalise a MAC address to lowercase hex without separators."""
+    return "".join(c for c in str(mac or "") if c not in ":-. ").lower()
+
+
+def normalize_fingerprint(fingerprint: str) -> str:
+    """Normalise a certificate fingerprint to lowercase hex without colons."""
+    return str(fingerprint or "").replace(":", "").strip().lower()
+
+
+class BoxRegistry:
+    """Indexed collection of boxes keyed by MAC address."""
+
+    def __init__(self, boxes: Union[Iterable[Dict[str, Any]], Dict[str, Any], None] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            boxes: Boxes as stored in the configuration, either a list or a
+                dictionary of box dictionaries; later duplicates of a MAC
+                address are merged into the first
+        """
+        self._boxes: Dict[str, Dict[str, Any]] = {}
+        # Boxes per fingerprint; the last one owns it, normally there is one
+        self._by_fingerprint: Dict[str, List[str]] = {}
+        self._render_view: Optional[List[Tuple[str, str]]] = None
+        if isinstance(boxes, dict):
+            boxes = boxes.values()
+        for box in boxes or []:
+            mac = normalize_mac(box.get("macaddress"))
+            if not mac:
+                logger.warning(f"Ignoring box without MAC address: {box}")
+                continue
+            if mac in self._boxes:
+                self.update(mac, box)
+            else:
+                self.add(box)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "BoxRegistry":
+        """Create a registry from config["boxes"]."""
+        return cls(config.get("boxes"))
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._boxes.values())
+
+    def __contains__(self, mac: str) -> bool:
+        return normalize_mac(mac) in self._boxes
+
+    def get(self, mac: str) -> Optional[Dict[str, Any]]:
+        """Return the box with the given MAC address, or None."""
+        return self._boxes.get(normalize_mac(mac))
+
+    def find_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the box whose client certificate has the fingerprint, or None."""
+        macs = self._by_fingerprint.get(normalize_fingerprint(fingerprint))
+        return self._boxes[macs[-1]] if macs else None
+
+    def _index(self, mac: str, box: Dict[str, Any]) -> None:
+        fingerprint = normalize_fingerprint(box.get("crt_fingerprint"))
+        if not fingerprint:
+            return
+        macs = self._by_fingerprint.setdefault(fingerprint, [])
+        if macs:
+            logger.warning(
+                f"Certificate fingerprint of box {macs[-1]} is also used by {mac}, routing it to {mac}."
+            )
+        macs.append(mac)
+
+    def _unindex(self, mac: str, box: Dict[str, Any]) -> None:
+        fingerprint = normalize_fingerprint(box.get("crt_fingerprint"))
+        macs = self._by_fingerprint.get(fingerprint)
+        if macs and mac in macs:
+            macs.remove(mac)
+            if not macs:
+                del self._by_fingerprint[fingerprint]
+
+    def add(self, box: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add a box.
+
+        Args:
+            box: The box dictionary, at least with a "macaddress"
+
+        Returns:
+            Dict[str, Any]: The stored (normalised) box
+
+        Raises:
+            ValueError: If the MAC address is missing or already registered
+        """
+        mac = normalize_mac(box.get("macaddress"))
+        if not mac:
+            raise ValueError("Box has no MAC address")
+        if mac in self._boxes:
+            raise ValueError(f"Box {mac} is already registered")
+        stored = dict(copy.deepcopy(box), macaddress=mac)
+        self._boxes[mac] = stored
+        self._index(mac, stored)
+        self._render_view = None
+        return stored
+
+    def update(self, mac: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update fields of a registered box, adding it if it is unknown.
+
+        Args:
+            mac: MAC address of the box
+            fields: Fields to set; "macaddress" is ignored
+
+        Returns:
+            Dict[str, Any]: The stored box
+        """
+        mac = normalize_mac(mac)
+        box = self._boxes.get(mac)
+        if box is None:
+            return self.add(dict(fields, macaddress=mac))
+        self._unindex(mac, box)
+        box.update(copy.deepcopy({k: v for k, v in fields.items() if k != "macaddress"}))
+        self._index(mac, box)
+        self._render_view = None
+        return box
+
+    def remove(self, mac: str) -> bool:
+        """
+        Remove a box.
+
+        Args:
+            mac: MAC address of the box
+
+        Returns:
+            bool: True if the box was registered
+        """
+        box = self._boxes.pop(normalize_mac(mac), None)
+        if box is None:
+            return False
+        self._unindex(normalize_mac(mac), box)
+        self._render_view = None
+        return True
+
+    @property
+    def render_view(self) -> List[Tuple[str, str]]:
+        """
+        (fingerprint, MAC) pairs for the templates, without colons in the
+        fingerprint. Built once and reused until the registry changes.
+        """
+        if self._render_view is None:
+            # Follows the box order so the rendered files stay stable
+            self._render_view = []
+            for mac, box in self._boxes.items():
+                fingerprint = normalize_fingerprint(box.get("crt_fingerprint"))
+                if fingerprint and self._by_fingerprint[fingerprint][-1] == mac:
+                    self._render_view.append((fingerprint, mac))
+        return self._render_view
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Return the boxes in their canonical storage form."""
+        return copy.deepcopy(list(self._boxes.values()))
+
+    def store(self, config: Dict[str, Any]) -> None:
+        """Write the boxes to config["boxes"] in their canonical form."""
+        config["boxes"] = self.to_list()
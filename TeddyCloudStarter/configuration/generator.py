@@ -8,6 +8,135 @@ import jinja2
 
 from ..wizard.ui_helpers import console
 from ..utilities.logger import logger
+from ..utilities.network import collapse_ip_networks
+from .box_registry import BoxRegistry
+from .io_profile import resolve_io_profile
+from .logging_profile import resolve_logging_profile
+from .performance import resolve_profile
+
+# Script mounted into both nginx containers to reload them on file changes
+RELOAD_WATCHER_FILE = "reload-watcher.sh"
+
+
+def render_docker_compose(config, templates, data_dir):
+    """
+    Render docker-compose.yml without writing it.
+
+    Args:
+        config: The configuration dictionary
+        templates: The templates dictionary containing templates
+        data_dir: The project data directory
+
+    Returns:
+        str: The rendered docker-compose.yml content
+    """
+    from ..docker.images import NGINX_IMAGE
+
+    env = jinja2.Environment(autoescape=True)
+    template = env.from_string(templates.get("docker-compose", ""))
+
+    context = {"mode": config["mode"], "nginx_image": NGINX_IMAGE}
+    context["teddycloud_image_tag"] = config.get("teddycloud_image_tag", "latest")
+    context["logging"] = resolve_logging_profile(config)
+    context["io"] = resolve_io_profile(config)
+
+    if config["mode"] == "direct":
+        context.update(
+            {
+                "admin_http": config["ports"]["admin_http"],
+                "admin_https": config["ports"]["admin_https"],
+                "teddycloud": config["ports"]["teddycloud"],
+            }
+        )
+    else:
+        crl_file = os.path.exists(
+            os.path.join(data_dir, "client_certs", "crl", "ca.crl")
+        )
+        boxes = BoxRegistry.from_config(config).render_view
+
+        context.update(
+            {
+                "domain": config["nginx"]["domain"],
+                "https_mode": config["nginx"]["https_mode"],
+                "security_type": config["nginx"]["security"]["type"],
+                "allowed_ips": config["nginx"]["security"]["allowed_ips"],
+                "crl_file": crl_file,
+                "nginx_type": config["nginx"].get("nginx_type", "standard"),
+                "boxes": boxes,
+            }
+        )
+        logger.debug(f"boxes for docker-compose: {boxes}")
+
+        if config["nginx"]["https_mode"] in ("user_provided", "self_signed"):
+            context.update({"cert_path": "./server_certs:/etc/nginx/certificates"})
+
+    return template.render(**context)
+
+
+def render_nginx_configs(config, templates, data_dir, performance=None):
+    """
+    Render the nginx configuration files without writing them.
+
+    Args:
+        config: The configuration dictionary
+        templates: The templates dictionary containing templates
+        data_dir: The project data directory
+        performance: Resolved performance profile, resolved from config if omitted
+
+    Returns:
+        dict: Mapping of file name (relative to data/configurations) to content
+    """
+    env = jinja2.Environment(autoescape=True)
+    if performance is None:
+        performance = resolve_profile(config["nginx"])
+    logging_settings = resolve_logging_profile(config)
+    security = config["nginx"]["security"]
+    # Older configurations may hold overlapping or unnormalised entries
+    allowed_ips, _ = collapse_ip_networks(security["allowed_ips"])
+    auth_bypass_ips, _ = collapse_ip_networks(security.get("auth_bypass_ips", []))
+    io_settings = resolve_io_profile(config)
+
+    edge_template = env.from_string(templates.get("nginx-edge", ""))
+    edge_context = {
+        "domain": config["nginx"]["domain"],
+        "https_mode": config["nginx"]["https_mode"],
+        "security_type": config["nginx"]["security"]["type"],
+        "allowed_ips": allowed_ips,
+        "nginx_type": config["nginx"].get("nginx_type", "standard"),
+        "performance": performance,
+        "logging": logging_settings,
+        "io": io_settings,
+    }
+
+    auth_template = env.from_string(templates.get("nginx-auth", ""))
+    boxes = BoxRegistry.from_config(config).render_view
+    auth_context = {
+        "domain": config["nginx"]["domain"],
+        "https_mode": config["nginx"]["https_mode"],
+        "security_type": config["nginx"]["security"]["type"],
+        "allowed_ips": allowed_ips,
+        "auth_bypass_ips": auth_bypass_ips,
+        "crl_file": os.path.exists(
+            os.path.join(data_dir, "client_certs", "crl", "ca.crl")
+        ),
+        "nginx_type": config["nginx"].get("nginx_type", "standard"),
+        "boxes": boxes,
+        # Room for every fingerprint in the map hash, and for the certificate
+        # and key of every box in the upstream credential cache
+        "box_map_size": max(2048, 2 * len(boxes)),
+        "cert_cache_size": max(64, 2 * len(boxes)),
+        "performance": performance,
+        "logging": logging_settings,
+        "io": io_settings,
+    }
+    logger.debug(f"boxes for nginx-auth: {boxes}")
+
+    return {
+        "nginx-edge.conf": edge_template.render(**edge_context),
+        "nginx-auth.conf": auth_template.render(**auth_context),
+        # Shell script, not a Jinja template
+        RELOAD_WATCHER_FILE: templates.get("nginx-reload-watcher", ""),
+    }
 
 
 def generate_docker_compose(config, translator, templates):
@@ -24,9 +153,6 @@ def generate_docker_compose(config, translator, templates):
     """
     try:
         logger.info("Starting Docker Compose generation.")
-        env = jinja2.Environment(autoescape=True)
-
-        template = env.from_string(templates.get("docker-compose", ""))
 
         project_path = config.get("environment", {}).get("path", "")
         if not project_path:
@@ -44,72 +170,27 @@ def generate_docker_compose(config, translator, templates):
                 f"[green]{translator.get('Created data directory at')}: {data_dir}[/]"
             )
 
-        context = {"mode": config["mode"]}
-        context["teddycloud_image_tag"] = config.get("teddycloud_image_tag", "latest")
-
-        if config["mode"] == "direct":
-            context.update(
-                {
-                    "admin_http": config["ports"]["admin_http"],
-                    "admin_https": config["ports"]["admin_https"],
-                    "teddycloud": config["ports"]["teddycloud"],
-                }
-            )
-        else:
-            crl_file = os.path.exists(
-                os.path.join(data_dir, "client_certs", "crl", "ca.crl")
-            )
+        if config["mode"] == "nginx" and config["nginx"]["https_mode"] == "user_provided":
+            server_certs_path = os.path.join(data_dir, "server_certs")
+            if not os.path.exists(server_certs_path):
+                os.makedirs(server_certs_path, exist_ok=True)
+                logger.success(f"{translator.get('Created server_certs directory at')}: {server_certs_path}")
+                console.print(
+                    f"[green]{translator.get('Created server_certs directory at')}: {server_certs_path}[/]"
+                )
 
-            # Prepare boxes as a list of (crt_fingerprint_no_colon, macaddress) tuples
-            raw_boxes = config.get("boxes", [])
-            boxes = []
-            if isinstance(raw_boxes, list):
-                for box in raw_boxes:
-                    crt_fp = box.get("crt_fingerprint", "").replace(":", "").lower()
-                    mac = box.get("macaddress", "")
-                    if crt_fp and mac:
-                        boxes.append((crt_fp, mac))
-            elif isinstance(raw_boxes, dict):
-                # fallback for dict type
-                for box in raw_boxes.values():
-                    crt_fp = box.get("crt_fingerprint", "").replace(":", "").lower()
-                    mac = box.get("macaddress", "")
-                    if crt_fp and mac:
-                        boxes.append((crt_fp, mac))
-
-            context.update(
-                {
-                    "domain": config["nginx"]["domain"],
-                    "https_mode": config["nginx"]["https_mode"],
-                    "security_type": config["nginx"]["security"]["type"],
-                    "allowed_ips": config["nginx"]["security"]["allowed_ips"],
-                    "crl_file": crl_file,
-                    "nginx_type": config["nginx"].get("nginx_type", "standard"),
-                    "boxes": boxes,
-                }
-            )
-            logger.debug(f"boxes for docker-compose: {boxes}")
-            print("[DEBUG] boxes for docker-compose:", boxes)
-
-            if config["nginx"]["https_mode"] == "user_provided":
-                server_certs_path = os.path.join(data_dir, "server_certs")
-                if not os.path.exists(server_certs_path):
-                    os.makedirs(server_certs_path, exist_ok=True)
-                    logger.success(f"{translator.get('Created server_certs directory at')}: {server_certs_path}")
-                    console.print(
-                        f"[green]{translator.get('Created server_certs directory at')}: {server_certs_path}[/]"
-                    )
-
-                context.update({"cert_path": "./server_certs:/etc/nginx/certificates"})
-            elif config["nginx"]["https_mode"] == "self_signed":
-                context.update({"cert_path": "./server_certs:/etc/nginx/certificates"})
-            elif config["nginx"]["https_mode"] == "user_provided":
-                context.update({"cert_path": "./server_certs:/etc/nginx/certificates"})
-
-        rendered = template.render(**context)
+        rendered = render_docker_compose(config, templates, data_dir)
         with open(os.path.join(data_dir, "docker-compose.yml"), "w") as f:
             f.write(rendered)
 
+        # The compose file mounts the reload watcher into the nginx services;
+        # a missing file would be created as a directory by Docker
+        watcher_path = os.path.join(data_dir, "configurations", RELOAD_WATCHER_FILE)
+        if config["mode"] == "nginx" and not os.path.isfile(watcher_path):
+            os.makedirs(os.path.dirname(watcher_path), exist_ok=True)
+            with open(watcher_path, "w", newline="\n") as f:
+                f.write(templates.get("nginx-reload-watcher", ""))
+
         logger.success("Docker Compose configuration generated successfully.")
         console.print(
             "[bold green]Docker Compose configuration generated successfully.[/]"
@@ -135,7 +216,6 @@ def generate_nginx_configs(config, translator, templates):
     """
     try:
         logger.info("Starting Nginx configuration generation.")
-        env = jinja2.Environment(autoescape=True)
 
         project_path = config.get("environment", {}).get("path", "")
         if not project_path:
@@ -161,53 +241,21 @@ def generate_nginx_configs(config, translator, templates):
                 f"[green]{translator.get('Created configurations directory at')}: {config_dir}[/]"
             )
 
-        edge_template = env.from_string(templates.get("nginx-edge", ""))
-        edge_context = {
-            "domain": config["nginx"]["domain"],
-            "https_mode": config["nginx"]["https_mode"],
-            "security_type": config["nginx"]["security"]["type"],
-            "allowed_ips": config["nginx"]["security"]["allowed_ips"],
-            "nginx_type": config["nginx"].get("nginx_type", "standard"),
-        }
-
-        with open(os.path.join(config_dir, "nginx-edge.conf"), "w") as f:
-            f.write(edge_template.render(**edge_context))
-
-        logger.debug("nginx-edge.conf generated.")
-
-        auth_template = env.from_string(templates.get("nginx-auth", ""))
-        raw_boxes = config.get("boxes", [])
-        boxes = []
-        if isinstance(raw_boxes, list):
-            for box in raw_boxes:
-                crt_fp = box.get("crt_fingerprint", "").replace(":", "").lower()
-                mac = box.get("macaddress", "")
-                if crt_fp and mac:
-                    boxes.append((crt_fp, mac))
-        elif isinstance(raw_boxes, dict):
-            for box in raw_boxes.values():
-                crt_fp = box.get("crt_fingerprint", "").replace(":", "").lower()
-                mac = box.get("macaddress", "")
-                if crt_fp and mac:
-                    boxes.append((crt_fp, mac))
-
-        auth_context = {
-            "domain": config["nginx"]["domain"],
-            "https_mode": config["nginx"]["https_mode"],
-            "security_type": config["nginx"]["security"]["type"],
-            "allowed_ips": config["nginx"]["security"]["allowed_ips"],
-            "auth_bypass_ips": config["nginx"]["security"].get("auth_bypass_ips", []),
-            "crl_file": os.path.exists(
-                os.path.join(data_dir, "client_certs", "crl", "ca.crl")
-            ),
-            "nginx_type": config["nginx"].get("nginx_type", "standard"),
-            "boxes": boxes,
-        }
-        logger.debug(f"boxes for nginx-auth: {boxes}")
-        print("[DEBUG] boxes for nginx-auth:", boxes)
-
-        with open(os.path.join(config_dir, "nginx-auth.conf"), "w") as f:
-            f.write(auth_template.render(**auth_context))
+        performance = resolve_profile(config["nginx"])
+        logger.info(f"Nginx performance profile: {performance['summary']}")
+        console.print(
+            f"[cyan]{translator.get('Nginx performance profile')}: {performance['summary']}[/]"
+        )
+        for key, value in performance["settings"].items():
+            logger.debug(f"{key} {value}: {performance['reasons'][key]}")
+            console.print(f"  [dim]{key} {value} - {performance['reasons'][key]}[/]")
+
+        for file_name, content in render_nginx_configs(
+            config, templates, data_dir, performance
+        ).items():
+            with open(os.path.join(config_dir, file_name), "w", newline="\n") as f:
+                f.write(content)
+            logger.debug(f"{file_name} generated.")
 
         logger.success("Nginx configurations generated successfully.")
         console.print("[bold green]Nginx configurations generated successfully.[/]")
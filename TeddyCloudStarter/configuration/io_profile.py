@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Storage I/O profiles for the generated Docker Compose and nginx files.
+The "sdcard" profile keeps nginx runtime and temp paths (and optionally the
+TeddyCloud cache) in RAM-backed tmpfs mounts sized by the host memory, so
+SD-card hosts see fewer small writes. nginx logs go to the container output
+instead, where Docker's log rotation bounds them; Docker stores that output
+on disk, so log writes are not reduced (the logging profile lowers them).
+Per-service memory and CPU limits are configured alongside.
+"""
+import datetime
+import re
+import subprocess
+from typing import Any, Dict, List, Optional
+
+from ..utilities.logger import logger
+from ..utilities.process import run_command
+from .performance import detect_host
+
+IO_PROFILES = ("standard", "sdcard")
+
+DEFAULT_IO_PROFILE = "standard"
+
+IO_PROFILE_DESCRIPTIONS = {
+    "standard": "Keep nginx logs, temp files and caches on disk",
+    "sdcard": "Keep nginx temp and runtime files in RAM to spare SD cards (logs still reach Docker's log files)",
+}
+
+# Services that accept memory and CPU limits, with their container names
+RESOURCE_SERVICES = {
+    "nginx-edge": "nginx-edge",
+    "nginx-auth": "nginx-auth",
+    "teddycloud": "teddycloud-app",
+    "certbot": "teddycloud-certbot",
+}
+
+# Container paths whose writes the tmpfs mounts keep off the disk, per
+# container. /var/log/nginx is mounted as tmpfs too, but the logs are sent to
+# Docker's log files on disk, so their writes are not saved and not counted.
+TMPFS_PATHS = {
+    "nginx-edge": ("/var/run", "/var/cache/nginx", "/tmp"),
+    "nginx-auth": ("/var/run", "/var/cache/nginx", "/tmp"),
+    "teddycloud-app": ("/teddycloud/data/cache",),
+}
+
+MEMORY_PATTERN = re.compile(r"^\d+(\.\d+)?[bkmg]?$", re.IGNORECASE)
+
+_MIB = 1024**2
+
+
+def _clamp(value: int, lower: int, upper: int) -> int:
+    return max(lower, min(value, upper))
+
+
+def tmpfs_sizes(memory: Optional[int]) -> Dict[str, str]:
+    """
+    Size the tmpfs mounts relative to the host memory.
+
+    Args:
+        memory: Host memory in bytes, None if unknown (1 GiB is assumed)
+
+    Returns:
+        Dict[str, str]: Size per mount kind ("run", "tmp", "log", "temp", "cache")
+    """
+    mib = (memory or 1024 * _MIB) // _MIB
+    return {
+        "run": "1m",
+        "tmp": "4m",
+        "log": f"{_clamp(mib // 64, 8, 64)}m",
+        "temp": f"{_clamp(mib // 32, 16, 128)}m",
+        "cache": f"{_clamp(mib // 8, 64, 1024)}m",
+    }
+
+
+def resolve_io_profile(
+    config: Dict[str, Any], host: Optional[Dict[str, Optional[int]]] = None
+) -> Dict[str, Any]:
+    """
+    Resolve the configured I/O profile into template settings.
+
+    Args:
+        config: The configuration dictionary
+        host: Host resources, detected if not given (only used by "sdcard")
+
+    Returns:
+        Dict[str, Any]: "profile", "nginx_tmpfs", "cache_tmpfs", "access_log",
+        "error_log", "stream_access_log", "stream_error_log" and "limits"
+    """
+    io_config = config.get("io", {})
+    profile = io_config.get("profile") or DEFAULT_IO_PROFILE
+    if profile not in IO_PROFILES:
+        profile = DEFAULT_IO_PROFILE
+
+    settings = {
+        "profile": profile,
+        "nginx_tmpfs": [],
+        "cache_tmpfs": None,
+        "access_log": "/var/log/nginx/access.log",
+        "error_log": "/var/log/nginx/error.log",
+        "stream_access_log": "/var/log/nginx/stream_access.log",
+        "stream_error_log": "/var/log/nginx/stream_error.log",
+        "limits": {
+            service: limits
+            for service, limits in io_config.get("resource_limits", {}).items()
+            if service in RESOURCE_SERVICES and limits
+        },
+    }
+    if profile == "sdcard":
+        sizes = tmpfs_sizes((host or detect_host()).get("memory"))
+        settings["nginx_tmpfs"] = [
+            f"/var/run:size={sizes['run']}",
+            f"/tmp:size={sizes['tmp']}",
+            f"/var/log/nginx:size={sizes['log']}",
+            f"/var/cache/nginx:size={sizes['temp']}",
+        ]
+        if io_config.get("cache_in_ram"):
+            settings["cache_tmpfs"] = f"/teddycloud/data/cache:size={sizes['cache']}"
+        # The tmpfs hides the image's log symlinks to the container output;
+        # logging there directly also bounds the logs by Docker's log rotation
+        settings["access_log"] = settings["stream_access_log"] = "/dev/stdout"
+        settings["error_log"] = settings["stream_error_log"] = "/dev/stderr"
+    return settings
+
+
+def _uptime_days(container: str) -> Optional[float]:
+    result = run_command(
+        ["docker", "inspect", "--format", "{{.State.StartedAt}}", container]
+    )
+    if not result.ok:
+        return None
+    try:
+        started = datetime.datetime.strptime(result.stdout.strip()[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return None
+    started = started.replace(tzinfo=datetime.timezone.utc)
+    elapsed = datetime.datetime.now(datetime.timezone.utc) - started
+    return max(elapsed.total_seconds() / 86400, 1 / 24)
+
+
+def _paths_on_tmpfs(container: str) -> bool:
+    result = run_command(
+        ["docker", "inspect", "--format", "{{json .HostConfig.Tmpfs}}", container]
+    )
+    return result.ok and result.stdout.strip() not in ("", "null", "{}")
+
+
+def estimate_write_reduction(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Estimate the disk writes the "sdcard" profile keeps in RAM.
+
+    Measures how much data the running containers currently keep in the paths
+    that move to tmpfs and divides it by their uptime. Data that was
+    overwritten or deleted in the meantime is not counted, so this is a lower
+    bound of the writes, not a measurement of them. nginx log writes are not
+    included: they reach Docker's log files on disk under either profile.
+
+    Args:
+        config: The configuration dictionary
+
+    Returns:
+        List[Dict[str, Any]]: Per container "container", "bytes_per_day" (data
+        stored per day of uptime, None if it could not be measured) and
+        "in_ram" (already on tmpfs)
+    """
+    cache_in_ram = config.get("io", {}).get("cache_in_ram", False)
+    report = []
+    for container, paths in TMPFS_PATHS.items():
+        if container == "teddycloud-app" and not cache_in_ram:
+            continue
+        entry = {"container": container, "bytes_per_day": None, "in_ram": False}
+        report.append(entry)
+        try:
+            days = _uptime_days(container)
+            if days is None:
+                continue
+            entry["in_ram"] = _paths_on_tmpfs(container)
+            # -x stays on the container file system, so mounted volumes and
+            # the /dev/stdout log symlinks are not counted
+            result = run_command(
+                ["docker", "exec", container, "du", "-skx", *paths]
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Could not measure writes of {container}: {e}")
+            continue
+        if not result.stdout:
+            continue
+        kib = sum(
+            int(line.split()[0])
+            for line in result.stdout.splitlines()
+            if line.split() and line.split()[0].isdigit()
+        )
+        entry["bytes_per_day"] = kib * 1024 / days
+    return report
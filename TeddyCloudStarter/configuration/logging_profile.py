@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Logging profiles for the generated nginx and Docker Compose files.
+The profile stored in config["logging_profile"] selects log levels, access
+log buffering, the logged fields and the Docker log rotation limits.
+"""
+from typing import Any, Dict
+
+LOGGING_PROFILES = ("debug", "standard", "production")
+
+# Profile used for configurations created before profiles existed; it renders
+# the same nginx logging as earlier versions
+DEFAULT_LOGGING_PROFILE = "debug"
+
+# Profile preselected for new setups
+RECOMMENDED_LOGGING_PROFILE = "standard"
+
+LOGGING_PROFILE_DESCRIPTIONS = {
+    "debug": "Verbose nginx and TLS tracing, unbuffered logs with client certificates",
+    "standard": "Warnings and buffered access logs without raw client certificates",
+    "production": "Errors only and compact, rarely flushed access logs for SD cards",
+}
+
+LOGGING_SETTINGS = {
+    "debug": {
+        # NGINX_DEBUG and SSL_TRACE in the nginx containers
+        "nginx_debug": True,
+        "error_level": "warn",
+        "stream_error_level": "debug",
+        "access_buffer": "",
+        "stream_log_format": "stream_detailed",
+        "raw_cert": True,
+        "max_size": "50m",
+        "max_file": 5,
+    },
+    "standard": {
+        "nginx_debug": False,
+        "error_level": "warn",
+        "stream_error_level": "warn",
+        "access_buffer": "buffer=32k flush=5s",
+        "stream_log_format": "stream_detailed",
+        "raw_cert": False,
+        "max_size": "10m",
+        "max_file": 3,
+    },
+    "production": {
+        "nginx_debug": False,
+        "error_level": "error",
+        "stream_error_level": "error",
+        "access_buffer": "buffer=64k flush=30s",
+        "stream_log_format": "stream_basic",
+        "raw_cert": False,
+        "max_size": "5m",
+        "max_file": 2,
+    },
+}
+
+
+def resolve_logging_profile(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve the configured logging profile into template settings.
+
+    Args:
+        config: The configuration dictionary
+
+    Returns:
+        Dict[str, Any]: The profile settings plus its "profile" name
+    """
+    profile = config.get("logging_profile") or DEFAULT_LOGGING_PROFILE
+    if profile not in LOGGING_PROFILES:
+        profile = DEFAULT_LOGGING_PROFILE
+    return dict(LOGGING_SETTINGS[profile], profile=profile)
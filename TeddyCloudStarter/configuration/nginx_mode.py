@@ -5,7 +5,6 @@ Nginx mode configuration for TeddyCloudStarter.
 import os
 import subprocess
 import sys
-import time
 from pathlib import Path
 
 import questionary
@@ -27,6 +26,8 @@ from ..ui.nginx_mode_ui import (
     select_https_mode_for_modification,
     select_security_type_for_modification,
     prompt_nginx_type,
+    prompt_performance_profile,
+    prompt_upstream_keepalive,
 )
 from ..utilities.network import check_domain_resolvable, check_port_available
 from ..utilities.validation import ConfigValidator
@@ -156,9 +157,8 @@ def wait_for_htpasswd_file(htpasswd_file_path, translator):
 
         display_waiting_for_htpasswd(htpasswd_file_path, translator)
 
+        # The confirmation prompt below blocks between checks, so no sleep is needed
         while True:
-            time.sleep(1)
-
             try:
                 htpasswd_exists = os.path.isfile(htpasswd_file_path)
 
@@ -271,7 +271,7 @@ def configure_client_certificates(translator, client_cert_manager):
     return True
 
 
-def configure_nginx_mode(config, translator, security_managers):
+def configure_nginx_mode(config, translator, security_managers, on_part_configured=None):
     """
     Configure nginx deployment mode settings.
 
@@ -279,6 +279,8 @@ def configure_nginx_mode(config, translator, security_managers):
         config: The configuration dictionary
         translator: The translator instance for localization
         security_managers: Dictionary containing the security module managers
+        on_part_configured: Optional callable, called with "https" and
+            "security" once the HTTPS mode and the security type are set
 
     Returns:
         dict: The updated configuration dictionary
@@ -289,14 +291,14 @@ def configure_nginx_mode(config, translator, security_managers):
     client_cert_manager = security_managers.get("client_cert_manager")
     basic_auth_manager = security_managers.get("basic_auth_manager")
 
-    if "nginx" not in config:
-        config["nginx"] = {
-            "domain": "",
-            "https_mode": "",
-            "nginx_type": "standard",
-            "security": {"type": "", "allowed_ips": [], "auth_bypass_ips": []},
-        }
-        logger.debug("Initialized nginx config: %s", config["nginx"])
+    # Answers kept from an interrupted setup may already be present
+    nginx_config = config.setdefault("nginx", {})
+    for key, default in (("domain", ""), ("https_mode", ""), ("nginx_type", "standard")):
+        nginx_config.setdefault(key, default)
+    security_config = nginx_config.setdefault("security", {})
+    for key, default in (("type", ""), ("allowed_ips", []), ("auth_bypass_ips", [])):
+        security_config.setdefault(key, default)
+    logger.debug("Initialized nginx config: %s", config["nginx"])
 
     nginx_config = config["nginx"]
     project_path = config.get("environment", {}).get("path", "")
@@ -310,6 +312,12 @@ def configure_nginx_mode(config, translator, security_managers):
     nginx_config["nginx_type"] = prompt_nginx_type(translator)
     logger.debug(f"Selected nginx_type: {nginx_config['nginx_type']}")
 
+    nginx_config["performance_profile"] = prompt_performance_profile(
+        translator, nginx_config.get("performance_profile", "auto")
+    )
+    logger.debug(f"Selected performance_profile: {nginx_config['performance_profile']}")
+    _prompt_upstream_keepalive(nginx_config, translator)
+
     # Check for required ports
     ports_available, warnings = check_port_prerequisites()
 
@@ -503,13 +511,20 @@ def configure_nginx_mode(config, translator, security_managers):
 
             break
 
+    if on_part_configured:
+        on_part_configured("https")
+
     logger.success("Nginx mode configuration complete.")
-    configure_security(nginx_config, translator, security_managers, project_path)
+    configure_security(
+        nginx_config, translator, security_managers, project_path, on_part_configured
+    )
 
     return config
 
 
-def configure_security(nginx_config, translator, security_managers, project_path):
+def configure_security(
+    nginx_config, translator, security_managers, project_path, on_part_configured=None
+):
     """
     Configure security settings for Nginx mode.
 
@@ -518,6 +533,8 @@ def configure_security(nginx_config, translator, security_managers, project_path
         translator: The translator instance for localization
         security_managers: Dictionary containing the security module managers
         project_path: The project path for file operations
+        on_part_configured: Optional callable, called with "security" once the
+            security type is set
     """
     ca_manager = security_managers.get("ca_manager")
     client_cert_manager = security_managers.get("client_cert_manager")
@@ -542,6 +559,8 @@ def configure_security(nginx_config, translator, security_managers, project_path
                 nginx_config["security"]["type"] = "client_cert"
                 if configure_client_certificates(translator, client_cert_manager):
                     break
+    if on_part_configured:
+        on_part_configured("security")
     # Only prompt for IP restrictions once
     if not nginx_config.get("ip_restrictions_configured"):
         if ip_restrictions_manager:
@@ -794,9 +813,8 @@ def modify_security_settings(config, translator, security_managers):
 
                 display_waiting_for_htpasswd(htpasswd_file_path, translator)
 
+                # The confirmation prompt below blocks between checks
                 while True:
-                    time.sleep(1)
-
                     try:
                         htpasswd_exists = os.path.isfile(htpasswd_file_path)
 
@@ -956,6 +974,72 @@ def modify_domain_name(config, translator):
     return config
 
 
+def _prompt_upstream_keepalive(nginx_config, translator):
+    """Ask for the upstream keepalive pool size and store it in the nginx config."""
+    from .performance import resolve_profile
+
+    profile_default = resolve_profile(
+        {"performance_profile": nginx_config.get("performance_profile")}
+    )["settings"]["upstream_keepalive"]
+    keepalive = prompt_upstream_keepalive(
+        translator, profile_default, nginx_config.get("upstream_keepalive")
+    )
+    if keepalive is None:
+        nginx_config.pop("upstream_keepalive", None)
+    else:
+        nginx_config["upstream_keepalive"] = keepalive
+    logger.debug(
+        f"Upstream keepalive pool: {profile_default if keepalive is None else keepalive}"
+    )
+
+
+def modify_performance_profile(config, translator):
+    """
+    Modify the nginx performance profile and upstream keepalive pool, then
+    regenerate the nginx configuration.
+
+    Args:
+        config: The configuration dictionary
+        translator: The translator instance for localization
+
+    Returns:
+        dict: The updated configuration dictionary
+    """
+    from ..configurations import TEMPLATES
+    from .generator import generate_nginx_configs
+    from .performance import DEFAULT_PROFILE
+
+    nginx_config = config["nginx"]
+    current_profile = nginx_config.get("performance_profile", DEFAULT_PROFILE)
+    console.print(
+        f"[bold cyan]{translator.get('Current nginx performance profile')}: {current_profile}[/]"
+    )
+
+    current_keepalive = nginx_config.get("upstream_keepalive")
+    profile = prompt_performance_profile(translator, current_profile)
+    nginx_config["performance_profile"] = profile
+    _prompt_upstream_keepalive(nginx_config, translator)
+    if (
+        profile == current_profile
+        and profile != "auto"
+        and nginx_config.get("upstream_keepalive") == current_keepalive
+    ):
+        console.print(f"[bold cyan]{translator.get('Performance profile unchanged.')}[/]")
+        return config
+
+    logger.info(f"Nginx performance profile set to {profile}")
+    if generate_nginx_configs(config, translator, TEMPLATES):
+        # The reload watcher in the nginx containers picks up the new files
+        console.print(
+            f"[bold green]{translator.get('Nginx configuration regenerated. Running nginx services reload it automatically.')}[/]"
+        )
+    else:
+        console.print(
+            f"[bold red]{translator.get('Failed to regenerate nginx configuration.')}[/]"
+        )
+    return config
+
+
 def configure_auth_bypass_ips(config, translator, security_managers):
     """
     Configure IP addresses that can bypass basic authentication.
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Host-aware nginx performance profiles for TeddyCloudStarter.
+Resolves the profile stored in config["nginx"]["performance_profile"] into
+concrete worker, connection, buffer and timeout settings, together with a
+short explanation of why each value was chosen.
+"""
+import os
+from typing import Any, Dict, Optional
+
+PERFORMANCE_PROFILES = ("auto", "small", "standard", "large")
+
+# Profile used for configurations created before profiles existed
+DEFAULT_PROFILE = "standard"
+
+_GIB = 1024**3
+
+PROFILE_SETTINGS = {
+    "small": {
+        "worker_processes": "1",
+        "worker_connections": 256,
+        "keepalive_timeout": "30s",
+        "keepalive_requests": 100,
+        "proxy_buffers": "4 8k",
+        "proxy_buffer_size": "16k",
+        "proxy_busy_buffers_size": "16k",
+        "ssl_session_cache_size": "2m",
+        "open_file_cache": "off",
+        "upstream_keepalive": 8,
+    },
+    "standard": {
+        "worker_processes": "auto",
+        "worker_connections": 1024,
+        "keepalive_timeout": "65s",
+        "keepalive_requests": 1000,
+        "proxy_buffers": "8 16k",
+        "proxy_buffer_size": "32k",
+        "proxy_busy_buffers_size": "32k",
+        "ssl_session_cache_size": "10m",
+        "open_file_cache": "max=1000 inactive=60s",
+        "upstream_keepalive": 32,
+    },
+    "large": {
+        "worker_processes": "auto",
+        "worker_connections": 4096,
+        "keepalive_timeout": "65s",
+        "keepalive_requests": 10000,
+        "proxy_buffers": "16 16k",
+        "proxy_buffer_size": "32k",
+        "proxy_busy_buffers_size": "64k",
+        "ssl_session_cache_size": "50m",
+        "open_file_cache": "max=10000 inactive=60s",
+        "upstream_keepalive": 64,
+    },
+}
+
+PROFILE_DESCRIPTIONS = {
+    "auto": "Detect from CPU cores, memory and file descriptor limit",
+    "small": "Single-board computers such as a Raspberry Pi Zero, a few boxes",
+    "standard": "Typical home server, up to a few dozen boxes",
+    "large": "Dedicated server, hundreds of boxes",
+}
+
+_REASONS = {
+    "worker_processes": {
+        "small": "one worker keeps memory use minimal on small hosts",
+        "standard": "one worker per CPU core visible to the container",
+        "large": "one worker per CPU core visible to the container",
+    },
+    "worker_connections": {
+        "small": "256 connections per worker are enough for a handful of boxes",
+        "standard": "1024 connections per worker serve a few dozen boxes plus the web UI",
+        "large": "4096 connections per worker for hundreds of concurrently streaming boxes",
+    },
+    "worker_rlimit_nofile": "each proxied connection needs two descriptors, client and upstream",
+    "keepalive_timeout": {
+        "small": "idle connections are closed quickly to free memory",
+        "standard": "idle web UI connections are reused for about a minute",
+        "large": "idle web UI connections are reused for about a minute",
+    },
+    "keepalive_requests": "requests served over one keepalive connection before it is recycled",
+    "proxy_buffers": {
+        "small": "small buffers bound per-request memory on hosts with little RAM",
+        "standard": "buffers sized for web UI and API responses",
+        "large": "larger buffers absorb bursts of parallel library requests",
+    },
+    "proxy_buffer_size": "holds the response headers of TeddyCloud",
+    "proxy_busy_buffers_size": "buffers that may be busy sending to a slow client",
+    "ssl_session_cache_size": "one megabyte holds about 4000 TLS sessions for fast reconnects",
+    "upstream_keepalive": {
+        "small": "8 idle connections to TeddyCloud are kept per worker",
+        "standard": "32 idle connections to TeddyCloud are kept per worker for the web UI",
+        "large": "64 idle connections to TeddyCloud are kept per worker for parallel API calls",
+    },
+    "open_file_cache": {
+        "small": "disabled, only a few files are served and memory is scarce",
+        "standard": "caches descriptors of frequently served files",
+        "large": "caches descriptors of frequently served files",
+    },
+}
+
+
+def detect_host() -> Dict[str, Optional[int]]:
+    """
+    Detect the resources of the host running the containers.
+
+    Returns:
+        Dict[str, Optional[int]]: "cores", "memory" (bytes) and "nofile" (hard
+        file descriptor limit); None where a value cannot be determined
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cores = len(os.sched_getaffinity(0))
+    else:
+        cores = os.cpu_count() or 1
+
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        memory = None
+
+    nofile = None
+    try:
+        import resource
+
+        _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard != resource.RLIM_INFINITY:
+            nofile = hard
+    except ImportError:
+        pass
+    return {"cores": cores, "memory": memory, "nofile": nofile}
+
+
+def _describe_host(host: Dict[str, Optional[int]]) -> str:
+    memory = f"{host['memory'] / _GIB:.1f} GiB RAM" if host.get("memory") else "unknown RAM"
+    nofile = f"nofile limit {host['nofile']}" if host.get("nofile") else "no nofile limit"
+    cores = f"{host['cores']} core{'s' if host['cores'] != 1 else ''}"
+    return f"{cores}, {memory}, {nofile}"
+
+
+def _auto_base(host: Dict[str, Optional[int]]) -> str:
+    memory = host.get("memory")
+    if host["cores"] <= 1 or (memory is not None and memory < _GIB):
+        return "small"
+    if host["cores"] >= 4 and (memory is None or memory >= 4 * _GIB):
+        return "large"
+    return "standard"
+
+
+def resolve_profile(
+    nginx_config: Dict[str, Any], host: Optional[Dict[str, Optional[int]]] = None
+) -> Dict[str, Any]:
+    """
+    Resolve the configured performance profile into nginx settings.
+
+    Args:
+        nginx_config: The nginx section of the configuration
+        host: Host resources, detected if not given (only used by "auto")
+
+    Returns:
+        Dict[str, Any]: "profile", "base", "summary", "settings" and "reasons"
+    """
+    profile = nginx_config.get("performance_profile") or DEFAULT_PROFILE
+    if profile not in PERFORMANCE_PROFILES:
+        profile = DEFAULT_PROFILE
+
+    if profile == "auto":
+        host = host or detect_host()
+        base = _auto_base(host)
+        summary = f"auto, detected {_describe_host(host)}, using {base} values"
+    else:
+        base = profile
+        summary = profile
+
+    settings = dict(PROFILE_SETTINGS[base])
+    reasons = {
+        key: reason[base] if isinstance(reason, dict) else reason
+        for key, reason in _REASONS.items()
+    }
+
+    if profile == "auto":
+        if base != "small":
+            settings["worker_processes"] = str(host["cores"])
+            reasons["worker_processes"] = f"one worker per detected core ({host['cores']})"
+        workers = int(settings["worker_processes"])
+        if host.get("memory"):
+            # Budget about 64 KiB per connection (TLS state and buffers) and
+            # at most a quarter of the RAM for all workers together
+            limit = max(host["memory"] // 4 // (64 * 1024) // workers, 128)
+            if limit < settings["worker_connections"]:
+                settings["worker_connections"] = limit
+                reasons["worker_connections"] = (
+                    f"limited to {limit} so all workers fit into a quarter of the RAM"
+                )
+        if host.get("nofile") and settings["worker_connections"] * 2 > host["nofile"]:
+            settings["worker_connections"] = max(host["nofile"] // 2, 128)
+            reasons["worker_connections"] = (
+                f"limited by the host file descriptor limit of {host['nofile']}"
+            )
+
+    keepalive = nginx_config.get("upstream_keepalive")
+    if keepalive is not None:
+        settings["upstream_keepalive"] = int(keepalive)
+        reasons["upstream_keepalive"] = (
+            f"pool size set in the configuration, {keepalive} idle connections per worker"
+            if keepalive
+            else "disabled in the configuration"
+        )
+
+    settings["worker_rlimit_nofile"] = settings["worker_connections"] * 2
+    return {
+        "profile": profile,
+        "base": base,
+        "summary": summary,
+        "settings": settings,
+        "reasons": reasons,
+    }
@@ -11,6 +11,31 @@ DOCKER_COMPOSE = """
 #       ANY MANUAL CHANGES WILL BE OVERWRITTEN ON NEXT GENERATION.             #
 ################################################################################
 
+{%- macro log_rotation() %}
+    logging:
+      driver: json-file
+      options:
+        max-size: "{{ logging.max_size }}"
+        max-file: "{{ logging.max_file }}"
+{%- endmacro %}
+{%- macro resource_limits(service) %}
+{%- set limits = io.limits.get(service, {}) %}
+{%- if limits.memory %}
+    mem_limit: {{ limits.memory }}
+{%- endif %}
+{%- if limits.cpus %}
+    cpus: {{ limits.cpus }}
+{%- endif %}
+{%- endmacro %}
+{%- macro nginx_tmpfs() %}
+{%- if io.nginx_tmpfs %}
+    tmpfs:
+    {%- for mount in io.nginx_tmpfs %}
+      - {{ mount }}
+    {%- endfor %}
+{%- endif %}
+{%- endmacro %}
+
 name: teddycloudstarter
 services:
   {%- if mode == "nginx" %}
@@ -18,13 +43,16 @@ services:
     container_name: nginx-edge
     tty: true
     hostname: {{ domain }}
+    {%- if logging.nginx_debug %}
     environment:
       - NGINX_DEBUG=all
       - SSL_TRACE=4
-    image: nginx:stable-alpine
-    command: "/bin/sh -c 'while :; do sleep 6h & wait $${!}; nginx -s reload; done & nginx -g \\\"daemon off;\\\"'"
+    {%- endif %}
+    image: {{ nginx_image }}
+    command: "/bin/sh -c '/bin/sh /usr/local/bin/reload-watcher.sh /etc/nginx /etc/letsencrypt & nginx -g \\\"daemon off;\\\"'"
     volumes:
       - ./configurations/nginx-edge.conf:/etc/nginx/nginx.conf:ro
+      - ./configurations/reload-watcher.sh:/usr/local/bin/reload-watcher.sh:ro
       {%- if https_mode == "letsencrypt" %}
       - certbot_conf:/etc/letsencrypt:ro
       - certbot_www:/var/www/certbot:ro
@@ -32,7 +60,10 @@ services:
     ports:
       - 80:80
       - 443:443
+    {{- nginx_tmpfs() }}
     restart: unless-stopped
+    {{- log_rotation() }}
+    {{- resource_limits("nginx-edge") }}
     depends_on:
       - teddycloud
       - nginx-auth
@@ -47,13 +78,16 @@ services:
     container_name: nginx-auth
     tty: true
     hostname: nginx-auth
+    {%- if logging.nginx_debug %}
     environment:
       - NGINX_DEBUG=all
       - SSL_TRACE=4
-    image: nginx:stable-alpine
-    command: "/bin/sh -c 'while :; do sleep 6h & wait $${!}; nginx -s reload; done & nginx -g \\\"daemon off;\\\"'"
+    {%- endif %}
+    image: {{ nginx_image }}
+    command: "/bin/sh -c '/bin/sh /usr/local/bin/reload-watcher.sh /etc/nginx /etc/letsencrypt{% if nginx_type == "extended" %} /teddycloud/certs{% endif %} & nginx -g \\\"daemon off;\\\"'"
     volumes:
       - ./configurations/nginx-auth.conf:/etc/nginx/nginx.conf:ro
+      - ./configurations/reload-watcher.sh:/usr/local/bin/reload-watcher.sh:ro
       {% if https_mode == "custom" %}
       - {{ cert_path }}
       {%- endif %}
@@ -79,7 +113,12 @@ services:
       {% if nginx_type == "extended" %}
       - certs:/teddycloud/certs:ro
       {%- endif %}
+    {{- nginx_tmpfs() }}
     restart: unless-stopped
+    {{- log_rotation() }}
+    {{- resource_limits("nginx-auth") }}
+    depends_on:
+      - teddycloud
     healthcheck:
       test: ["CMD", "nginx", "-t"]
       interval: 30s
@@ -101,7 +140,13 @@ services:
       - custom_img:/teddycloud/data/www/custom_img
       - custom_img:/teddycloud/data/library/custom_img
       - firmware:/teddycloud/data/firmware
+      {%- if not io.cache_tmpfs %}
       - cache:/teddycloud/data/cache
+      {%- endif %}
+    {%- if io.cache_tmpfs %}
+    tmpfs:
+      - {{ io.cache_tmpfs }}
+    {%- endif %}
     {%- if mode == "direct" %}
     ports:
       {%- if admin_http %}
@@ -113,6 +158,8 @@ services:
       - {{ teddycloud }}:443
     {%- endif %}
     restart: unless-stopped
+    {{- log_rotation() }}
+    {{- resource_limits("teddycloud") }}
     healthcheck:
       test: ["CMD", "curl", "-f", "http://localhost:80"]
       interval: 30s
@@ -132,6 +179,8 @@ services:
       - certbot_www:/var/www/certbot
       - certbot_logs:/var/log/letsencrypt
     restart: unless-stopped
+    {{- log_rotation() }}
+    {{- resource_limits("certbot") }}
     depends_on:
       - nginx-edge
 
@@ -161,20 +210,27 @@ NGINX_EDGE = """################################################################
 ################################################################################
 
 user nginx;
-worker_processes auto;
-error_log /var/log/nginx/error.log warn;
+# Performance profile: {{ performance.summary }}
+# worker_processes: {{ performance.reasons.worker_processes }}
+worker_processes {{ performance.settings.worker_processes }};
+# worker_rlimit_nofile: {{ performance.reasons.worker_rlimit_nofile }}
+worker_rlimit_nofile {{ performance.settings.worker_rlimit_nofile }};
+error_log {{ io.error_log }} {{ logging.error_level }};
 pid /var/run/nginx.pid;
 
 events {
-    worker_connections 1024;
+    # worker_connections: {{ performance.reasons.worker_connections }}
+    worker_connections {{ performance.settings.worker_connections }};
 }
 
 http {
     include /etc/nginx/mime.types;
     default_type application/octet-stream;
+    # keepalive_timeout: {{ performance.reasons.keepalive_timeout }}
+    keepalive_timeout {{ performance.settings.keepalive_timeout }};
 
     log_format teddystarter_format 'Log: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"';
-    access_log /var/log/nginx/access.log teddystarter_format;
+    access_log {{ io.access_log }} teddystarter_format{% if logging.access_buffer %} {{ logging.access_buffer }}{% endif %};
 
     upstream teddycloud_http {
         server teddycloud-app:80;
@@ -203,7 +259,7 @@ stream {
                        'BACKEND=$upstream '
                        'VERIFY=$ssl_client_verify '
                        'SESSION_ID=$ssl_session_id '
-                       'SESSION_REUSE=$ssl_session_reused '
+                       'SESSION_REUSE=$ssl_session_reused ';
 
     log_format stream_basic 'StreamLog: $remote_addr [$time_local] '
                        '$protocol $status $bytes_sent $bytes_received '
@@ -226,20 +282,34 @@ stream {
         server teddycloud-app:443;
     }
     {% endif %}
+    {%- if allowed_ips %}
+
+    # Allowed client ranges, looked up in a radix tree instead of a linear
+    # allow/deny list; other clients are sent to a closed port
+    geo $remote_addr $client_allowed {
+        default 0;
+        {%- for ip in allowed_ips %}
+        {{ ip }} 1;
+        {%- endfor %}
+    }
+
+    map $client_allowed $allowed_upstream {
+        0 rejected_backend;
+        default $upstream;
+    }
+
+    upstream rejected_backend {
+        server 127.0.0.1:10;
+    }
+    {%- endif %}
 
     server {
-        {%- if allowed_ips %}
-        {% for ip in allowed_ips %}
-        allow {{ ip }};
-        {% endfor %}
-        deny all;
-        {%- endif %}
         listen 443;
         ssl_preread on;
         ssl_certificate_cache off;
         ssl_session_cache off;
         proxy_ssl_conf_command Options UnsafeLegacyRenegotiation;
-        proxy_pass $upstream;
+        proxy_pass {% if allowed_ips %}$allowed_upstream{% else %}$upstream{% endif %};
     }
 }
 """
@@ -251,13 +321,18 @@ NGINX_AUTH = """################################################################
 ################################################################################
 
 user nginx;
-worker_processes auto;
+# Performance profile: {{ performance.summary }}
+# worker_processes: {{ performance.reasons.worker_processes }}
+worker_processes {{ performance.settings.worker_processes }};
+# worker_rlimit_nofile: {{ performance.reasons.worker_rlimit_nofile }}
+worker_rlimit_nofile {{ performance.settings.worker_rlimit_nofile }};
 
-error_log /var/log/nginx/error.log warn;
+error_log {{ io.error_log }} {{ logging.error_level }};
 pid /var/run/nginx.pid;
 
 events {
-    worker_connections 1024;
+    # worker_connections: {{ performance.reasons.worker_connections }}
+    worker_connections {{ performance.settings.worker_connections }};
 }
 
 http {
@@ -265,20 +340,35 @@ http {
     default_type application/octet-stream;
     sendfile        on;
     tcp_nopush      on;
-    keepalive_timeout  65;
+    # keepalive_timeout: {{ performance.reasons.keepalive_timeout }}
+    keepalive_timeout  {{ performance.settings.keepalive_timeout }};
+    # keepalive_requests: {{ performance.reasons.keepalive_requests }}
+    keepalive_requests {{ performance.settings.keepalive_requests }};
+    # open_file_cache: {{ performance.reasons.open_file_cache }}
+    open_file_cache {{ performance.settings.open_file_cache }};
     log_format teddystarter_format 'Log: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"';
-    access_log /var/log/nginx/access.log teddystarter_format;
+    access_log {{ io.access_log }} teddystarter_format{% if logging.access_buffer %} {{ logging.access_buffer }}{% endif %};
     ssl_session_tickets       off;
     ssl_session_cache         none;
     proxy_request_buffering   off;
     proxy_buffering           off;
 
+    upstream teddycloud_web {
+        server teddycloud-app:80;
+        {%- if performance.settings.upstream_keepalive %}
+        # keepalive: {{ performance.reasons.upstream_keepalive }}
+        keepalive {{ performance.settings.upstream_keepalive }};
+        keepalive_requests {{ performance.settings.keepalive_requests }};
+        keepalive_timeout 60s;
+        {%- endif %}
+    }
+
     {% if security_type == "basic_auth" and auth_bypass_ips %}
     geo $auth_bypass {
         default 0;
-        {% for ip in auth_bypass_ips %}
+        {%- for ip in auth_bypass_ips %}
         {{ ip }} 1;
-        {% endfor %}
+        {%- endfor %}
     }
 
     map $auth_bypass $auth_basic_realm {
@@ -308,7 +398,8 @@ http {
         ssl_protocols TLSv1.2 TLSv1.3;
         ssl_prefer_server_ciphers on;
         ssl_ciphers "ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384:ECDHE-ECDSA-CHACHA20-POLY1305:ECDHE-RSA-CHACHA20-POLY1305:ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256";
-        ssl_session_cache shared:SSL:10m;
+        # ssl_session_cache: {{ performance.reasons.ssl_session_cache_size }}
+        ssl_session_cache shared:SSL:{{ performance.settings.ssl_session_cache_size }};
         ssl_session_timeout 1d;
         ssl_session_tickets off;
 
@@ -338,10 +429,18 @@ http {
             proxy_read_timeout  10800s;
             proxy_send_timeout  10800s;
             send_timeout  10800s;
-            proxy_buffers 8 16k;
-            proxy_buffer_size 32k;
-            proxy_busy_buffers_size 32k;
-            proxy_pass http://teddycloud-app:80;
+            # proxy_buffers: {{ performance.reasons.proxy_buffers }}
+            proxy_buffers {{ performance.settings.proxy_buffers }};
+            # proxy_buffer_size: {{ performance.reasons.proxy_buffer_size }}
+            proxy_buffer_size {{ performance.settings.proxy_buffer_size }};
+            # proxy_busy_buffers_size: {{ performance.reasons.proxy_busy_buffers_size }}
+            proxy_busy_buffers_size {{ performance.settings.proxy_busy_buffers_size }};
+            {%- if performance.settings.upstream_keepalive %}
+            # Reuse pooled upstream connections instead of closing them per request
+            proxy_http_version 1.1;
+            proxy_set_header Connection "";
+            {%- endif %}
+            proxy_pass http://teddycloud_web;
         }
     }
 }
@@ -360,28 +459,34 @@ stream {
                        'CLIENT_STATUS=$client_status '
                        'CLIENT_DN=$ssl_client_s_dn '
                        'CLIENT_SN=$ssl_client_serial '
-                       'CLIENT_CERT=$ssl_client_raw_cert ';
+                       {%- if logging.raw_cert %}
+                       'CLIENT_CERT=$ssl_client_raw_cert '
+                       {%- endif %};
     log_format stream_basic 'StreamLog: $remote_addr [$time_local] '
                        '$protocol $status $bytes_sent $bytes_received '
                        '$session_time';
-    access_log /var/log/nginx/stream_access.log stream_detailed;
-    error_log /var/log/nginx/stream_error.log debug;
+    access_log {{ io.stream_access_log }} {{ logging.stream_log_format }}{% if logging.access_buffer %} {{ logging.access_buffer }}{% endif %};
+    error_log {{ io.stream_error_log }} {{ logging.stream_error_level }};
+
+    # Box fingerprints are looked up once per connection in a single hash;
+    # everything else is derived from the resulting MAC address
+    map_hash_max_size {{ box_map_size }};
+    map_hash_bucket_size 128;
 
-    map $ssl_client_fingerprint $stream_reject {
-        default 1;
-        {% for box in boxes %}{{ box[0] }} 0;
-        {% endfor %}
-    }
     map $ssl_client_fingerprint $mac_address {
         default "000000000000";
         {% for box in boxes %}{{ box[0] }} {{ box[1] }};
         {% endfor %}
     }
 
-    map $ssl_client_fingerprint $client_status {
-        default "unknown_client";
-        {% for box in boxes %}{{ box[0] }} "client_authorized";
-        {% endfor %}
+    map $mac_address $stream_reject {
+        "000000000000" 1;
+        default 0;
+    }
+
+    map $mac_address $client_status {
+        "000000000000" "unknown_client";
+        default "client_authorized";
     }
 
     upstream authorized_backend {
@@ -392,9 +497,9 @@ stream {
         server 127.0.0.1:10;
     }
 
-    map $stream_reject $backend {
-        0 authorized_backend;
-        1 rejected_backend;
+    map $mac_address $backend {
+        "000000000000" rejected_backend;
+        default authorized_backend;
     }
 
     server {
@@ -410,13 +515,16 @@ stream {
         ssl_session_tickets off;
         proxy_connect_timeout  60s;
         proxy_timeout 10800s;
-        access_log /var/log/nginx/stream_access.log stream_detailed;
-        error_log /var/log/nginx/stream_error.log debug;
+        access_log {{ io.stream_access_log }} {{ logging.stream_log_format }}{% if logging.access_buffer %} {{ logging.access_buffer }}{% endif %};
+        error_log {{ io.stream_error_log }} {{ logging.stream_error_level }};
         proxy_pass $backend;
         proxy_socket_keepalive on;
         proxy_ssl on;
         proxy_ssl_certificate /teddycloud/certs/client/$mac_address/client.pem;
         proxy_ssl_certificate_key /teddycloud/certs/client/$mac_address/private.pem;
+        # Parse each box's certificate and key once and reuse them for later
+        # connections; files are re-checked for changes every minute
+        proxy_ssl_certificate_cache max={{ cert_cache_size }} inactive=1h valid=1m;
         proxy_ssl_verify off;
         proxy_ssl_conf_command Options UnsafeLegacyRenegotiation;
         proxy_ssl_protocols TLSv1.2 TLSv1.3;
@@ -427,8 +535,92 @@ stream {
 {% endif %}
 """
 
+NGINX_RELOAD_WATCHER = """#!/bin/sh
+################################################################################
+#                               WARNING                                        #
+#       DO NOT MODIFY THIS FILE MANUALLY. IT IS MANAGED BY TEDDYCLOUDSTARTER.  #
+#       ANY MANUAL CHANGES WILL BE OVERWRITTEN ON NEXT GENERATION.             #
+################################################################################
+#
+# Reloads nginx when a certificate, CRL or configuration file below the given
+# paths changes. Waits on inotify events (busybox inotifyd) and reloads once
+# changes have settled; a periodic fingerprint check covers hosts where file
+# events do not reach the container.
+#
+# Usage: reload-watcher.sh PATH...
+
+DEBOUNCE="${RELOAD_DEBOUNCE:-5}"
+CHECK_INTERVAL="${RELOAD_CHECK_INTERVAL:-900}"
+POLL_INTERVAL="${RELOAD_POLL_INTERVAL:-60}"
+STATE_FILE="${RELOAD_STATE_FILE:-/var/run/nginx-reloads}"
+EVENTS=/tmp/reload-watcher.events
+
+log() {
+    echo "reload-watcher: $*"
+}
+
+# Hashes the file contents: files are rewritten in place, which can keep
+# their inode, size and (whole second) modification time
+fingerprint() {
+    find -L "$@" -type f 2>/dev/null | sort | xargs -r md5sum 2>/dev/null | md5sum
+}
+
+wait_for_events() {
+    watched=$(find -L "$@" -type d -o -type f 2>/dev/null | sed 's/$/:cwnmydDM/')
+    [ -n "$watched" ] || return 1
+    rm -f "$EVENTS"
+    mkfifo "$EVENTS" || return 1
+    inotifyd - $watched > "$EVENTS" 2>/dev/null &
+    watcher=$!
+    exec 3< "$EVENTS"
+    if read -r -t "$CHECK_INTERVAL" _ <&3; then
+        # Let bursts such as a certificate renewal settle before reloading
+        while read -r -t "$DEBOUNCE" _ <&3; do :; done
+    fi
+    alive=0
+    kill -0 "$watcher" 2>/dev/null && alive=1
+    kill "$watcher" 2>/dev/null
+    wait "$watcher" 2>/dev/null
+    exec 3<&-
+    rm -f "$EVENTS"
+    [ "$alive" = 1 ]
+}
+
+use_inotify=0
+command -v inotifyd >/dev/null 2>&1 && use_inotify=1
+reloads=0
+echo "$reloads" > "$STATE_FILE"
+last=$(fingerprint "$@")
+log "watching $* (inotify: $use_inotify)"
+
+while :; do
+    if [ "$use_inotify" = 1 ]; then
+        if ! wait_for_events "$@"; then
+            log "inotify unavailable, checking every ${POLL_INTERVAL}s"
+            use_inotify=0
+        fi
+    else
+        sleep "$POLL_INTERVAL"
+    fi
+
+    current=$(fingerprint "$@")
+    [ "$current" = "$last" ] && continue
+    last=$current
+
+    if nginx -t -q; then
+        nginx -s reload
+        reloads=$((reloads + 1))
+        echo "$reloads $(date +%s)" > "$STATE_FILE"
+        log "reloaded nginx after a file change (reload $reloads)"
+    else
+        log "configuration test failed, keeping the running configuration"
+    fi
+done
+"""
+
 TEMPLATES = {
     "docker-compose": DOCKER_COMPOSE,
     "nginx-edge": NGINX_EDGE,
     "nginx-auth": NGINX_AUTH,
+    "nginx-reload-watcher": NGINX_RELOAD_WATCHER,
 }
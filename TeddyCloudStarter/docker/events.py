@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Event-driven service state for TeddyCloudStarter.
+A background subscriber to `docker events` keeps an in-memory table of the
+project's containers up to date, so status displays read memory instead of
+calling docker, and waits block on state changes instead of polling.
+"""
+import atexit
+import datetime
+import json
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from ..utilities.logger import logger
+from ..utilities.process import COMPOSE_PROJECT, open_process, run_command
+
+_PROJECT_FILTER = f"label=com.docker.compose.project={COMPOSE_PROJECT}"
+
+_INSPECT_FORMAT = (
+    '{{index .Config.Labels "com.docker.compose.service"}}\t{{.Name}}'
+    "\t{{.State.Status}}\t{{.State.StartedAt}}"
+    "\t{{if .State.Health}}{{.State.Health.Status}}{{end}}"
+)
+
+# Container event actions and the state they leave the container in
+_ACTION_STATES = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+}
+
+_monitor: Optional["ServiceStateMonitor"] = None
+_monitor_lock = threading.Lock()
+
+
+def _parse_timestamp(value: str) -> Optional[float]:
+    """Parse a Docker RFC 3339 timestamp (nanosecond precision) to epoch seconds."""
+    if not value or value.startswith("0001-"):
+        return None
+    try:
+        parsed = datetime.datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def format_running_for(started_at: Optional[float]) -> str:
+    """
+    Format how long a container has been running, like `docker ps` does.
+
+    Args:
+        started_at: Start time in epoch seconds
+
+    Returns:
+        str: Human-readable duration, e.g. "5 minutes ago"
+    """
+    if not started_at:
+        return ""
+    seconds = max(int(time.time() - started_at), 0)
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+    return f"{seconds} seconds ago"
+
+
+class ServiceStateMonitor:
+    """In-memory service state table fed by the Docker event stream."""
+
+    def __init__(self):
+        self._states: Dict[str, Dict] = {}
+        self._condition = threading.Condition()
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._version = 0
+
+    @property
+    def live(self) -> bool:
+        """True while the event stream is connected."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """
+        Take a snapshot of the project's containers and subscribe to their events.
+
+        Returns:
+            bool: True if the event stream is connected
+        """
+        try:
+            # Subscribe before the snapshot so no event in between is lost
+            self._process = open_process(
+                [
+                    "docker",
+                    "events",
+                    "--filter",
+                    "type=container",
+                    "--filter",
+                    _PROJECT_FILTER,
+                    "--format",
+                    "{{json .}}",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError as e:
+            logger.debug(f"Could not subscribe to docker events: {e}")
+            return False
+        self._snapshot()
+        self._thread = threading.Thread(
+            target=self._read_events, name="tcs-docker-events", daemon=True
+        )
+        self._thread.start()
+        return self.live
+
+    def stop(self) -> None:
+        """Disconnect from the event stream."""
+        if self.live:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+    def _snapshot(self) -> None:
+        try:
+            ids = run_command(
+                ["docker", "ps", "--all", "--quiet", "--filter", _PROJECT_FILTER]
+            )
+            container_ids = ids.stdout.split() if ids.ok else []
+            inspected = (
+                run_command(["docker", "inspect", "--format", _INSPECT_FORMAT, *container_ids])
+                if container_ids
+                else None
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Could not read container states: {e}")
+            return
+        states = {}
+        for line in inspected.stdout.splitlines() if inspected and inspected.ok else []:
+            parts = line.split("\t")
+            if len(parts) != 5:
+                continue
+            service, name, state, started_at, health = parts
+            states[service or name.lstrip("/")] = {
+                "container": name.lstrip("/"),
+                "state": state,
+                "started_at": _parse_timestamp(started_at),
+                "health": health or None,
+            }
+        with self._condition:
+            self._states = states
+            self._changed()
+
+    def _changed(self) -> None:
+        self._version += 1
+        self._condition.notify_all()
+
+    def _apply(self, event: Dict) -> None:
+        action = event.get("Action") or event.get("status") or ""
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        service = attributes.get("com.docker.compose.service") or attributes.get("name")
+        if not service:
+            return
+        with self._condition:
+            if action == "destroy":
+                self._states.pop(service, None)
+                self._changed()
+                return
+            entry = self._states.setdefault(
+                service,
+                {
+                    "container": attributes.get("name", service),
+                    "state": "created",
+                    "started_at": None,
+                    "health": None,
+                },
+            )
+            if action.startswith("health_status"):
+                entry["health"] = action.split(":", 1)[1].strip()
+            elif action in _ACTION_STATES:
+                entry["state"] = _ACTION_STATES[action]
+                if entry["state"] == "running" and action != "unpause":
+                    entry["started_at"] = event.get("time") or time.time()
+                    entry["health"] = None
+            else:
+                return
+            self._changed()
+
+    def _read_events(self) -> None:
+        for line in self._process.stdout:
+            try:
+                self._apply(json.loads(line))
+            except (json.JSONDecodeError, AttributeError) as e:
+                logger.debug(f"Ignoring docker event '{line.strip()}': {e}")
+        logger.debug("Docker event stream closed.")
+        with self._condition:
+            self._changed()
+
+    def states(self) -> Dict[str, Dict]:
+        """
+        Return a copy of the current service state table.
+
+        Returns:
+            Dict[str, Dict]: Service name to container, state, started_at and health
+        """
+        with self._condition:
+            return {service: dict(entry) for service, entry in self._states.items()}
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the state table changes.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            bool: True if the table changed, False on timeout
+        """
+        with self._condition:
+            version = self._version
+            return self._condition.wait_for(
+                lambda: self._version != version, timeout=timeout
+            )
+
+    def wait_for(
+        self, predicate: Callable[[Dict[str, Dict]], bool], timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Block until the state table satisfies a condition.
+
+        Args:
+            predicate: Called with the state table, returns True when done
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            bool: True if the condition was met, False on timeout or if the
+            event stream was lost
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: predicate(self._states) or not self.live, timeout=timeout
+            ) and predicate(self._states)
+
+
+def get_service_monitor() -> Optional[ServiceStateMonitor]:
+    """
+    Return the process-wide service state monitor, starting it on first use.
+
+    Returns:
+        Optional[ServiceStateMonitor]: The monitor, or None if docker events
+        are unavailable
+    """
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None or not _monitor.live:
+            monitor = ServiceStateMonitor()
+            if not monitor.start():
+                return None
+            atexit.register(monitor.stop)
+            _monitor = monitor
+        return _monitor
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Docker image management for TeddyCloudStarter.
+Defines the images the starter uses, pulls the ones a configuration needs
+concurrently with a single progress view, and keeps a local cache of image
+IDs and digests so images checked recently are neither pulled again nor
+looked up in the registry.
+"""
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import as_completed
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeElapsedColumn,
+)
+
+from ..config_manager import DEFAULT_CONFIG_PATH, ConfigManager, write_file_atomic
+from ..utilities.logger import logger
+from ..utilities.process import COMPOSE_TIMEOUT, run_command, submit_command
+
+console = Console()
+
+TEDDYCLOUD_IMAGE = "ghcr.io/toniebox-reverse-engineering/teddycloud"
+# Pinned to a release line that is at least 1.27.4, which the extended mode's
+# proxy_ssl_certificate_cache needs; a locally cached "stable" tag can be older
+NGINX_IMAGE = "nginx:1.28-alpine"
+CERTBOT_IMAGE = "certbot/certbot:latest"
+HTPASSWD_IMAGE = "httpd:alpine"
+# Image for one-off containers (volume backups, copying files into volumes).
+# The nginx image is Alpine based and needed in nginx mode anyway, so no
+# separate alpine image is pulled.
+HELPER_IMAGE = NGINX_IMAGE
+
+IMAGE_CACHE_FILE = "image_cache.json"
+
+# Seconds after which a cached image is checked against the registry again
+IMAGE_CHECK_INTERVAL = 24 * 60 * 60
+
+
+def teddycloud_image(config: Dict[str, Any]) -> str:
+    """Return the TeddyCloud image reference of a configuration."""
+    return f"{TEDDYCLOUD_IMAGE}:{config.get('teddycloud_image_tag', 'latest')}"
+
+
+def required_images(config: Dict[str, Any]) -> Set[str]:
+    """
+    Return every image the services and maintenance tasks of a configuration use.
+
+    Args:
+        config: The configuration dictionary
+
+    Returns:
+        Set[str]: Image references
+    """
+    images = {teddycloud_image(config), HELPER_IMAGE}
+    if config.get("mode") == "nginx":
+        nginx_config = config.get("nginx", {})
+        images.add(NGINX_IMAGE)
+        if nginx_config.get("https_mode") == "letsencrypt":
+            images.add(CERTBOT_IMAGE)
+        if nginx_config.get("security", {}).get("type") == "basic_auth":
+            images.add(HTPASSWD_IMAGE)
+    return images
+
+
+class ImageManager:
+    """Pulls images on demand and caches what was pulled."""
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH, translator=None):
+        """
+        Initialize the image manager.
+
+        Args:
+            config_path: Path of the configuration file; the image cache is
+                stored next to it
+            translator: The translator instance for localization
+        """
+        self.cache_path = os.path.join(os.path.dirname(config_path), IMAGE_CACHE_FILE)
+        self.translator = translator
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable image cache {self.cache_path}: {e}")
+
+    def _translate(self, text: str) -> str:
+        if self.translator:
+            return self.translator.get(text)
+        return text
+
+    def _save_cache(self) -> None:
+        with self._lock:
+            data = json.dumps(self._cache, indent=2, sort_keys=True)
+        try:
+            write_file_atomic(self.cache_path, data)
+        except OSError as e:
+            logger.warning(f"Could not write image cache {self.cache_path}: {e}")
+
+    @staticmethod
+    def inspect(image: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Look up a local image.
+
+        Args:
+            image: Image reference
+
+        Returns:
+            Optional[Tuple[str, Optional[str]]]: (image_id, repo_digest), None
+            if the image is not present
+        """
+        try:
+            result = run_command(
+                ["docker", "image", "inspect", "--format", "{{.Id}} {{json .RepoDigests}}", image]
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if not result.ok or not result.stdout.strip():
+            return None
+        image_id, _, digests = result.stdout.strip().partition(" ")
+        try:
+            digests = json.loads(digests) or []
+        except ValueError:
+            digests = []
+        return image_id, digests[0] if digests else None
+
+    def _record(self, image: str) -> None:
+        local = self.inspect(image)
+        with self._lock:
+            if local is None:
+                self._cache.pop(image, None)
+                return
+            self._cache[image] = {"id": local[0], "digest": local[1], "checked": time.time()}
+
+    def is_current(self, image: str, max_age: Optional[float] = IMAGE_CHECK_INTERVAL) -> bool:
+        """
+        Return True if an image needs no pull.
+
+        Args:
+            image: Image reference
+            max_age: Seconds a registry check stays valid, None if presence
+                alone is enough
+
+        Returns:
+            bool: True if the image is present and, unless pinned by digest
+            or max_age is None, was pulled or checked within max_age
+        """
+        local = self.inspect(image)
+        if local is None:
+            return False
+        if max_age is None or "@sha256:" in image:
+            return True
+        with self._lock:
+            entry = self._cache.get(image)
+        return bool(
+            entry
+            and entry.get("id") == local[0]
+            and time.time() - entry.get("checked", 0) < max_age
+        )
+
+    def pull(self, image: str) -> Tuple[bool, str]:
+        """
+        Pull an image and record it in the cache.
+
+        Args:
+            image: Image reference
+
+        Returns:
+            Tuple[bool, str]: (success, error_message)
+        """
+        try:
+            result = run_command(["docker", "pull", "--quiet", image], timeout=COMPOSE_TIMEOUT)
+        except (OSError, subprocess.SubprocessError) as e:
+            return False, str(e)
+        if not result.ok:
+            return False, result.stderr.strip()
+        self._record(image)
+        self._save_cache()
+        return True, ""
+
+    def ensure_image(
+        self, image: str, max_age: Optional[float] = IMAGE_CHECK_INTERVAL
+    ) -> Tuple[bool, str]:
+        """
+        Pull an image unless it is current.
+
+        Args:
+            image: Image reference
+            max_age: See is_current()
+
+        Returns:
+            Tuple[bool, str]: (success, error_message)
+        """
+        if self.is_current(image, max_age):
+            logger.debug(f"Image {image} is up to date, not pulling it.")
+            return True, ""
+        logger.info(f"Pulling image {image}")
+        return self.pull(image)
+
+    def ensure_images(
+        self,
+        images: Iterable[str],
+        max_age: Optional[float] = IMAGE_CHECK_INTERVAL,
+        force: bool = False,
+        show_progress: bool = True,
+    ) -> Dict[str, bool]:
+        """
+        Pull several images concurrently, skipping the current ones.
+
+        Args:
+            images: Image references
+            max_age: See is_current()
+            force: Pull every image, even if it is current
+            show_progress: Show one combined progress bar for all pulls
+
+        Returns:
+            Dict[str, bool]: Image to whether it is available afterwards
+        """
+        images = sorted(set(images))
+        results = {image: True for image in images}
+        to_pull = [image for image in images if force or not self.is_current(image, max_age)]
+        if not to_pull:
+            logger.debug("All images are up to date.")
+            return results
+        logger.info(f"Pulling images: {to_pull}")
+        futures = {
+            submit_command(["docker", "pull", "--quiet", image], timeout=COMPOSE_TIMEOUT): image
+            for image in to_pull
+        }
+        progress = Progress(
+            SpinnerColumn(),
+            TextColumn("{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+            disable=not show_progress,
+        )
+        with progress:
+            task = progress.add_task(self._translate("Pulling Docker images"), total=len(to_pull))
+            for future in as_completed(futures):
+                image = futures[future]
+                try:
+                    result = future.result()
+                    success, error = result.ok, result.stderr.strip()
+                except (OSError, subprocess.SubprocessError) as e:
+                    success, error = False, str(e)
+                results[image] = success
+                if success:
+                    self._record(image)
+                    progress.console.print(f"[green]{self._translate('Pulled')} {image}[/]")
+                else:
+                    logger.warning(f"Pulling {image} failed: {error}")
+                    progress.console.print(
+                        f"[bold red]{self._translate('Failed to pull')} {image}: {error}[/]"
+                    )
+                progress.advance(task)
+        self._save_cache()
+        return results
+
+
+def pull_required_images(config_path: str = DEFAULT_CONFIG_PATH, force: bool = False) -> int:
+    """
+    Pull every image the current configuration needs.
+
+    Args:
+        config_path: Path to the TeddyCloudStarter configuration file
+        force: Pull images even if they were checked recently
+
+    Returns:
+        int: Process exit code (0 if all images are available, 1 otherwise)
+    """
+    config = ConfigManager(config_path=config_path).config
+    results = ImageManager(config_path).ensure_images(required_images(config), force=force)
+    failed = [image for image, success in results.items() if not success]
+    if failed:
+        console.print(f"[bold red]Images not available: {', '.join(failed)}[/]")
+        return 1
+    console.print(f"[bold green]All {len(results)} images are available.[/]")
+    return 0
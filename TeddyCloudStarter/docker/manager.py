@@ -7,8 +7,17 @@ import subprocess
 import time
 from typing import Dict, Optional, Tuple
 
+from rich import box
 from rich.console import Console
+from rich.table import Table
 from ..utilities.logger import logger
+from .images import HELPER_IMAGE
+from ..utilities.process import (
+    COMPOSE_TIMEOUT,
+    compose_args,
+    open_process,
+    run_command,
+)
 
 console = Console()
 
@@ -20,6 +29,8 @@ class DockerManager:
         self.docker_available = False
         self.compose_cmd = None
         self.translator = translator
+        # Latest backup directory listing as (backup_dir, file stamps, backups)
+        self._backup_listing = None
         logger.debug("Initializing DockerManager instance.")
         self._check_docker()
 
@@ -27,16 +38,9 @@ class DockerManager:
         """Check if Docker and Docker Compose are available."""
         logger.debug("Checking Docker and Docker Compose availability.")
         try:
-            subprocess.run(
-                ["docker", "--version"], check=True, capture_output=True, text=True
-            )
+            run_command(["docker", "--version"], check=True)
             logger.debug("Docker is available.")
-            subprocess.run(
-                ["docker", "compose", "version"],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            run_command(["docker", "compose", "version"], check=True)
             logger.debug("Docker Compose is available.")
             self.compose_cmd = ["docker", "compose"]
             self.docker_available = True
@@ -62,9 +66,7 @@ class DockerManager:
         error_message = None
 
         try:
-            result = subprocess.run(
-                ["docker", "--version"], check=True, capture_output=True, text=True
-            )
+            result = run_command(["docker", "--version"], check=True)
             prerequisites["docker"] = True
             logger.debug(f"Docker version output: {result.stdout.strip()}")
         except (subprocess.SubprocessError, FileNotFoundError) as e:
@@ -72,23 +74,13 @@ class DockerManager:
             logger.warning(f"Docker not available: {e}")
 
         try:
-            result = subprocess.run(
-                ["docker", "compose", "version"],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            result = run_command(["docker", "compose", "version"], check=True)
             prerequisites["docker_compose"] = True
             logger.debug(f"Docker Compose version output: {result.stdout.strip()}")
         except (subprocess.SubprocessError, FileNotFoundError) as e:
             logger.debug(f"docker compose not found, trying docker-compose: {e}")
             try:
-                result = subprocess.run(
-                    ["docker-compose", "--version"],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
+                result = run_command(["docker-compose", "--version"], check=True)
                 prerequisites["docker_compose"] = True
                 logger.debug(f"docker-compose version output: {result.stdout.strip()}")
             except (subprocess.SubprocessError, FileNotFoundError) as e2:
@@ -150,6 +142,58 @@ class DockerManager:
         base_path = project_path if project_path else os.getcwd()
         return os.path.join(base_path, "data")
 
+    def _compose(self, data_dir, *args, capture=False, timeout=COMPOSE_TIMEOUT):
+        """
+        Run a docker compose command for the project in data_dir.
+
+        Args:
+            data_dir: Directory containing docker-compose.yml
+            *args: Compose sub-command and its arguments
+            capture: Capture output instead of passing it through to the terminal
+            timeout: Seconds after which the command is killed
+
+        Returns:
+            CommandResult: The command result
+
+        Raises:
+            subprocess.CalledProcessError: If the command failed
+        """
+        return run_command(
+            compose_args(data_dir, *args, compose_cmd=self.compose_cmd),
+            cwd=data_dir,
+            timeout=timeout,
+            capture=capture,
+            check=True,
+        )
+
+    def _schedule(self, operation, services=None, project_path=None):
+        """
+        Run a dependency-aware start, stop or restart.
+
+        Args:
+            operation: "start", "stop", "restart", "rolling_restart" or "upgrade"
+            services: Services to act on, defaults to all services
+            project_path: Path to the project directory (optional)
+
+        Returns:
+            Tuple: The result of the ServiceScheduler operation
+
+        Raises:
+            FileNotFoundError: If docker-compose.yml does not exist
+            ValueError: If the service dependencies contain a cycle
+        """
+        from .scheduler import ServiceScheduler
+
+        scheduler = ServiceScheduler(
+            self._get_data_dir(project_path), compose_cmd=self.compose_cmd
+        )
+        return getattr(scheduler, operation)(services)
+
+    def _report_failed(self, failed):
+        if failed:
+            error_msg = f"Services failed or did not become healthy: {', '.join(failed)}"
+            console.print(f"[bold red]{self._translate(error_msg)}[/]")
+
     def down_services(self, project_path=None):
         """
         Completely stop and remove Docker containers, networks defined in docker-compose.yml.
@@ -168,7 +212,6 @@ class DockerManager:
             console.print(
                 f"[bold yellow]{self._translate('Stopping and removing all Docker services...')}[/]"
             )
-            original_dir = os.getcwd()
             data_dir = self._get_data_dir(project_path)
             docker_compose_path = os.path.join(data_dir, "docker-compose.yml")
             if not os.path.exists(docker_compose_path):
@@ -176,20 +219,11 @@ class DockerManager:
                     f"[yellow]{self._translate('No docker-compose.yml found, skipping Docker service shutdown')}"
                 )
                 return False
-            os.chdir(data_dir)
-            try:
-                subprocess.run(
-                    self.compose_cmd + ["down"],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                console.print(
-                    f"[green]{self._translate('Docker services stopped and removed successfully')}[/]"
-                )
-                return True
-            finally:
-                os.chdir(original_dir)
+            self._compose(data_dir, "down", capture=True)
+            console.print(
+                f"[green]{self._translate('Docker services stopped and removed successfully')}[/]"
+            )
+            return True
         except subprocess.SubprocessError as e:
             error_msg = f"Error stopping Docker services: {e}"
             console.print(f"[yellow]{self._translate(error_msg)}[/]")
@@ -205,6 +239,48 @@ class DockerManager:
             )
             return False
 
+    def prefetch_services_status(self, project_path=None) -> bool:
+        """
+        Start the service state monitor and load the service graph without
+        printing, so the next get_services_status() call returns at once.
+
+        Args:
+            project_path: Path to the project directory (optional)
+
+        Returns:
+            bool: True if the status can be read from memory afterwards
+        """
+        if not self.docker_available:
+            return False
+        data_dir = self._get_data_dir(project_path)
+        if not os.path.exists(os.path.join(data_dir, "docker-compose.yml")):
+            return False
+        from .events import get_service_monitor
+        from .scheduler import load_service_graph
+
+        if get_service_monitor() is None:
+            return False
+        load_service_graph(data_dir, self.compose_cmd)
+        return True
+
+    def _services_status_from_monitor(self, monitor, data_dir) -> Dict[str, Dict]:
+        """Build the service status from the event-driven state table."""
+        from .events import format_running_for
+        from .scheduler import load_service_graph
+
+        states = monitor.states()
+        services = {}
+        for service in load_service_graph(data_dir, self.compose_cmd).services:
+            info = states.get(service, {})
+            running = info.get("state") == "running"
+            services[service] = {
+                "state": self._translate("Running" if running else "Stopped"),
+                "running_for": (
+                    format_running_for(info.get("started_at")) if running else ""
+                ),
+            }
+        return services
+
     def get_services_status(self, project_path=None) -> Dict[str, Dict]:
         """Get status of all services in docker-compose.yml."""
         if not self.docker_available:
@@ -213,91 +289,79 @@ class DockerManager:
 
         services = {}
 
+        data_dir = self._get_data_dir(project_path)
         try:
-            original_dir = os.getcwd()
-            data_dir = self._get_data_dir(project_path)
             docker_compose_path = os.path.join(data_dir, "docker-compose.yml")
             if not os.path.exists(docker_compose_path):
                 error_msg = f"docker-compose.yml not found at {docker_compose_path}"
                 console.print(f"[bold yellow]{self._translate(error_msg)}[/]")
                 return {}
-            os.chdir(data_dir)
+            from .events import get_service_monitor
+
+            monitor = get_service_monitor()
+            if monitor is not None:
+                return self._services_status_from_monitor(monitor, data_dir)
+
+            service_list_result = self._compose(
+                data_dir, "config", "--services", capture=True
+            )
+            service_list = [
+                s.strip()
+                for s in service_list_result.stdout.strip().split("\n")
+                if s.strip()
+            ]
+
+            for service in service_list:
+                services[service] = {
+                    "state": self._translate("Stopped"),
+                    "running_for": "",
+                }
+
+            ps_result = self._compose(
+                data_dir, "ps", "--all", "--format", "json", capture=True
+            )
+
+            import json
+
             try:
-                service_list_result = subprocess.run(
-                    self.compose_cmd + ["config", "--services"],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                service_list = [
-                    s.strip()
-                    for s in service_list_result.stdout.strip().split("\n")
-                    if s.strip()
+                json_lines = [
+                    line.strip()
+                    for line in ps_result.stdout.strip().split("\n")
+                    if line.strip()
                 ]
 
-                for service in service_list:
-                    services[service] = {
-                        "state": self._translate("Stopped"),
-                        "running_for": "",
-                    }
-
-                ps_result = subprocess.run(
-                    self.compose_cmd + ["ps", "--all", "--format", "json"],
-                    check=True,
-                    capture_output=True,
-                    text=True,
+                for line in json_lines:
+                    container = json.loads(line)
+                    service = container.get("Service", "")
+                    state = container.get("State", "")
+                    running_for = container.get("RunningFor", "")
+
+                    if service in service_list:
+                        services[service] = {
+                            "state": (
+                                self._translate("Running")
+                                if state.lower() == "running"
+                                else self._translate("Stopped")
+                            ),
+                            "running_for": (
+                                running_for if state.lower() == "running" else ""
+                            ),
+                        }
+
+            except json.JSONDecodeError as e:
+                error_msg = (
+                    f"Failed to parse JSON output from docker compose ps: {e}"
                 )
+                console.print(f"[yellow]{self._translate(error_msg)}[/]")
 
-                import json
-
-                try:
-                    json_lines = [
-                        line.strip()
-                        for line in ps_result.stdout.strip().split("\n")
-                        if line.strip()
-                    ]
-
-                    for line in json_lines:
-                        container = json.loads(line)
-                        service = container.get("Service", "")
-                        state = container.get("State", "")
-                        running_for = container.get("RunningFor", "")
-
-                        if service in service_list:
-                            services[service] = {
-                                "state": (
-                                    self._translate("Running")
-                                    if state.lower() == "running"
-                                    else self._translate("Stopped")
-                                ),
-                                "running_for": (
-                                    running_for if state.lower() == "running" else ""
-                                ),
-                            }
-
-                except json.JSONDecodeError as e:
-                    error_msg = (
-                        f"Failed to parse JSON output from docker compose ps: {e}"
-                    )
-                    console.print(f"[yellow]{self._translate(error_msg)}[/]")
-
-                return services
-
-            finally:
-                os.chdir(original_dir)
+            return services
 
         except subprocess.SubprocessError as e:
             error_msg = f"Error getting services status: {e}"
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
 
             try:
-                os.chdir(data_dir)
-                result = subprocess.run(
-                    self.compose_cmd + ["config", "--services"],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
+                result = self._compose(data_dir, "config", "--services", capture=True)
                 service_list = result.stdout.strip().split("\n")
                 for service in service_list:
                     service = service.strip()
@@ -306,7 +370,6 @@ class DockerManager:
                             "state": self._translate("Unknown"),
                             "running_for": "",
                         }
-                os.chdir(original_dir)
             except:
                 pass
 
@@ -326,19 +389,18 @@ class DockerManager:
             console.print(
                 f"[bold cyan]{self._translate('Restarting Docker services...')}[/]"
             )
-            original_dir = os.getcwd()
             data_dir = self._get_data_dir(project_path)
-            os.chdir(data_dir)
-            try:
-                subprocess.run(self.compose_cmd + ["down"], check=True)
-                subprocess.run(self.compose_cmd + ["up", "-d"], check=True)
-                console.print(
-                    f"[bold green]{self._translate('Services restarted successfully.')}[/]"
-                )
-                return True
-            finally:
-                os.chdir(original_dir)
-        except subprocess.SubprocessError as e:
+            success, failed = self._schedule("stop", project_path=project_path)
+            if success:
+                success, failed = self._schedule("start", project_path=project_path)
+            if not success:
+                self._report_failed(failed)
+                return False
+            console.print(
+                f"[bold green]{self._translate('Services restarted successfully.')}[/]"
+            )
+            return True
+        except (subprocess.SubprocessError, ValueError) as e:
             error_msg = f"Error restarting services: {e}"
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return False
@@ -347,6 +409,122 @@ class DockerManager:
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return False
 
+    def _print_downtimes(self, downtimes, reasons=None):
+        """Print how long each service was unavailable."""
+        table = Table(title=self._translate("Service unavailability"), box=box.ROUNDED)
+        table.add_column(self._translate("Service"), style="cyan")
+        if reasons is not None:
+            table.add_column(self._translate("Reason"), style="cyan")
+        table.add_column(self._translate("Unavailable"), style="green")
+        for service, downtime in downtimes.items():
+            row = [service]
+            if reasons is not None:
+                row.append(self._translate(reasons.get(service, "")))
+            row.append(
+                f"{downtime:.1f}s"
+                if downtime is not None
+                else f"[red]{self._translate('Not healthy')}[/]"
+            )
+            table.add_row(*row)
+        console.print(table)
+
+    def upgrade_services(self, project_path=None):
+        """
+        Pull new images while the services keep running, then recreate only
+        the services whose image or configuration changed.
+
+        Args:
+            project_path: Path to the project directory (optional)
+
+        Returns:
+            bool: True if all changed services were recreated and became healthy
+        """
+        if not self.docker_available:
+            console.print(f"[bold red]{self._translate('Docker is not available.')}[/]")
+            return False
+
+        try:
+            console.print(
+                f"[bold cyan]{self._translate('Pulling images while services keep running...')}[/]"
+            )
+            data_dir = self._get_data_dir(project_path)
+            result = self._schedule("upgrade", project_path=project_path)
+        except (subprocess.SubprocessError, ValueError) as e:
+            error_msg = f"Error upgrading services: {e}"
+            console.print(f"[bold red]{self._translate(error_msg)}[/]")
+            return False
+        except FileNotFoundError:
+            error_msg = f"Error: docker-compose.yml not found in {data_dir}."
+            console.print(f"[bold red]{self._translate(error_msg)}[/]")
+            return False
+
+        for image, pulled in result["pulls"].items():
+            if not pulled:
+                warning_msg = f"Could not pull {image}, using the local image."
+                console.print(f"[yellow]{self._translate(warning_msg)}[/]")
+
+        if not result["changed"]:
+            console.print(
+                f"[bold green]{self._translate('All services are up to date.')}[/]"
+            )
+            return True
+
+        reasons = dict(result["changed"])
+        reasons.update((service, "restarted") for service in result["restarted"])
+        self._print_downtimes(result["downtimes"], reasons)
+        if not result["success"]:
+            console.print(
+                f"[bold red]{self._translate('Upgrade stopped, remaining services were not recreated.')}[/]"
+            )
+            return False
+        console.print(
+            f"[bold green]{self._translate('Changed services recreated successfully.')}[/]"
+        )
+        return True
+
+    def rolling_restart_services(self, project_path=None):
+        """
+        Restart all Docker services one at a time, waiting for each to become healthy.
+
+        Args:
+            project_path: Path to the project directory (optional)
+
+        Returns:
+            bool: True if every service was restarted and became healthy
+        """
+        if not self.docker_available:
+            console.print(f"[bold red]{self._translate('Docker is not available.')}[/]")
+            return False
+
+        try:
+            console.print(
+                f"[bold cyan]{self._translate('Restarting services one at a time...')}[/]"
+            )
+            data_dir = self._get_data_dir(project_path)
+            success, downtimes = self._schedule(
+                "rolling_restart", project_path=project_path
+            )
+        except (subprocess.SubprocessError, ValueError) as e:
+            error_msg = f"Error restarting services: {e}"
+            console.print(f"[bold red]{self._translate(error_msg)}[/]")
+            return False
+        except FileNotFoundError:
+            error_msg = f"Error: docker-compose.yml not found in {data_dir}."
+            console.print(f"[bold red]{self._translate(error_msg)}[/]")
+            return False
+
+        self._print_downtimes(downtimes)
+
+        if not success:
+            console.print(
+                f"[bold red]{self._translate('Rolling restart stopped, remaining services were not restarted.')}[/]"
+            )
+            return False
+        console.print(
+            f"[bold green]{self._translate('Services restarted successfully.')}[/]"
+        )
+        return True
+
     def restart_service(self, service_name: str, project_path=None):
         """Restart a specific Docker service."""
         if not self.docker_available:
@@ -356,17 +534,17 @@ class DockerManager:
         try:
             msg = f"Restarting service {service_name}..."
             console.print(f"[bold cyan]{self._translate(msg)}[/]")
-            original_dir = os.getcwd()
             data_dir = self._get_data_dir(project_path)
-            os.chdir(data_dir)
-            try:
-                subprocess.run(self.compose_cmd + ["restart", service_name], check=True)
-                success_msg = f"Service {service_name} restarted successfully."
-                console.print(f"[bold green]{self._translate(success_msg)}[/]")
-                return True
-            finally:
-                os.chdir(original_dir)
-        except subprocess.SubprocessError as e:
+            success, failed = self._schedule(
+                "restart", [service_name], project_path=project_path
+            )
+            if not success:
+                self._report_failed(failed)
+                return False
+            success_msg = f"Service {service_name} restarted successfully."
+            console.print(f"[bold green]{self._translate(success_msg)}[/]")
+            return True
+        except (subprocess.SubprocessError, ValueError) as e:
             error_msg = f"Error restarting service {service_name}: {e}"
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return False
@@ -385,18 +563,16 @@ class DockerManager:
             console.print(
                 f"[bold cyan]{self._translate('Starting Docker services...')}[/]"
             )
-            original_dir = os.getcwd()
             data_dir = self._get_data_dir(project_path)
-            os.chdir(data_dir)
-            try:
-                subprocess.run(self.compose_cmd + ["up", "-d"], check=True)
-                console.print(
-                    f"[bold green]{self._translate('Services started successfully.')}[/]"
-                )
-                return True
-            finally:
-                os.chdir(original_dir)
-        except subprocess.SubprocessError as e:
+            success, failed = self._schedule("start", project_path=project_path)
+            if not success:
+                self._report_failed(failed)
+                return False
+            console.print(
+                f"[bold green]{self._translate('Services started successfully.')}[/]"
+            )
+            return True
+        except (subprocess.SubprocessError, ValueError) as e:
             error_msg = f"Error starting services: {e}"
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return False
@@ -414,19 +590,17 @@ class DockerManager:
         try:
             msg = f"Starting service {service_name}..."
             console.print(f"[bold cyan]{self._translate(msg)}[/]")
-            original_dir = os.getcwd()
             data_dir = self._get_data_dir(project_path)
-            os.chdir(data_dir)
-            try:
-                subprocess.run(
-                    self.compose_cmd + ["up", "-d", service_name], check=True
-                )
-                success_msg = f"Service {service_name} started successfully."
-                console.print(f"[bold green]{self._translate(success_msg)}[/]")
-                return True
-            finally:
-                os.chdir(original_dir)
-        except subprocess.SubprocessError as e:
+            success, failed = self._schedule(
+                "start", [service_name], project_path=project_path
+            )
+            if not success:
+                self._report_failed(failed)
+                return False
+            success_msg = f"Service {service_name} started successfully."
+            console.print(f"[bold green]{self._translate(success_msg)}[/]")
+            return True
+        except (subprocess.SubprocessError, ValueError) as e:
             error_msg = f"Error starting service {service_name}: {e}"
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return False
@@ -445,18 +619,16 @@ class DockerManager:
             console.print(
                 f"[bold cyan]{self._translate('Stopping all Docker services...')}[/]"
             )
-            original_dir = os.getcwd()
             data_dir = self._get_data_dir(project_path)
-            os.chdir(data_dir)
-            try:
-                subprocess.run(self.compose_cmd + ["stop"], check=True)
-                console.print(
-                    f"[bold green]{self._translate('All services stopped successfully.')}[/]"
-                )
-                return True
-            finally:
-                os.chdir(original_dir)
-        except subprocess.SubprocessError as e:
+            success, failed = self._schedule("stop", project_path=project_path)
+            if not success:
+                self._report_failed(failed)
+                return False
+            console.print(
+                f"[bold green]{self._translate('All services stopped successfully.')}[/]"
+            )
+            return True
+        except (subprocess.SubprocessError, ValueError) as e:
             error_msg = f"Error stopping services: {e}"
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return False
@@ -474,17 +646,17 @@ class DockerManager:
         try:
             msg = f"Stopping service {service_name}..."
             console.print(f"[bold cyan]{self._translate(msg)}[/]")
-            original_dir = os.getcwd()
             data_dir = self._get_data_dir(project_path)
-            os.chdir(data_dir)
-            try:
-                subprocess.run(self.compose_cmd + ["stop", service_name], check=True)
-                success_msg = f"Service {service_name} stopped successfully."
-                console.print(f"[bold green]{self._translate(success_msg)}[/]")
-                return True
-            finally:
-                os.chdir(original_dir)
-        except subprocess.SubprocessError as e:
+            success, failed = self._schedule(
+                "stop", [service_name], project_path=project_path
+            )
+            if not success:
+                self._report_failed(failed)
+                return False
+            success_msg = f"Service {service_name} stopped successfully."
+            console.print(f"[bold green]{self._translate(success_msg)}[/]")
+            return True
+        except (subprocess.SubprocessError, ValueError) as e:
             error_msg = f"Error stopping service {service_name}: {e}"
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return False
@@ -509,46 +681,35 @@ class DockerManager:
             console.print(f"[bold red]{self._translate('Docker is not available.')}[/]")
             return None
 
+        base_path = project_path if project_path else os.getcwd()
+        data_dir = os.path.join(base_path, "data")
         try:
-            original_dir = os.getcwd()
-
-            base_path = project_path if project_path else original_dir
-
-            data_dir = os.path.join(base_path, "data")
-            os.chdir(data_dir)
-
-            try:
-                cmd = self.compose_cmd + ["logs", "-f"]
-
-                if lines > 0:
-                    cmd.extend(["-n", str(lines)])
-
-                if service_name:
-                    cmd.append(service_name)
+            cmd = compose_args(data_dir, "logs", "-f", compose_cmd=self.compose_cmd)
 
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                )
-
-                os.chdir(original_dir)
+            if lines > 0:
+                cmd.extend(["-n", str(lines)])
 
-                return process
+            if service_name:
+                cmd.append(service_name)
 
-            except Exception as e:
-                os.chdir(original_dir)
-                error_msg = f"Error starting logs process: {e}"
-                console.print(f"[bold red]{self._translate(error_msg)}[/]")
-                return None
+            return open_process(
+                cmd,
+                cwd=data_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                universal_newlines=True,
+            )
 
         except FileNotFoundError:
             error_msg = f"Error: docker-compose.yml not found in {data_dir}."
             console.print(f"[bold red]{self._translate(error_msg)}[/]")
             return None
+        except Exception as e:
+            error_msg = f"Error starting logs process: {e}"
+            console.print(f"[bold red]{self._translate(error_msg)}[/]")
+            return None
 
     def get_volumes(self):
         """Get a list of Docker volumes that start with teddycloudstarter_"""
@@ -557,7 +718,7 @@ class DockerManager:
             return []
 
         try:
-            result = subprocess.run(
+            result = run_command(
                 [
                     "docker",
                     "volume",
@@ -568,8 +729,6 @@ class DockerManager:
                     "{{.Name}}",
                 ],
                 check=True,
-                capture_output=True,
-                text=True,
             )
 
             volumes = [
@@ -624,7 +783,7 @@ class DockerManager:
                     f"{volume_name}:{volume_path}",
                     "-v",
                     f"{backup_mount}:/backup",
-                    "alpine",
+                    HELPER_IMAGE,
                     "tar",
                     "czf",
                     f"/backup/{backup_file}",
@@ -639,14 +798,14 @@ class DockerManager:
                     f"{volume_name}:{volume_path}",
                     "-v",
                     f"{abs_backup_dir}:/backup",
-                    "alpine",
+                    HELPER_IMAGE,
                     "tar",
                     "czf",
                     f"/backup/{backup_file}",
                     volume_path,
                 ]
 
-            subprocess.run(cmd, check=True)
+            run_command(cmd, capture=False, timeout=None, check=True)
             success_msg = (
                 f"Volume {volume_name} backed up successfully to {backup_path}"
             )
@@ -676,9 +835,31 @@ class DockerManager:
         base_path = project_path if project_path else "."
 
         backup_dir = os.path.join(base_path, "data", "backup")
-        if not os.path.exists(backup_dir):
+        from ..utilities.warmup import file_stamps
+
+        stamps = file_stamps(backup_dir, ".tar.gz")
+        if stamps is None:
             return {}
 
+        # Keyed on the stats of every backup file, so a backup overwritten in
+        # place is noticed too; the tuple is replaced as a whole, so the
+        # warm-up thread can fill it
+        cached = self._backup_listing
+        if cached and cached[:2] == (backup_dir, stamps):
+            backups = cached[2]
+        else:
+            backups = self._list_volume_backups(backup_dir)
+            self._backup_listing = (backup_dir, stamps, backups)
+
+        return {
+            vol_name: list(files)
+            for vol_name, files in backups.items()
+            if volume_name is None or volume_name == vol_name
+        }
+
+    @staticmethod
+    def _list_volume_backups(backup_dir):
+        """Map volume names to their backup files in backup_dir, newest first."""
         backups = {}
         backup_files = os.listdir(backup_dir)
 
@@ -696,10 +877,9 @@ class DockerManager:
                     "teddycloud-", ""
                 )
 
-                if volume_name is None or volume_name == full_vol_name:
-                    if full_vol_name not in backups:
-                        backups[full_vol_name] = []
-                    backups[full_vol_name].append(file)
+                if full_vol_name not in backups:
+                    backups[full_vol_name] = []
+                backups[full_vol_name].append(file)
             except:
                 continue
 
@@ -734,13 +914,13 @@ class DockerManager:
                 "--rm",
                 "-v",
                 f"{os.path.abspath(os.path.join(base_path, 'data', 'backup'))}:/backup:ro",
-                "alpine",
+                HELPER_IMAGE,
                 "tar",
                 "-tf",
                 f"/backup/{backup_file}",
             ]
 
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            result = run_command(cmd, check=True)
 
             msg = f"Contents of {backup_file}:"
             console.print(f"[bold cyan]{self._translate(msg)}[/]")
@@ -807,7 +987,7 @@ class DockerManager:
                     f"{volume_name}:{volume_path}",
                     "-v",
                     f"{backup_mount}:/backup:ro",
-                    "alpine",
+                    HELPER_IMAGE,
                     "sh",
                     "-c",
                     f"rm -rf {volume_path}/* && tar -xzf /backup/{backup_file} -C / --strip-components=1",
@@ -821,13 +1001,13 @@ class DockerManager:
                     f"{volume_name}:{volume_path}",
                     "-v",
                     f"{abs_backup_dir}:/backup:ro",
-                    "alpine",
+                    HELPER_IMAGE,
                     "sh",
                     "-c",
                     f"rm -rf {volume_path}/* && tar -xzf /backup/{backup_file} -C / --strip-components=1",
                 ]
 
-            subprocess.run(cmd, check=True)
+            run_command(cmd, capture=False, timeout=None, check=True)
             success_msg = (
                 f"Volume {volume_name} restored successfully from {backup_file}"
             )
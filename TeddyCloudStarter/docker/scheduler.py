@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware service scheduling for TeddyCloudStarter.
+Starts, stops and restarts sets of compose services following the
+depends_on graph of the generated docker-compose.yml. Independent services
+run in parallel, and a service only starts once everything it depends on
+reports healthy.
+"""
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utilities.logger import logger
+from .events import get_service_monitor
+from .images import ImageManager
+from ..utilities.process import (
+    COMPOSE_FILE,
+    COMPOSE_TIMEOUT,
+    compose_args,
+    run_command,
+)
+
+# Seconds a service may take to report healthy before its dependents are skipped
+HEALTH_TIMEOUT = 180
+
+# Bounds of the exponential backoff between two readiness probes
+PROBE_INTERVAL_MIN = 0.25
+PROBE_INTERVAL_MAX = 2.0
+
+PROBE_TIMEOUT = 15
+
+_graph_cache: Dict[str, Tuple[int, "ServiceGraph"]] = {}
+
+
+class ServiceGraph:
+    """The services of a compose project and their dependencies."""
+
+    def __init__(self, services: Dict[str, Dict]):
+        """
+        Initialize the graph.
+
+        Args:
+            services: Service name to {"depends_on", "container_name", "image", "healthcheck"}
+        """
+        self.services = services
+        self._dependents: Dict[str, Set[str]] = {name: set() for name in services}
+        for name, service in services.items():
+            for dependency in service.get("depends_on", []):
+                if dependency in self._dependents:
+                    self._dependents[dependency].add(name)
+
+    @classmethod
+    def from_compose_config(cls, config: Dict) -> "ServiceGraph":
+        """
+        Build the graph from the output of `docker compose config --format json`.
+
+        Args:
+            config: The parsed compose configuration
+
+        Returns:
+            ServiceGraph: The service graph
+        """
+        services = {}
+        for name, service in (config.get("services") or {}).items():
+            depends_on = service.get("depends_on") or []
+            healthcheck = service.get("healthcheck") or {}
+            services[name] = {
+                # depends_on is a list in short syntax and a mapping in long syntax
+                "depends_on": sorted(depends_on),
+                "container_name": service.get("container_name", ""),
+                "image": service.get("image", ""),
+                "healthcheck": (
+                    None if healthcheck.get("disable") else healthcheck.get("test")
+                ),
+            }
+        return cls(services)
+
+    def dependencies(self, name: str) -> List[str]:
+        """Return the services the given service depends on."""
+        return [
+            dependency
+            for dependency in self.services.get(name, {}).get("depends_on", [])
+            if dependency in self.services
+        ]
+
+    def dependents(self, name: str) -> List[str]:
+        """Return the services that depend on the given service."""
+        return sorted(self._dependents.get(name, ()))
+
+    def with_dependencies(self, names: Iterable[str]) -> Set[str]:
+        """
+        Extend a set of services by everything they transitively depend on.
+
+        Args:
+            names: Service names
+
+        Returns:
+            Set[str]: The services and their dependencies
+        """
+        result = set()
+        pending = [name for name in names if name in self.services]
+        while pending:
+            name = pending.pop()
+            if name not in result:
+                result.add(name)
+                pending.extend(self.dependencies(name))
+        return result
+
+    def waves(self, names: Optional[Iterable[str]] = None, reverse: bool = False) -> List[List[str]]:
+        """
+        Group services into waves that can run in parallel.
+
+        Args:
+            names: Services to schedule, defaults to all services
+            reverse: Order dependents before their dependencies (for stopping)
+
+        Returns:
+            List[List[str]]: Waves in execution order
+
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        selected = set(self.services if names is None else names) & set(self.services)
+        edges = {
+            name: set(self.dependents(name) if reverse else self.dependencies(name))
+            & selected
+            for name in selected
+        }
+        waves = []
+        done: Set[str] = set()
+        while len(done) < len(selected):
+            wave = sorted(
+                name for name in selected - done if edges[name] <= done
+            )
+            if not wave:
+                raise ValueError(
+                    f"Dependency cycle between services: {sorted(selected - done)}"
+                )
+            waves.append(wave)
+            done.update(wave)
+        return waves
+
+
+def _parse_compose_file(compose_path: str) -> ServiceGraph:
+    """
+    Read the service graph directly from a generated docker-compose.yml.
+
+    Only the subset of YAML written by the TeddyCloudStarter templates is
+    understood; this is the fallback when `docker compose config` is unavailable.
+    """
+    services: Dict[str, Dict] = {}
+    current = None
+    section = None
+    in_services = False
+    with open(compose_path, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            if indent == 0:
+                in_services = stripped == "services:"
+                current = None
+                continue
+            if not in_services:
+                continue
+            if indent == 2 and stripped.endswith(":"):
+                current = stripped[:-1]
+                services[current] = {
+                    "depends_on": [],
+                    "container_name": "",
+                    "image": "",
+                    "healthcheck": None,
+                }
+                section = None
+            elif current and indent == 4:
+                key, _, value = stripped.partition(":")
+                section = key
+                if key in ("container_name", "image"):
+                    services[current][key] = value.strip()
+            elif current and section == "depends_on" and stripped.startswith("- "):
+                services[current]["depends_on"].append(stripped[2:].strip())
+            elif current and section == "healthcheck" and stripped.startswith("test:"):
+                try:
+                    services[current]["healthcheck"] = json.loads(
+                        stripped.partition(":")[2].strip()
+                    )
+                except json.JSONDecodeError:
+                    pass
+    return ServiceGraph(services)
+
+
+def load_service_graph(data_dir: str, compose_cmd: Optional[List[str]] = None) -> ServiceGraph:
+    """
+    Load the service graph of the compose project in data_dir.
+
+    The graph is cached until docker-compose.yml changes.
+
+    Args:
+        data_dir: Directory containing docker-compose.yml
+        compose_cmd: Base compose command
+
+    Returns:
+        ServiceGraph: The service graph
+
+    Raises:
+        FileNotFoundError: If docker-compose.yml does not exist
+    """
+    compose_path = os.path.join(data_dir, COMPOSE_FILE)
+    mtime = os.stat(compose_path).st_mtime_ns
+    cached = _graph_cache.get(compose_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    graph = None
+    try:
+        result = run_command(
+            compose_args(data_dir, "config", "--format", "json", compose_cmd=compose_cmd),
+            cwd=data_dir,
+        )
+        if result.ok:
+            graph = ServiceGraph.from_compose_config(json.loads(result.stdout))
+    except (OSError, subprocess.SubprocessError, json.JSONDecodeError) as e:
+        logger.debug(f"docker compose config unavailable, parsing {compose_path}: {e}")
+    if graph is None:
+        graph = _parse_compose_file(compose_path)
+    logger.debug(f"Service graph for {data_dir}: {graph.waves()}")
+    _graph_cache[compose_path] = (mtime, graph)
+    return graph
+
+
+class ServiceScheduler:
+    """Runs compose operations on sets of services in dependency order."""
+
+    def __init__(
+        self,
+        data_dir: str,
+        compose_cmd: Optional[List[str]] = None,
+        health_timeout: float = HEALTH_TIMEOUT,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            data_dir: Directory containing docker-compose.yml
+            compose_cmd: Base compose command
+            health_timeout: Seconds to wait for a service to become healthy
+        """
+        self.data_dir = data_dir
+        self.compose_cmd = compose_cmd
+        self.health_timeout = health_timeout
+        self.graph = load_service_graph(data_dir, compose_cmd)
+        self.monitor = get_service_monitor()
+
+    def _compose(self, *args: str) -> None:
+        run_command(
+            compose_args(self.data_dir, *args, compose_cmd=self.compose_cmd),
+            cwd=self.data_dir,
+            timeout=COMPOSE_TIMEOUT,
+            check=True,
+        )
+
+    def _container(self, service: str) -> str:
+        return self.graph.services[service].get("container_name") or service
+
+    def _probe(self, service: str) -> Optional[bool]:
+        """
+        Check once whether a service is ready.
+
+        Returns:
+            Optional[bool]: True if ready, False if it failed, None if still starting
+        """
+        container = self._container(service)
+        # The event table may still describe the container that was just
+        # replaced, so readiness is always read from docker directly
+        result = run_command(
+            ["docker", "inspect", "--format", "{{json .State}}", container],
+            timeout=PROBE_TIMEOUT,
+        )
+        if not result.ok:
+            return None
+        state = json.loads(result.stdout)
+        status = state.get("Status")
+        health = (state.get("Health") or {}).get("Status")
+        if status in ("exited", "dead"):
+            return False
+        if health == "healthy" or (not health and status == "running"):
+            return True
+        if health == "unhealthy":
+            return False
+        if status != "running":
+            return None
+
+        # Docker runs the first healthcheck only after a full interval, so run
+        # the same check directly to detect readiness as soon as possible.
+        test = self.graph.services[service].get("healthcheck")
+        if isinstance(test, str):
+            test = ["CMD-SHELL", test]
+        if not test or test[0] == "NONE":
+            return True
+        command = ["sh", "-c", test[1]] if test[0] == "CMD-SHELL" else list(test[1:])
+        probe = run_command(["docker", "exec", container, *command], timeout=PROBE_TIMEOUT)
+        if probe.returncode in (126, 127):
+            # The check cannot run inside the container; a running container
+            # is the best readiness signal available
+            return True
+        return True if probe.ok else None
+
+    def wait_until_ready(self, service: str) -> bool:
+        """
+        Wait until a service reports healthy, or running if it has no healthcheck.
+
+        Args:
+            service: The service name
+
+        Returns:
+            bool: True if the service became ready within the health timeout
+        """
+        deadline = time.monotonic() + self.health_timeout
+        interval = PROBE_INTERVAL_MIN
+        while True:
+            try:
+                ready = self._probe(service)
+            except (subprocess.SubprocessError, json.JSONDecodeError) as e:
+                logger.debug(f"Readiness probe for {service} failed: {e}")
+                ready = None
+            if ready is not None:
+                return ready
+            if time.monotonic() + interval > deadline:
+                logger.warning(f"Service {service} not healthy after {self.health_timeout}s")
+                return False
+            if self.monitor is not None and self.monitor.live:
+                # Wake up on the next container event, or re-run the
+                # healthcheck command after the interval
+                self.monitor.wait_for_change(timeout=interval)
+            else:
+                time.sleep(interval)
+            interval = min(interval * 2, PROBE_INTERVAL_MAX)
+
+    def _run(
+        self,
+        services: Set[str],
+        action: Callable[[str], bool],
+        reverse: bool = False,
+    ) -> Tuple[bool, List[str]]:
+        """
+        Run an action per service as soon as the services it waits for are done.
+
+        Args:
+            services: Services to act on
+            action: Callable returning True on success
+            reverse: Wait for dependents instead of dependencies (for stopping)
+
+        Returns:
+            Tuple[bool, List[str]]: (success, failed_or_skipped_services)
+        """
+        # Validates the graph and raises on cycles before anything runs
+        self.graph.waves(services, reverse=reverse)
+        blockers = {
+            name: set(
+                self.graph.dependents(name) if reverse else self.graph.dependencies(name)
+            )
+            & services
+            for name in services
+        }
+        done: Set[str] = set()
+        failed: Set[str] = set()
+        running = {}
+        with ThreadPoolExecutor(
+            max_workers=max(len(services), 1), thread_name_prefix="tcs-scheduler"
+        ) as executor:
+            while len(done) + len(failed) < len(services):
+                for name in sorted(services - done - failed - set(running.values())):
+                    if blockers[name] & failed:
+                        logger.warning(f"Skipping {name}, a service it waits for failed")
+                        failed.add(name)
+                    elif blockers[name] <= done:
+                        running[executor.submit(action, name)] = name
+                if not running:
+                    continue
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        success = future.result()
+                    except (OSError, subprocess.SubprocessError) as e:
+                        logger.error(f"Operation on service {name} failed: {e}")
+                        success = False
+                    (done if success else failed).add(name)
+        return not failed, sorted(failed)
+
+    def _start_one(self, service: str) -> bool:
+        # The container was created by start(), so only start it here
+        self._compose("start", service)
+        ready = self.wait_until_ready(service)
+        if ready:
+            logger.info(f"Service {service} is ready")
+        return ready
+
+    def _recreate_one(self, service: str) -> bool:
+        self._compose("up", "-d", "--no-deps", service)
+        ready = self.wait_until_ready(service)
+        if ready:
+            logger.info(f"Service {service} is ready")
+        return ready
+
+    def _is_running(self, service: str) -> bool:
+        result = run_command(
+            ["docker", "inspect", "--format", "{{.State.Running}}", self._container(service)],
+            timeout=PROBE_TIMEOUT,
+        )
+        return result.ok and result.stdout.strip() == "true"
+
+    def _stop_one(self, service: str) -> bool:
+        self._compose("stop", service)
+        return True
+
+    def _restart_one(self, service: str) -> bool:
+        self._compose("restart", service)
+        return self.wait_until_ready(service)
+
+    def _select(self, services: Optional[Iterable[str]]) -> Set[str]:
+        return set(self.graph.services if services is None else services) & set(
+            self.graph.services
+        )
+
+    def start(self, services: Optional[Iterable[str]] = None) -> Tuple[bool, List[str]]:
+        """
+        Start services and everything they depend on.
+
+        The containers are created in a single compose call, then started in
+        dependency order, each once the services it depends on are healthy.
+
+        Args:
+            services: Services to start, defaults to all services
+
+        Returns:
+            Tuple[bool, List[str]]: (success, failed_or_skipped_services)
+        """
+        selected = self.graph.with_dependencies(self._select(services))
+        logger.info(f"Starting services in waves: {self.graph.waves(selected)}")
+        if selected:
+            # Create the project network, volumes and containers once up front;
+            # concurrent per-service `up` calls race to create the network
+            try:
+                self._compose("up", "--no-start", *sorted(selected))
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.error(f"Creating the services failed: {e}")
+                return False, sorted(selected)
+        return self._run(selected, self._start_one)
+
+    def stop(self, services: Optional[Iterable[str]] = None) -> Tuple[bool, List[str]]:
+        """
+        Stop services, dependents before their dependencies.
+
+        Args:
+            services: Services to stop, defaults to all services
+
+        Returns:
+            Tuple[bool, List[str]]: (success, failed_or_skipped_services)
+        """
+        selected = self._select(services)
+        logger.info(
+            f"Stopping services in waves: {self.graph.waves(selected, reverse=True)}"
+        )
+        return self._run(selected, self._stop_one, reverse=True)
+
+    def restart(self, services: Optional[Iterable[str]] = None) -> Tuple[bool, List[str]]:
+        """
+        Restart services in dependency order, waiting for each to become healthy.
+
+        Args:
+            services: Services to restart, defaults to all services
+
+        Returns:
+            Tuple[bool, List[str]]: (success, failed_or_skipped_services)
+        """
+        selected = self._select(services)
+        logger.info(f"Restarting services in waves: {self.graph.waves(selected)}")
+        return self._run(selected, self._restart_one)
+
+    def _one_at_a_time(
+        self, order: List[str], action: Callable[[str], bool]
+    ) -> Tuple[bool, Dict[str, Optional[float]]]:
+        """
+        Run an action on one service after the other, measuring unavailability.
+
+        Args:
+            order: Services in execution order
+            action: Callable returning True once the service is healthy again
+
+        Returns:
+            Tuple[bool, Dict[str, Optional[float]]]: (success, seconds each
+            service was unavailable, None if it did not become healthy)
+        """
+        downtimes: Dict[str, Optional[float]] = {}
+        for service in order:
+            start = time.monotonic()
+            try:
+                ready = action(service)
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.error(f"Operation on service {service} failed: {e}")
+                ready = False
+            downtimes[service] = time.monotonic() - start if ready else None
+            if not ready:
+                return False, downtimes
+            logger.info(f"Service {service} was unavailable for {downtimes[service]:.1f}s")
+        return True, downtimes
+
+    def rolling_restart(
+        self, services: Optional[Iterable[str]] = None
+    ) -> Tuple[bool, Dict[str, Optional[float]]]:
+        """
+        Restart services one at a time, dependencies first.
+
+        Each service must report healthy before the next one is restarted,
+        so only one service is unavailable at any time. The rollout stops at
+        the first service that does not become healthy.
+
+        Args:
+            services: Services to restart, defaults to all services
+
+        Returns:
+            Tuple[bool, Dict[str, Optional[float]]]: (success, seconds each
+            service was unavailable, None if it did not become healthy)
+        """
+        selected = self._select(services)
+        order = [name for wave in self.graph.waves(selected) for name in wave]
+        logger.info(f"Rolling restart order: {order}")
+        return self._one_at_a_time(order, self._restart_one)
+
+    def pull_images(self, services: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """
+        Pull service images in parallel without touching the containers.
+
+        Args:
+            services: Services whose images are pulled, defaults to all services
+
+        Returns:
+            Dict[str, bool]: Image to whether the pull succeeded
+        """
+        images = sorted(
+            {
+                self.graph.services[name]["image"]
+                for name in self._select(services)
+                if self.graph.services[name].get("image")
+            }
+        )
+        # Forced, an upgrade must ask the registry even for images cached recently
+        return ImageManager().ensure_images(images, force=True, show_progress=False)
+
+    def _config_hashes(self) -> Dict[str, str]:
+        """Return the compose configuration hash per service, empty if unsupported."""
+        try:
+            result = run_command(
+                compose_args(self.data_dir, "config", "--hash", "*", compose_cmd=self.compose_cmd),
+                cwd=self.data_dir,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return {}
+        if not result.ok:
+            return {}
+        hashes = {}
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                hashes[parts[0]] = parts[1]
+        return hashes
+
+    def changed_services(self, services: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Determine which services must be recreated to match the compose file.
+
+        A service is changed if it has no container, its container runs an
+        image other than the local image for its tag, or its configuration
+        hash differs from the compose file.
+
+        Args:
+            services: Services to check, defaults to all services
+
+        Returns:
+            Dict[str, str]: Service name to reason ("new", "image" or "config")
+        """
+        config_hashes = self._config_hashes()
+        changed = {}
+        for name in sorted(self._select(services)):
+            service = self.graph.services[name]
+            current = run_command(
+                [
+                    "docker",
+                    "inspect",
+                    "--format",
+                    '{{.Image}}\t{{index .Config.Labels "com.docker.compose.config-hash"}}',
+                    self._container(name),
+                ]
+            )
+            if not current.ok:
+                changed[name] = "new"
+                continue
+            image_id, _, config_hash = current.stdout.strip().partition("\t")
+            if service.get("image"):
+                latest = run_command(
+                    ["docker", "image", "inspect", "--format", "{{.Id}}", service["image"]]
+                )
+                if latest.ok and latest.stdout.strip() != image_id:
+                    changed[name] = "image"
+                    continue
+            if name in config_hashes and config_hashes[name] != config_hash:
+                changed[name] = "config"
+        return changed
+
+    def upgrade(self, services: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Pull new images while the services keep running, then recreate only
+        the services whose image or configuration changed, one at a time.
+
+        nginx resolves its upstream containers only when it loads its
+        configuration, so the dependents of a recreated service (which gets a
+        new container address) are restarted afterwards.
+
+        Args:
+            services: Services to upgrade, defaults to all services
+
+        Returns:
+            Dict: "pulls" (image to success), "changed" (service to reason),
+            "restarted" (dependents restarted), "downtimes" (service to
+            seconds unavailable, None if it did not become healthy) and "success"
+        """
+        pulls = self.pull_images(services)
+        changed = self.changed_services(services)
+        logger.info(f"Services to recreate: {changed}")
+        order = [name for wave in self.graph.waves(changed) for name in wave]
+        success, downtimes = self._one_at_a_time(order, self._recreate_one)
+        # Dependents recreated themselves already resolved the new addresses
+        stale = {
+            dependent
+            for name in changed
+            for dependent in self.graph.dependents(name)
+            if dependent not in changed and self._is_running(dependent)
+        }
+        restarted = [name for wave in self.graph.waves(stale) for name in wave]
+        if success and restarted:
+            logger.info(f"Restarting dependents of recreated services: {restarted}")
+            success, restart_downtimes = self._one_at_a_time(restarted, self._restart_one)
+            downtimes.update(restart_downtimes)
+        return {
+            "pulls": pulls,
+            "changed": changed,
+            "restarted": restarted,
+            "downtimes": downtimes,
+            "success": success,
+        }
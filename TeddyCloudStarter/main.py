@@ -2,78 +2,71 @@
 """
 TeddyCloudStarter - The wizard for setting up TeddyCloud with Docker.
 """
+import argparse
 import os
 import subprocess
 import sys
 from pathlib import Path
 
-# Ensure required packages are installed
-try:
-    import dns.resolver
-    import jinja2
-    import questionary
-    from rich.console import Console
-    from rich.panel import Panel
-except ImportError:
-    print("Required packages not found. Installing them...")
-    try:
-        # First check if pip is available
-        try:
-            subprocess.check_call(
-                [sys.executable, "-m", "pip", "--version"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-        except subprocess.CalledProcessError:
-            print("\nError: pip is not installed for your Python installation.")
-            print("Please install pip first using one of these methods:")
-            print("- On Ubuntu/Debian: sudo apt update && sudo apt install python3-pip")
-            print("- On Windows: python -m ensurepip")
-            sys.exit(1)
+# Determine if running as installed package or directly from source
+package_path = os.path.dirname(__file__)
 
-        # If we got here, pip is available, so try to install the packages
-        subprocess.check_call(
-            [
-                sys.executable,
-                "-m",
-                "pip",
-                "install",
-                "rich",
-                "questionary",
-                "jinja2",
-                "dnspython",
-            ]
-        )
-    except Exception as e:
-        print(f"\nFailed to install required packages: {e}")
-        print("Please install them manually using:")
-        print(f"{sys.executable} -m pip install rich questionary jinja2 dnspython\n")
-        sys.exit(1)
+# Set up paths for resources
+LOCALES_DIR = Path(package_path) / "locales"
 
-    # Try importing again after installation
 
+def ensure_required_packages():
+    """Ensure the required packages are installed, installing them if needed."""
     try:
         import dns.resolver
+        import jinja2
+        import questionary
+        from rich.console import Console
+        from rich.panel import Panel
     except ImportError:
-        print("\nFailed to import dnspython package after installation.")
-        print("This package is required for domain validation.")
-        sys.exit(1)
-
-from .config_manager import DEFAULT_CONFIG_PATH
-from .docker.manager import DockerManager
-from .main_menu import MainMenu
-
-# Import our modules
-from .setup_wizard import SetupWizard
-from .utilities.file_system import ensure_project_directories, get_project_path
-from .utilities.version import check_for_updates
-from .wizard.ui_helpers import console
+        print("Required packages not found. Installing them...")
+        try:
+            # First check if pip is available
+            try:
+                subprocess.check_call(
+                    [sys.executable, "-m", "pip", "--version"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+            except subprocess.CalledProcessError:
+                print("\nError: pip is not installed for your Python installation.")
+                print("Please install pip first using one of these methods:")
+                print("- On Ubuntu/Debian: sudo apt update && sudo apt install python3-pip")
+                print("- On Windows: python -m ensurepip")
+                sys.exit(1)
+
+            # If we got here, pip is available, so try to install the packages
+            subprocess.check_call(
+                [
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "install",
+                    "rich",
+                    "questionary",
+                    "jinja2",
+                    "dnspython",
+                ]
+            )
+        except Exception as e:
+            print(f"\nFailed to install required packages: {e}")
+            print("Please install them manually using:")
+            print(f"{sys.executable} -m pip install rich questionary jinja2 dnspython\n")
+            sys.exit(1)
 
-# Determine if running as installed package or directly from source
-package_path = os.path.dirname(__file__)
+        # Try importing again after installation
 
-# Set up paths for resources
-LOCALES_DIR = Path(package_path) / "locales"
+        try:
+            import dns.resolver
+        except ImportError:
+            print("\nFailed to import dnspython package after installation.")
+            print("This package is required for domain validation.")
+            sys.exit(1)
 
 
 def check_docker_prerequisites():
@@ -81,6 +74,9 @@ def check_docker_prerequisites():
     Check if Docker and Docker Compose are installed and available.
     Display an error message and exit if they are not.
     """
+    from .docker.manager import DockerManager
+    from .wizard.ui_helpers import console
+
     all_met, prerequisites, error_message = DockerManager.check_docker_prerequisites()
 
     if not all_met:
@@ -97,8 +93,136 @@ def check_docker_prerequisites():
     return True
 
 
-def main():
+def parse_arguments(argv=None):
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list, defaults to sys.argv[1:]
+
+    Returns:
+        argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="TeddyCloudStarter",
+        description="The wizard for setting up TeddyCloud with Docker.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    apply_parser = subparsers.add_parser(
+        "apply", help="Apply a desired-state spec file without prompts"
+    )
+    apply_parser.add_argument("spec", help="Path to the JSON spec file")
+    apply_parser.add_argument("--config", help="Path to config.json")
+    apply_parser.add_argument(
+        "--dry-run", action="store_true", help="Only show the planned steps"
+    )
+
+    import_parser = subparsers.add_parser(
+        "import-ips", help="Bulk import IP addresses from a text or CSV file"
+    )
+    import_parser.add_argument(
+        "source", help="Path to the file, or - to read from stdin"
+    )
+    import_parser.add_argument(
+        "--list",
+        choices=("allowed", "auth-bypass"),
+        default="allowed",
+        help="IP list to import into (default: allowed)",
+    )
+    import_parser.add_argument("--config", help="Path to config.json")
+    import_parser.add_argument(
+        "--replace", action="store_true", help="Replace the list instead of extending it"
+    )
+
+    pull_parser = subparsers.add_parser(
+        "pull-images", help="Pull every image the current configuration needs"
+    )
+    pull_parser.add_argument("--config", help="Path to config.json")
+    pull_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Check the registry even for images checked within the last day",
+    )
+
+    status_parser = subparsers.add_parser(
+        "status", help="Show service, certificate and configuration status"
+    )
+    status_parser.add_argument("--config", help="Path to config.json")
+    status_parser.add_argument(
+        "--json", action="store_true", help="Print the status as JSON"
+    )
+    status_parser.add_argument(
+        "--max-age",
+        type=float,
+        default=30,
+        help="Reuse cached Docker state up to this many seconds old",
+    )
+    return parser.parse_args(argv)
+
+
+def show_status(args):
+    """
+    Print the status without the interactive UI or the update check.
+
+    Args:
+        args: The parsed command line arguments
+
+    Returns:
+        int: 0 if all services are running, 1 otherwise
+    """
+    try:
+        from .utilities.status import collect_status, print_status
+    except ImportError:
+        ensure_required_packages()
+        from .utilities.status import collect_status, print_status
+    from .config_manager import DEFAULT_CONFIG_PATH
+
+    status = collect_status(args.config or DEFAULT_CONFIG_PATH, max_age=args.max_age)
+    print_status(status, as_json=args.json)
+    return 0 if status["healthy"] else 1
+
+
+def main(argv=None):
     """Main entry point for the TeddyCloud Setup Wizard."""
+    args = parse_arguments(argv)
+    if args.command == "status":
+        return show_status(args)
+
+    ensure_required_packages()
+
+    from .config_manager import DEFAULT_CONFIG_PATH
+
+    if args.command == "apply":
+        from .configuration.apply import apply_spec
+
+        return apply_spec(
+            args.spec, config_path=args.config or DEFAULT_CONFIG_PATH, dry_run=args.dry_run
+        )
+
+    if args.command == "import-ips":
+        from .configuration.apply import import_ips
+
+        return import_ips(
+            args.source,
+            key="auth_bypass_ips" if args.list == "auth-bypass" else "allowed_ips",
+            config_path=args.config or DEFAULT_CONFIG_PATH,
+            replace=args.replace,
+        )
+
+    if args.command == "pull-images":
+        from .docker.images import pull_required_images
+
+        return pull_required_images(
+            config_path=args.config or DEFAULT_CONFIG_PATH, force=args.force
+        )
+
+    from .main_menu import MainMenu
+    from .setup_wizard import SetupWizard
+    from .utilities.file_system import ensure_project_directories, get_project_path
+    from .wizard.checkpoint import SetupCheckpoint
+    from .utilities.version import check_for_updates
+
     # Check for updates
     check_for_updates()
     # Check for Docker prerequisites first
@@ -110,6 +234,27 @@ def main():
     # Check if config exists
     config_exists = os.path.exists(DEFAULT_CONFIG_PATH)
 
+    # An interrupted setup wizard can be resumed instead of showing the main menu
+    resume_setup = False
+    setup_checkpoint = SetupCheckpoint(DEFAULT_CONFIG_PATH)
+    if config_exists and setup_checkpoint.exists():
+        import questionary
+
+        from .wizard.ui_helpers import custom_style
+
+        wizard = SetupWizard(LOCALES_DIR)
+        if wizard.config_manager.config.get("language"):
+            wizard.translator.set_language(wizard.config_manager.config["language"])
+        resume_setup = questionary.confirm(
+            wizard.translator.get("The previous setup did not finish. Resume it?"),
+            default=True,
+            style=custom_style,
+        ).ask()
+        if resume_setup:
+            config_exists = False
+        else:
+            setup_checkpoint.clear()
+
     if config_exists:
         # If config exists, initialize the MainMenu and show it
         menu = MainMenu(LOCALES_DIR)
@@ -143,14 +288,16 @@ def main():
             if result == False:
                 show_menu = False
     else:
-        # If no config, run the setup wizard
-        wizard = SetupWizard(LOCALES_DIR)
+        # If no config or an unfinished setup, run the setup wizard
+        if not resume_setup:
+            wizard = SetupWizard(LOCALES_DIR)
 
         # Initialize logger with config_manager from wizard
         logger = get_logger(name=__name__,config_manager=wizard.config_manager)
 
-        # Select language first
-        wizard.select_language()
+        # Select language first, a resumed setup keeps the one chosen before
+        if not resume_setup:
+            wizard.select_language()
 
         # Display welcome messages
         wizard.display_welcome_message()
@@ -21,6 +21,7 @@ from .ui.configuration_manager_ui import show_configuration_management_menu
 from .ui.docker_manager_ui import show_docker_management_menu
 from .ui.support_features_ui import show_support_features_menu
 from .utilities.logger import logger
+from .utilities.warmup import WarmupScheduler
 
 # Import our modules - use relative imports to avoid circular dependencies
 from .wizard.base_wizard import BaseWizard
@@ -40,8 +41,46 @@ class MainMenu(BaseWizard):
         logger.debug(f"Initializing MainMenu with locales_dir={locales_dir}")
         super().__init__(locales_dir)
         self.locales_dir = locales_dir
+        self.warmup = WarmupScheduler()
+        self.config_manager.subscribe(self._on_config_changed)
         logger.info("MainMenu initialized.")
 
+    def _on_config_changed(self, config, changed_keys):
+        """Keep translator and security managers in sync with the shared config."""
+        logger.debug(f"Configuration changed: {sorted(changed_keys)}")
+        if "language" in changed_keys and config.get("language"):
+            self.translator.set_language(config["language"])
+        if "environment" in changed_keys:
+            project_path = config.get("environment", {}).get("path")
+            if project_path and project_path != self.project_path:
+                logger.info(f"Project path changed to {project_path}, updating managers.")
+                # Queued warm-ups still point at the old project
+                self.warmup.cancel()
+                self._init_security_managers(project_path)
+
+    def _schedule_warmup(self, config):
+        """
+        Prefetch what the submenus read first while the main menu waits for input.
+
+        Args:
+            config: The configuration dictionary
+        """
+        project_path = config.get("environment", {}).get("path")
+        if not project_path:
+            return
+        self.warmup.submit(
+            "services_status", self.docker_manager.prefetch_services_status, project_path
+        )
+        if (
+            self.project_path
+            and config.get("mode") == "nginx"
+            and config.get("nginx", {}).get("security", {}).get("type") == "client_cert"
+        ):
+            self.warmup.submit("certificates", self.client_cert_manager.list_certificates)
+        self.warmup.submit(
+            "volume_backups", self.docker_manager.get_volume_backups, project_path
+        )
+
     def display_welcome_message(self):
         logger.debug("Displaying welcome message.")
         show_welcome_message(self.translator)
@@ -220,6 +259,7 @@ class MainMenu(BaseWizard):
                 setup_wizard.run()
                 return True
             return False
+        self._schedule_warmup(current_config)
         choices = []
         menu_options = [
             {
@@ -340,10 +380,20 @@ class MainMenu(BaseWizard):
             logger.debug("Showing support features menu.")
             return self.show_support_features_menu()
         logger.info("Exiting main menu.")
+        self.warmup.cancel()
         return False
 
     def set_project_path(self, project_path: str) -> None:
         logger.debug(f"Setting project path for certificate-related operations: {project_path}")
+        self._init_security_managers(project_path)
+        if "environment" not in self.config_manager.config:
+            logger.debug("Adding 'environment' section to config.")
+            self.config_manager.config["environment"] = {}
+        self.config_manager.config["environment"]["path"] = project_path
+        self.config_manager.save()
+        logger.info(f"Project path set and config saved: {project_path}")
+
+    def _init_security_managers(self, project_path: str) -> None:
         self.project_path = project_path
         self.ca_manager = CertificateAuthority(
             base_dir=project_path, translator=self.translator
@@ -367,10 +417,3 @@ class MainMenu(BaseWizard):
         self.auth_bypass_manager = AuthBypassIPManager(
             translator=self.translator
         )
-        
-        if "environment" not in self.config_manager.config:
-            logger.debug("Adding 'environment' section to config.")
-            self.config_manager.config["environment"] = {}
-        self.config_manager.config["environment"]["path"] = project_path
-        self.config_manager.save()
-        logger.info(f"Project path set and config saved: {project_path}")
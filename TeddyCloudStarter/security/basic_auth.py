@@ -13,6 +13,7 @@ from typing import Dict, List
 import questionary
 from rich.console import Console
 from rich.table import Table
+from ..docker.images import HTPASSWD_IMAGE, ImageManager
 from ..utilities.logger import logger
 
 console = Console()
@@ -277,7 +278,11 @@ class BasicAuthManager:
                     )
                     return False
 
-                if not self.check_internet_connection():
+                image_manager = ImageManager(translator=self.translator)
+                # Any local copy of the helper image will do, no pull or network check needed
+                image_ready = image_manager.is_current(HTPASSWD_IMAGE, max_age=None)
+
+                if not image_ready and not self.check_internet_connection():
                     logger.warning("No internet connection detected. Docker may not be able to pull the httpd image.")
                     console.print(
                         f"[bold red]{self._translate('Error: No internet connection detected. Docker may not be able to pull the httpd image.')}[/]"
@@ -301,26 +306,27 @@ class BasicAuthManager:
                     )
                     continue
 
-                logger.info("Pulling httpd:alpine Docker image for htpasswd generation.")
-                console.print(
-                    f"[cyan]{self._translate('Pulling httpd:alpine Docker image...')}[/]"
-                )
-                pull_result = subprocess.run(
-                    ["docker", "pull", "httpd:alpine"], capture_output=True, text=True
-                )
+                if image_ready:
+                    pulled, pull_error = True, ""
+                else:
+                    logger.info("Pulling httpd:alpine Docker image for htpasswd generation.")
+                    console.print(
+                        f"[cyan]{self._translate('Pulling httpd:alpine Docker image...')}[/]"
+                    )
+                    pulled, pull_error = image_manager.pull(HTPASSWD_IMAGE)
 
-                if pull_result.returncode != 0:
-                    logger.error(f"Error pulling Docker image: {pull_result.stderr}")
+                if not pulled:
+                    logger.error(f"Error pulling Docker image: {pull_error}")
                     console.print(
                         f"[bold red]{self._translate('Error pulling Docker image')}:[/]"
                     )
-                    console.print(f"[red]{pull_result.stderr}[/]")
+                    console.print(f"[red]{pull_error}[/]")
 
                     if (
-                        "network" in pull_result.stderr.lower()
-                        or "connection" in pull_result.stderr.lower()
-                        or "dial" in pull_result.stderr.lower()
-                        or "lookup" in pull_result.stderr.lower()
+                        "network" in pull_error.lower()
+                        or "connection" in pull_error.lower()
+                        or "dial" in pull_error.lower()
+                        or "lookup" in pull_error.lower()
                     ):
                         logger.warning("Network error detected. Please check your internet connection.")
                         console.print(
@@ -386,7 +392,7 @@ class BasicAuthManager:
                     "--rm",
                     "-v",
                     f"{security_path}:/htpasswd",
-                    "httpd:alpine",
+                    HTPASSWD_IMAGE,
                     "sh",
                     "-c",
                     f"htpasswd -cb /htpasswd/{temp_filename} {first_user['username']} {first_user['password']}",
@@ -399,7 +405,7 @@ class BasicAuthManager:
                         "--rm",
                         "-v",
                         f"{docker_security_path}:/htpasswd",
-                        "httpd:alpine",
+                        HTPASSWD_IMAGE,
                         "sh",
                         "-c",
                         f"htpasswd -cb /htpasswd/{temp_filename} {first_user['username']} {first_user['password']}",
@@ -423,7 +429,7 @@ class BasicAuthManager:
                         "--rm",
                         "-v",
                         f"{security_path}:/htpasswd",
-                        "httpd:alpine",
+                        HTPASSWD_IMAGE,
                         "sh",
                         "-c",
                         f"htpasswd -b /htpasswd/{temp_filename} {user['username']} {user['password']}",
@@ -436,7 +442,7 @@ class BasicAuthManager:
                             "--rm",
                             "-v",
                             f"{docker_security_path}:/htpasswd",
-                            "httpd:alpine",
+                            HTPASSWD_IMAGE,
                             "sh",
                             "-c",
                             f"htpasswd -b /htpasswd/{temp_filename} {user['username']} {user['password']}",
@@ -496,7 +502,7 @@ class BasicAuthManager:
                             "--rm",
                             "-v",
                             f"{docker_security_path}:/htpasswd",
-                            "httpd:alpine",
+                            HTPASSWD_IMAGE,
                             "sh",
                             "-c",
                             f"htpasswd -cb /htpasswd/.htpasswd {first_user['username']} {first_user['password']}",
@@ -518,7 +524,7 @@ class BasicAuthManager:
                                 "--rm",
                                 "-v",
                                 f"{docker_security_path}:/htpasswd",
-                                "httpd:alpine",
+                                HTPASSWD_IMAGE,
                                 "sh",
                                 "-c",
                                 f"htpasswd -b /htpasswd/.htpasswd {user['username']} {user['password']}",
@@ -628,7 +634,7 @@ class BasicAuthManager:
                 "--rm",
                 "-v",
                 f"{docker_security_path}:/htpasswd",
-                "httpd:alpine",
+                HTPASSWD_IMAGE,
                 "cat",
                 f"/htpasswd/{htpasswd_filename}",
             ]
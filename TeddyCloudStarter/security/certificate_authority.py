@@ -4,10 +4,11 @@ Certificate Authority operations for TeddyCloudStarter.
 """
 import os
 import platform
+import shutil
 import subprocess
 import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 from rich import box
 from rich.console import Console
@@ -40,6 +41,9 @@ class CertificateAuthority:
         self.client_certs_dir = None
         self.ca_dir = None
         self.crl_dir = None
+        # Optional callable returning the path of a key generated in advance
+        # for a purpose ("ca", "server" or "client"), or None
+        self.key_provider: Optional[Callable[[str], Optional[str]]] = None
 
     def _ensure_directories(self):
         logger.debug("Ensuring certificate directories exist.")
@@ -105,6 +109,30 @@ class CertificateAuthority:
             return self.translator.get(text)
         return text
 
+    def take_prepared_key(self, purpose: str, destination) -> bool:
+        """
+        Move a private key generated in advance to its destination.
+
+        Args:
+            purpose: Key purpose passed to the key provider
+            destination: Path the key is moved to
+
+        Returns:
+            bool: True if a prepared key was moved, False if it must be generated
+        """
+        if self.key_provider is None:
+            return False
+        source = self.key_provider(purpose)
+        if not source:
+            return False
+        try:
+            shutil.move(source, str(destination))
+        except (OSError, shutil.Error) as e:
+            logger.warning(f"Could not use prepared {purpose} key: {e}")
+            return False
+        logger.debug(f"Using prepared {purpose} key for {destination}")
+        return True
+
     def _check_openssl(self) -> bool:
         logger.debug("Checking for OpenSSL availability.")
         try:
@@ -200,16 +228,16 @@ For more information, visit: https://github.com/quentendo64/teddycloudstarter
                 f"[bold cyan]{self._translate('Generating Certificate Authority...')}[/]"
             )
 
+            if self.take_prepared_key("ca", ca_key_path):
+                key_args = ["-new", "-key", str(ca_key_path)]
+            else:
+                key_args = ["-newkey", "rsa:4096", "-nodes", "-keyout", str(ca_key_path)]
             subprocess.run(
                 [
                     "openssl",
                     "req",
                     "-x509",
-                    "-newkey",
-                    "rsa:4096",
-                    "-nodes",
-                    "-keyout",
-                    str(ca_key_path),
+                    *key_args,
                     "-out",
                     str(ca_crt_path),
                     "-subj",
@@ -354,6 +382,7 @@ authorityKeyIdentifier=keyid:always
                     str(crl_path.absolute()),
                 ],
                 check=True,
+                cwd=str(self.ca_dir),
             )
 
             if not crl_path.exists():
@@ -488,17 +517,17 @@ authorityKeyIdentifier=keyid:always
                 return False, self._translate("OpenSSL is not available")
 
             logger.info(f"Running openssl to generate self-signed certificate for {domain_name}")
+            if self.take_prepared_key("server", key_path):
+                key_args = ["-new", "-key", key_path]
+            else:
+                key_args = ["-nodes", "-newkey", "rsa:2048", "-keyout", key_path]
             cmd = [
                 "openssl",
                 "req",
                 "-x509",
-                "-nodes",
                 "-days",
                 "3650",
-                "-newkey",
-                "rsa:2048",
-                "-keyout",
-                key_path,
+                *key_args,
                 "-out",
                 crt_path,
                 "-subj",
@@ -2,7 +2,6 @@
 """
 Client certificate operations for TeddyCloudStarter.
 """
-import os
 import re
 import shutil
 import subprocess
@@ -17,6 +16,7 @@ from rich.panel import Panel
 
 from .certificate_authority import CertificateAuthority
 from ..utilities.logger import logger
+from ..utilities.process import run_command
 
 # Re-export console to ensure compatibility
 console = Console()
@@ -52,6 +52,9 @@ class ClientCertificateManager:
         self.server_dir = None
         self.crl_dir = None
 
+        # Certificates found in the clients directory as (clients_dir, file stamps, certificates)
+        self._file_listing = None
+
         # Create the certificate authority manager with deferred initialization
         self.ca_manager = CertificateAuthority(base_dir=base_dir, translator=translator)
 
@@ -298,15 +301,15 @@ class ClientCertificateManager:
             # Create parent directories if they don't exist
             client_key.parent.mkdir(parents=True, exist_ok=True)
 
+            if self.ca_manager.take_prepared_key("client", client_key):
+                key_args = ["-new", "-key", str(client_key)]
+            else:
+                key_args = ["-newkey", "rsa:4096", "-nodes", "-keyout", str(client_key)]
             subprocess.run(
                 [
                     "openssl",
                     "req",
-                    "-newkey",
-                    "rsa:4096",
-                    "-nodes",
-                    "-keyout",
-                    str(client_key),
+                    *key_args,
                     "-out",
                     str(client_csr),
                     "-subj",
@@ -633,10 +636,6 @@ class ClientCertificateManager:
 
             # Revoke the certificate
             try:
-                # Ensure we're in the CA directory for relative paths in the config
-                original_dir = os.getcwd()
-                os.chdir(str(self.ca_dir.absolute()))
-
                 # Make sure the CA directory is properly set up
                 self.ca_manager._setup_ca_directory()
 
@@ -644,7 +643,8 @@ class ClientCertificateManager:
                 ca_key_path = self.ca_dir / "ca.key"
                 ca_crt_path = self.ca_dir / "ca.crt"
                 openssl_conf_path = self.ca_dir / "openssl.cnf"
-                subprocess.run(
+                # Relative paths in the OpenSSL config resolve against the CA directory
+                run_command(
                     [
                         "openssl",
                         "ca",
@@ -657,8 +657,9 @@ class ClientCertificateManager:
                         "-cert",
                         str(ca_crt_path),
                     ],
-                    check=True,
                     cwd=str(self.ca_dir),
+                    capture=False,
+                    check=True,
                 )
 
                 # Generate CRL
@@ -668,9 +669,6 @@ class ClientCertificateManager:
                         f"[bold yellow]{self._translate('Warning: Could not generate CRL after revocation')}[/]"
                     )
 
-                # Return to original directory
-                os.chdir(original_dir)
-
                 # Update certificate status in config.json
                 if config_manager and certificates:
                     for i, cert in enumerate(certificates):
@@ -711,11 +709,6 @@ class ClientCertificateManager:
             except subprocess.SubprocessError as e:
                 error_msg = f"Error revoking certificate: {e}"
                 console.print(f"[bold red]{self._translate(error_msg)}[/]")
-                # Return to original directory on error
-                try:
-                    os.chdir(original_dir)
-                except:
-                    pass
                 return False, {}
 
         except Exception as e:
@@ -743,31 +736,52 @@ class ClientCertificateManager:
         ):
             certificates = config_manager.config["security"]["client_certificates"]
 
-        # If no certificates in config, try to find them in the file system
-        if not certificates and self.clients_dir.exists():
-            cert_files = list(self.clients_dir.glob("*.crt"))
-            for cert_file in cert_files:
-                try:
-                    # Get certificate information
-                    success, _, cert_info = self.ca_manager.validate_certificate(
-                        str(cert_file)
+        if certificates:
+            return certificates
+
+        # If no certificates in config, try to find them in the file system.
+        # This runs on the warm-up thread too, so it must not create directories
+        if self.clients_dir is not None:
+            clients_dir = self.clients_dir
+        elif self.base_dir is not None:
+            clients_dir = self.base_dir / "data" / "client_certs" / "clients"
+        else:
+            return certificates
+        from ..utilities.warmup import file_stamps
+
+        stamps = file_stamps(clients_dir, ".crt")
+        if stamps is None:
+            return certificates
+        # Validating takes several OpenSSL calls per file, so the result is
+        # reused until a certificate is added, removed or overwritten
+        cached = self._file_listing
+        if cached and cached[:2] == (clients_dir, stamps):
+            return list(cached[2])
+        certificates = []
+        for name, _, _ in stamps:
+            cert_file = clients_dir / name
+            try:
+                # Get certificate information
+                success, _, cert_info = self.ca_manager.validate_certificate(
+                    str(cert_file)
+                )
+                if success and cert_info:
+                    # Create a simplified certificate info dictionary
+                    certificates.append(
+                        {
+                            "client_name": cert_info.get("subject", "").replace(
+                                "subject=", ""
+                            ),
+                            "safe_name": cert_file.stem,
+                            "serial": cert_info.get("serial", ""),
+                            "creation_date": "Unknown",
+                            "valid_till": cert_info.get("not_after", ""),
+                            "revoked": False,
+                            "path": str(cert_file),
+                        }
                     )
-                    if success and cert_info:
-                        # Create a simplified certificate info dictionary
-                        certificates.append(
-                            {
-                                "client_name": cert_info.get("subject", "").replace(
-                                    "subject=", ""
-                                ),
-                                "safe_name": cert_file.stem,
-                                "serial": cert_info.get("serial", ""),
-                                "creation_date": "Unknown",
-                                "valid_till": cert_info.get("not_after", ""),
-                                "revoked": False,
-                                "path": str(cert_file),
-                            }
-                        )
-                except:
-                    pass
+            except:
+                pass
+        self._file_listing = (clients_dir, stamps, list(certificates))
 
         return certificates
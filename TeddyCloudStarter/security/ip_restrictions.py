@@ -4,8 +4,11 @@ IP restrictions functionality for TeddyCloudStarter.
 Handles configuration and validation of IP restrictions.
 """
 
+import sys
+
 from rich.console import Console
 from ..utilities.logger import logger
+from ..utilities.network import collapse_ip_networks, parse_ip_entries
 
 from ..ui.ip_restrictions_ui import (  # Auth bypass specific UI functions
     confirm_clear_auth_bypass_ips,
@@ -24,6 +27,7 @@ from ..ui.ip_restrictions_ui import (  # Auth bypass specific UI functions
     prompt_auth_bypass_management_action,
     prompt_for_auth_bypass_ip,
     prompt_for_ip_address,
+    prompt_for_ip_import_file,
     prompt_ip_management_action,
     select_ip_to_remove,
 )
@@ -32,6 +36,112 @@ from ..ui.ip_restrictions_ui import (  # Auth bypass specific UI functions
 console = Console()
 
 
+# Number of rejected entries listed after an import
+REJECTED_PREVIEW = 10
+
+
+def _translate(translator, text):
+    return translator.get(text) if translator else text
+
+
+def collapse_ip_list(nginx_config, key, translator=None):
+    """
+    Normalise and collapse an IP list of the security configuration in place.
+
+    Args:
+        nginx_config: The nginx configuration dictionary
+        key: "allowed_ips" or "auth_bypass_ips"
+        translator: The translator instance for localization
+
+    Returns:
+        int: Number of entries removed by merging
+    """
+    entries = nginx_config["security"].get(key, [])
+    collapsed, invalid = collapse_ip_networks(entries)
+    # Invalid entries are kept so validation can report them
+    nginx_config["security"][key] = collapsed + invalid
+    merged = len(entries) - len(collapsed) - len(invalid)
+    if merged > 0:
+        logger.info(f"Merged {merged} overlapping entries in {key}.")
+        message = _translate(translator, "Merged {count} duplicate or overlapping entries.")
+        console.print(f"[cyan]{message.format(count=merged)}[/]")
+    return merged
+
+
+def read_ip_source(source):
+    """
+    Read IP entries from a text or CSV file, or from stdin if source is "-".
+
+    Args:
+        source: Path to the file or "-"
+
+    Returns:
+        list: The entries in file order
+    """
+    if source == "-":
+        return parse_ip_entries(sys.stdin)
+    with open(source, "r", encoding="utf-8-sig") as f:
+        return parse_ip_entries(f)
+
+
+def import_ip_list(nginx_config, key, source, translator=None, replace=False):
+    """
+    Bulk import IP addresses and CIDR ranges into an IP list in place.
+
+    The imported and existing entries are validated, deduplicated and merged
+    in a single pass. Rejected entries are reported and not added.
+
+    Args:
+        nginx_config: The nginx configuration dictionary
+        key: "allowed_ips" or "auth_bypass_ips"
+        source: Path to a text or CSV file, or "-" for stdin
+        translator: The translator instance for localization
+        replace: Replace the current list instead of extending it
+
+    Returns:
+        dict: "read", "rejected", "merged" and "total" counts, or None if the
+        source could not be read
+    """
+    try:
+        imported = read_ip_source(source)
+    except (OSError, UnicodeDecodeError) as e:
+        logger.error(f"Could not read IP list from {source}: {e}")
+        console.print(
+            f"[bold red]{_translate(translator, 'Could not read IP list')}: {e}[/]"
+        )
+        return None
+
+    security = nginx_config.setdefault("security", {})
+    existing = [] if replace else security.get(key, [])
+    collapsed, invalid = collapse_ip_networks(existing + imported)
+    # Invalid entries already in the list are kept so validation reports them
+    existing_set = set(existing)
+    kept = [entry for entry in invalid if entry in existing_set]
+    rejected = [entry for entry in invalid if entry not in existing_set]
+    security[key] = collapsed + kept
+
+    stats = {
+        "read": len(imported),
+        "rejected": len(rejected),
+        "merged": len(existing) + len(imported) - len(invalid) - len(collapsed),
+        "total": len(collapsed),
+    }
+    logger.info(f"Imported {key} from {source}: {stats}")
+    message = _translate(
+        translator,
+        "Read {read} entries: {rejected} rejected, {merged} duplicate or overlapping entries merged, {total} ranges in the list.",
+    )
+    console.print(f"[bold green]{message.format(**stats)}[/]")
+    if rejected:
+        logger.warning(f"Rejected {len(rejected)} invalid entries from {source}.")
+        console.print(
+            f"[yellow]{_translate(translator, 'Rejected invalid entries')}: "
+            f"{', '.join(rejected[:REJECTED_PREVIEW])}"
+            f"{' ...' if len(rejected) > REJECTED_PREVIEW else ''}[/]"
+        )
+    return stats
+
+
 class IPRestrictionsManager:
     """Manage IP address restrictions for TeddyCloud."""
 
@@ -93,6 +203,9 @@ class IPRestrictionsManager:
             elif action == "add":
                 self._add_ip_address(nginx_config)
 
+            elif action == "import":
+                self._import_ip_addresses(nginx_config)
+
             elif action == "remove":
                 self._remove_ip_address(nginx_config)
 
@@ -101,6 +214,7 @@ class IPRestrictionsManager:
 
             elif action == "save":
                 # Save is handled implicitly as we're modifying the dict directly
+                collapse_ip_list(nginx_config, "allowed_ips", self.translator)
                 display_ip_restrictions_status(
                     len(nginx_config["security"]["allowed_ips"]),
                     self.translator,
@@ -138,6 +252,17 @@ class IPRestrictionsManager:
                     nginx_config["security"]["allowed_ips"].append(ip)
                     display_ip_added(ip, self.translator)
 
+    def _import_ip_addresses(self, nginx_config):
+        """
+        Import IP addresses into the restriction list from a file.
+
+        Args:
+            nginx_config: The nginx configuration dictionary
+        """
+        source = prompt_for_ip_import_file(self.translator)
+        if source:
+            import_ip_list(nginx_config, "allowed_ips", source, self.translator)
+
     def _remove_ip_address(self, nginx_config):
         """
         Remove IP addresses from the restriction list.
@@ -228,6 +353,9 @@ class AuthBypassIPManager:
             elif action == "add":
                 self._add_auth_bypass_ip(nginx_config)
 
+            elif action == "import":
+                self._import_auth_bypass_ips(nginx_config)
+
             elif action == "remove":
                 self._remove_auth_bypass_ip(nginx_config)
 
@@ -236,6 +364,7 @@ class AuthBypassIPManager:
 
             elif action == "save":
                 # Save is handled implicitly as we're modifying the dict directly
+                collapse_ip_list(nginx_config, "auth_bypass_ips", self.translator)
                 display_auth_bypass_status(
                     len(nginx_config["security"]["auth_bypass_ips"]),
                     self.translator,
@@ -267,6 +396,17 @@ class AuthBypassIPManager:
                     nginx_config["security"]["auth_bypass_ips"].append(ip)
                     display_ip_added(ip, self.translator)
 
+    def _import_auth_bypass_ips(self, nginx_config):
+        """
+        Import IP addresses into the auth bypass list from a file.
+
+        Args:
+            nginx_config: The nginx configuration dictionary
+        """
+        source = prompt_for_ip_import_file(self.translator)
+        if source:
+            import_ip_list(nginx_config, "auth_bypass_ips", source, self.translator)
+
     def _remove_auth_bypass_ip(self, nginx_config):
         """
         Remove IP addresses from the auth bypass list.
@@ -6,6 +6,7 @@ import subprocess
 from pathlib import Path
 
 from rich.console import Console
+from ..docker.images import CERTBOT_IMAGE, HELPER_IMAGE
 from ..utilities.logger import logger
 
 # Re-export console to ensure compatibility
@@ -147,7 +148,7 @@ class LetsEncryptManager:
         certbot_conf_vol = f"{project_name}_certbot_conf"
         certbot_www_vol = f"{project_name}_certbot_www"
         certbot_logs_vol = f"{project_name}_certbot_logs"
-        certbot_image = "certbot/certbot:latest"
+        certbot_image = CERTBOT_IMAGE
         certbot_cmd = [
             "sudo", "docker", "run", "--rm",
             "-v", f"{certbot_conf_vol}:/etc/letsencrypt",
@@ -188,7 +189,7 @@ class LetsEncryptManager:
         check_cmd = [
             "sudo", "docker", "run", "--rm",
             "-v", f"{certbot_conf_vol}:/etc/letsencrypt",
-            "alpine", "ls", f"/etc/letsencrypt/live/{domain}"
+            HELPER_IMAGE, "ls", f"/etc/letsencrypt/live/{domain}"
         ]
         logger.info(f"Checking for certificate files in Docker volume for {domain}...")
         logger.debug(f"Running command: {' '.join(check_cmd)}")
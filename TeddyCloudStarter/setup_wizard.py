@@ -10,11 +10,14 @@ import questionary
 from .configuration.direct_mode import configure_direct_mode
 from .configuration.generator import generate_docker_compose, generate_nginx_configs
 from .configuration.nginx_mode import configure_nginx_mode
+from .docker.images import HTPASSWD_IMAGE, NGINX_IMAGE, ImageManager, required_images
 from .utilities.file_system import browse_directory
 from .utilities.logger import logger
 
 # Import our modules - use relative imports to avoid circular dependencies
 from .wizard.base_wizard import BaseWizard
+from .wizard.checkpoint import SETUP_STEPS, SetupCheckpoint, image_ids
+from .wizard.speculative import SpeculativeSetup
 from .wizard.ui_helpers import (
     console,
     custom_style,
@@ -31,6 +34,7 @@ class SetupWizard(BaseWizard):
         logger.debug(f"Initializing SetupWizard with locales_dir={locales_dir}")
         super().__init__(locales_dir)
         self.locales_dir = locales_dir
+        self.speculation = None
         logger.info("SetupWizard initialized.")
 
     def select_language(self):
@@ -77,33 +81,130 @@ class SetupWizard(BaseWizard):
         logger.info("Development message displayed.")
 
     def run(self):
-        """Run the main configuration wizard to set up TeddyCloud."""
+        """
+        Run the main configuration wizard to set up TeddyCloud.
+
+        Images and key material that the answers given so far make likely to
+        be needed are prepared in the background while later prompts are
+        shown; whatever the final configuration does not use is discarded.
+        """
+        if self.speculation is not None:
+            # Restarted from within the wizard, keep the running speculation
+            return self._run_steps()
+        speculation = self.speculation = SpeculativeSetup()
+        self._set_key_provider(speculation.take_key)
+        try:
+            return self._run_steps()
+        finally:
+            self._set_key_provider(None)
+            self.speculation = None
+            speculation.finish(self.config_manager.config)
+
+    def _set_key_provider(self, key_provider):
+        """Let the certificate managers use keys prepared in the background."""
+        self.ca_manager.key_provider = key_provider
+        self.client_cert_manager.ca_manager.key_provider = key_provider
+
+    def _run_steps(self):
         logger.info("Starting TeddyCloud setup wizard.")
         logger.debug(f"Current config: {self.config_manager.config}")
         console.print(
             f"[bold cyan]{self.translator.get('Starting TeddyCloud setup wizard')}...[/]"
         )
+        checkpoint = SetupCheckpoint(self.config_manager.config_path)
+        resume_step = checkpoint.resume_step(self.config_manager.config)
+        if resume_step != SETUP_STEPS[0]:
+            # All steps completed means only starting the services failed
+            resume_step = resume_step or "services"
+            logger.info(f"Resuming setup at step: {resume_step}")
+            console.print(
+                f"[bold cyan]{self.translator.get('Resuming the previous setup at step')}: {resume_step}[/]"
+            )
+        checkpoint.start()
         # Step 1: Select project path if not already set
-        if not self.config_manager.config.get("environment", {}).get("path"):
+        if checkpoint.is_completed("project_path"):
+            logger.debug("Project path step already completed.")
+        elif not self.config_manager.config.get("environment", {}).get("path"):
             logger.debug("Project path not set, invoking select_project_path().")
             self.select_project_path()
         else:
             logger.debug("Project path already set.")
+        checkpoint.record("project_path", self.config_manager.config)
+        # The TeddyCloud and helper images are needed in every mode
+        self.speculation.pull_images(required_images(self.config_manager.config))
         # Step 2: Select deployment mode (and configure it)
-        logger.debug("Selecting deployment mode.")
-        self.select_deployment_mode()
-        # Save the configuration
-        logger.debug("Saving configuration after deployment mode selection.")
-        self.config_manager.save()
-        logger.success("Configuration saved after deployment mode selection.")
+        if checkpoint.is_completed("deployment"):
+            logger.debug("Deployment mode step already completed.")
+        else:
+            logger.debug("Selecting deployment mode.")
+            if resume_step == "deployment":
+                # Ask again only for the answers whose certificates or credentials changed
+                restored = checkpoint.restore_parts(self.config_manager.config)
+                logger.info(f"Deployment parts kept from the previous setup: {restored}")
+
+            def record_part(part):
+                checkpoint.record_part(part, self.config_manager.config)
+
+            with self.config_manager.transaction():
+                self.select_deployment_mode(on_part_configured=record_part)
+                # Save the configuration
+                logger.debug("Saving configuration after deployment mode selection.")
+                self.config_manager.save()
+            logger.success("Configuration saved after deployment mode selection.")
+            checkpoint.record("deployment", self.config_manager.config)
         console.print(
             f"[bold green]{self.translator.get('Configuration completed successfully!')}[/]"
         )
-        # Generate configuration files automatically
+        # Step 3: Generate configuration files automatically
+        if checkpoint.is_completed("configuration_files"):
+            logger.debug("Configuration files step already completed.")
+        elif self._generate_configuration_files():
+            checkpoint.record("configuration_files", self.config_manager.config)
+        # Ask if user wants to start services with the new configuration
+        logger.info("Prompting user to start/restart services with new configuration.")
+        if questionary.confirm(
+            self.translator.get(
+                "Want to start/restart services with the new configuration?"
+            ),
+            default=True,
+            style=custom_style,
+        ).ask():
+            project_path = self.config_manager.config.get("environment", {}).get("path")
+            logger.info(f"User chose to start/restart services. Project path: {project_path}")
+            # Step 4: Pull the images, then start the services
+            if checkpoint.is_completed("images"):
+                logger.debug("Images step already completed.")
+            else:
+                pulled = ImageManager(
+                    self.config_manager.config_path, self.translator
+                ).ensure_images(required_images(self.config_manager.config))
+                if pulled and all(pulled.values()):
+                    checkpoint.record("images", self.config_manager.config, image_ids(pulled))
+            if not self.docker_manager.start_services(project_path=project_path):
+                logger.error("Starting services failed, setup can be resumed.")
+                console.print(
+                    f"[bold yellow]{self.translator.get('The setup will resume from here on the next start.')}[/]"
+                )
+                return False
+            logger.success("Services started/restarted successfully.")
+        else:
+            logger.info("User declined to start/restart services.")
+        checkpoint.clear()
+        logger.debug("Exiting run() method.")
+        return True
+
+    def _generate_configuration_files(self):
+        """
+        Generate docker-compose.yml and, in nginx mode, the nginx configuration.
+
+        Returns:
+            bool: True if all files were generated
+        """
         logger.info("Generating configuration files.")
         console.print(
             f"[bold cyan]{self.translator.get('Generating configuration files')}...[/]"
         )
+        success = True
         # Generate docker-compose.yml file
         logger.debug("Generating docker-compose.yml file.")
         if generate_docker_compose(
@@ -114,6 +215,7 @@ class SetupWizard(BaseWizard):
                 f"[green]{self.translator.get('Successfully generated docker-compose.yml')}[/]"
             )
         else:
+            success = False
             logger.error("Failed to generate docker-compose.yml.")
             console.print(
                 f"[bold red]{self.translator.get('Failed to generate docker-compose.yml')}[/]"
@@ -129,6 +231,7 @@ class SetupWizard(BaseWizard):
                     f"[green]{self.translator.get('Successfully generated nginx configuration files')}[/]"
                 )
             else:
+                success = False
                 logger.error("Failed to generate nginx configuration files.")
                 console.print(
                     f"[bold red]{self.translator.get('Failed to generate nginx configuration files')}[/]"
@@ -138,23 +241,7 @@ class SetupWizard(BaseWizard):
         console.print(
             f"[bold green]{self.translator.get('Configuration files generated successfully!')}[/]"
         )
-        # Ask if user wants to start services with the new configuration
-        logger.info("Prompting user to start/restart services with new configuration.")
-        if questionary.confirm(
-            self.translator.get(
-                "Want to start/restart services with the new configuration?"
-            ),
-            default=True,
-            style=custom_style,
-        ).ask():
-            project_path = self.config_manager.config.get("environment", {}).get("path")
-            logger.info(f"User chose to start/restart services. Project path: {project_path}")
-            self.docker_manager.start_services(project_path=project_path)
-            logger.success("Services started/restarted successfully.")
-        else:
-            logger.info("User declined to start/restart services.")
-        logger.debug("Exiting run() method.")
-        return True
+        return success
 
     def select_project_path(self):
         """Let the user select a project path."""
@@ -266,8 +353,14 @@ class SetupWizard(BaseWizard):
             logger.success("Configuration saved with current directory as project path.")
         logger.debug("Exiting select_project_path().")
 
-    def select_deployment_mode(self):
-        """Let the user select a deployment mode."""
+    def select_deployment_mode(self, on_part_configured=None):
+        """
+        Let the user select a deployment mode.
+
+        Args:
+            on_part_configured: Optional callable, called with "https" and
+                "security" once those nginx answers are given
+        """
         logger.debug("Entering select_deployment_mode().")
         choices = [
             {
@@ -298,6 +391,10 @@ class SetupWizard(BaseWizard):
                 break
         logger.info(f"Deployment mode selected: {selected_id}")
         self.config_manager.config["mode"] = selected_id
+        if self.speculation and selected_id == "nginx":
+            # Prepared while the nginx, HTTPS and security prompts are answered
+            self.speculation.pull_images([NGINX_IMAGE, HTPASSWD_IMAGE])
+            self.speculation.prepare_keys(["ca", "server", "client"])
         security_managers = {
             "ca_manager": self.ca_manager,
             "client_cert_manager": self.client_cert_manager,
@@ -315,9 +412,27 @@ class SetupWizard(BaseWizard):
         else:
             logger.debug("Configuring nginx mode.")
             self.config_manager.config = configure_nginx_mode(
-                self.config_manager.config, self.translator, security_managers
+                self.config_manager.config,
+                self.translator,
+                security_managers,
+                on_part_configured,
             )
             logger.success("Nginx mode configured.")
+        from .configuration.io_profile import DEFAULT_IO_PROFILE
+        from .configuration.logging_profile import RECOMMENDED_LOGGING_PROFILE
+        from .ui.configuration_manager_ui import prompt_io_profile, prompt_logging_profile
+
+        self.config_manager.config["logging_profile"] = prompt_logging_profile(
+            self.translator,
+            self.config_manager.config.get("logging_profile", RECOMMENDED_LOGGING_PROFILE),
+        )
+        logger.info(f"Logging profile selected: {self.config_manager.config['logging_profile']}")
+
+        io_config = self.config_manager.config.setdefault("io", {})
+        io_config["profile"] = prompt_io_profile(
+            self.translator, io_config.get("profile", DEFAULT_IO_PROFILE)
+        )
+        logger.info(f"Storage I/O profile selected: {io_config['profile']}")
         console.print(
             f"[green]{self.translator.get('Deployment mode set to')}: {self.config_manager.config['mode']}[/]"
         )
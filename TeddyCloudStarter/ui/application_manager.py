@@ -2,6 +2,8 @@ import subprocess
 from pathlib import Path
 import tempfile
 import re
+from ..configuration.box_registry import BoxRegistry, normalize_mac
+from ..docker.images import HELPER_IMAGE
 from ..utilities.openssl_utils import der_to_pem_cert, der_to_pem_key, get_certificate_fingerprint
 from ..utilities.logger import logger
 
@@ -47,7 +49,7 @@ def inject_tonies_custom_json(config_manager):
                 "docker", "rm", "-f", temp_container_name
             ], check=False)
             subprocess.run([
-                "docker", "create", "--name", temp_container_name, "-v", "teddycloudstarter_config:/config", "nginx:stable-alpine"
+                "docker", "create", "--name", temp_container_name, "-v", "teddycloudstarter_config:/config", HELPER_IMAGE
             ], check=True)
             teddycloud_container = temp_container_name
             is_temp = True
@@ -108,7 +110,7 @@ def extract_toniebox_information(config_manager):
             subprocess.run([
                 "docker", "rm", "-f", temp_container_name], check=False)
             subprocess.run([
-                "docker", "create", "--name", temp_container_name, "-v", "teddycloudstarter_config:/config", "nginx:alpine"
+                "docker", "create", "--name", temp_container_name, "-v", "teddycloudstarter_config:/config", HELPER_IMAGE
             ], check=True)
             subprocess.run([
                 "docker", "cp", f"{temp_container_name}:{ini_in_volume}", str(temp_ini_path)
@@ -131,18 +133,21 @@ def extract_toniebox_information(config_manager):
                 if mac not in boxes:
                     boxes[mac] = {}
                 boxes[mac][key] = value
-    boxes_by_mac = {}
+    # Update the stored boxes in place and drop the ones TeddyCloud no longer knows
+    registry = BoxRegistry.from_config(config_manager.config)
+    known = {normalize_mac(mac) for mac in boxes}
+    for mac in [box["macaddress"] for box in registry if box["macaddress"] not in known]:
+        registry.remove(mac)
     for mac, data in boxes.items():
         mac_lower = mac.lower()
-        boxes_by_mac[mac_lower] = {
+        registry.update(mac_lower, {
             "commonName": data.get("commonName", mac_lower),
             "boxName": data.get("boxName", ""),
             "boxModel": data.get("boxModel", ""),
             "certdir": data.get("core.certdir", ""),
-            "macaddress": mac_lower,
             "api_access": data.get("toniebox.api_access", "")
-        }
-    box_list = list(boxes_by_mac.values())
+        })
+    box_list = list(registry)
 
     # --- Begin certificate extraction, conversion, and copy-back ---
     for box in box_list:
@@ -169,9 +174,10 @@ def extract_toniebox_information(config_manager):
                 # Get fingerprint of the .der file
                 try:
                     fingerprint = get_certificate_fingerprint(temp_der)
-                    box[f"{key}_fingerprint"] = fingerprint
                 except Exception:
-                    box[f"{key}_fingerprint"] = None
+                    fingerprint = None
+                # Through the registry so the fingerprint index stays current
+                registry.update(mac_lower, {f"{key}_fingerprint": fingerprint})
             except Exception:
                 continue  # If .der file doesn't exist, skip
             temp_pem = temp_der.with_suffix('.pem')
@@ -332,10 +338,10 @@ def extract_toniebox_information(config_manager):
 
     # --- End certificate extraction, conversion, and copy-back ---
 
-    config_manager.config["boxes"] = box_list
+    registry.store(config_manager.config)
     config_manager.save()
     try:
         temp_ini_path.unlink(missing_ok=True)
     except Exception:
         pass
-    return {"status": "success", "boxes": box_list}
+    return {"status": "success", "boxes": registry.to_list()}
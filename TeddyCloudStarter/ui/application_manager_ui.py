@@ -9,6 +9,7 @@ import questionary
 from rich import box
 from rich.panel import Panel
 
+from ..docker.images import HELPER_IMAGE
 from ..wizard.ui_helpers import console, custom_style
 from ..utilities.logger import logger
 from .application_manager import inject_tonies_custom_json, extract_toniebox_information
@@ -122,7 +123,7 @@ def inject_tonies_custom_json_ui(config_manager, docker_manager, translator):
                 f"1. {translator.get('Copy')} {source_file}\n"
                 f"2. {translator.get('To the config volume of the TeddyCloud container')}\n"
                 f"   {translator.get('Using command')}: docker cp {source_file} teddycloud-app:/teddycloud/config/tonies.custom.json\n"
-                f"   {translator.get('Or')}: docker run --rm -v {source_file}:/src -v teddycloudstarter_config:/dest alpine cp /src /dest/tonies.custom.json\n",
+                f"   {translator.get('Or')}: docker run --rm -v {source_file}:/src -v teddycloudstarter_config:/dest {HELPER_IMAGE} cp /src /dest/tonies.custom.json\n",
                 title=f"[bold cyan]{translator.get('Manual Injection Instructions')}[/]",
                 box=box.ROUNDED,
             )
@@ -5,8 +5,6 @@ Backup and recovery management UI for TeddyCloudStarter.
 import os
 import sys
 import time
-import shutil
-from pathlib import Path
 
 import questionary
 
@@ -41,23 +39,10 @@ def show_backup_recovery_menu(config_manager, docker_manager, translator):
 
         backup_dir = os.path.join(project_path, "data", "backup")
         logger.debug(f"Backup directory: {backup_dir}")
-        has_backups = (
-            os.path.exists(backup_dir)
-            and any(
-                f.startswith("teddycloud-") and f.endswith(".tar.gz")
-                for f in os.listdir(backup_dir)
-            )
-            if os.path.exists(backup_dir)
-            else False
-        )
+        has_backups = bool(docker_manager.get_volume_backups(project_path))
         logger.debug(f"Has Docker volume backups: {has_backups}")
 
-        has_config_backups = any(
-            os.path.isfile(f) and os.path.basename(f).startswith("config.json.backup.")
-            for f in Path(os.path.dirname(config_manager.config_path)).glob(
-                "config.json.backup.*"
-            )
-        )
+        has_config_backups = bool(config_manager.history().entries())
         logger.debug(f"Has configuration backups: {has_config_backups}")
 
         if not os.path.exists(backup_dir):
@@ -200,7 +185,7 @@ def show_restore_config_menu(config_manager, translator):
         config_manager: The configuration manager instance
         translator: The translator instance for localization
     """
-    config_backups = get_config_backups(config_manager.config_path)
+    config_backups = get_config_backups(config_manager)
 
     if not config_backups:
         console.print(
@@ -208,35 +193,24 @@ def show_restore_config_menu(config_manager, translator):
         )
         return
 
-    backup_options = []
-    for backup_path in config_backups:
-        try:
-            timestamp = int(os.path.basename(backup_path).split(".")[-1])
-            date_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
-            backup_options.append(
-                (f"{date_str} ({os.path.basename(backup_path)})", backup_path)
-            )
-        except (ValueError, IndexError):
-            backup_options.append((os.path.basename(backup_path), backup_path))
-
-    backup_options.sort(key=lambda x: x[1], reverse=True)
-
-    choices = [option[0] for option in backup_options] + [translator.get("Back")]
+    # Labels can repeat (two saves within a second), so choices carry the id
+    choices = []
+    for entry in config_backups:
+        date_str = time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(entry["timestamp"])
+        )
+        changed = ", ".join(entry.get("changed_keys", [])) or "-"
+        label = f"{date_str} (v{entry.get('version') or '?'}; {changed})"
+        choices.append(questionary.Choice(title=label, value=entry["id"]))
+    choices.append(questionary.Choice(title=translator.get("Back"), value=None))
 
-    selected = questionary.select(
+    selected_entry_id = questionary.select(
         translator.get("Select a configuration backup to restore:"),
         choices=choices,
         style=custom_style,
     ).ask()
 
-    if selected == translator.get("Back"):
-        return
-
-    selected_backup_path = next(
-        (path for label, path in backup_options if label == selected), None
-    )
-
-    if selected_backup_path:
+    if selected_entry_id:
         if questionary.confirm(
             translator.get(
                 "Are you sure you want to restore this configuration backup? Current settings will be overwritten."
@@ -244,34 +218,28 @@ def show_restore_config_menu(config_manager, translator):
             default=False,
             style=custom_style,
         ).ask():
-            restore_config_backup(selected_backup_path, config_manager, translator)
+            restore_config_backup(selected_entry_id, config_manager, translator)
 
 
-def get_config_backups(config_path):
+def get_config_backups(config_manager):
     """
-    Get list of available configuration backup files.
+    Get list of available configuration history entries.
 
     Args:
-        config_path: Path to the configuration file
+        config_manager: The configuration manager instance
 
     Returns:
-        list: List of backup file paths
+        list: History entries, newest first
     """
-    config_dir = os.path.dirname(config_path)
-    config_name = os.path.basename(config_path)
+    return config_manager.history().entries()
 
-    backup_pattern = f"{config_name}.backup.*"
-    backup_files = list(Path(config_dir).glob(backup_pattern))
 
-    return [str(path) for path in backup_files if path.is_file()]
-
-
-def restore_config_backup(backup_path, config_manager, translator):
+def restore_config_backup(entry_id, config_manager, translator):
     """
-    Restore configuration from backup file.
+    Restore configuration from a history entry.
 
     Args:
-        backup_path: Path to the backup file
+        entry_id: The configuration history entry id
         config_manager: The configuration manager instance
         translator: The translator instance for localization
     """
@@ -279,9 +247,13 @@ def restore_config_backup(backup_path, config_manager, translator):
         console.print(
             f"[bold cyan]{translator.get('Creating backup of current configuration before restoring')}...[/]"
         )
-        config_manager.backup()
-        shutil.copy2(backup_path, config_manager.config_path)
-        config_manager.config = config_manager._load_config()
+        success, error = config_manager.restore(entry_id)
+        if not success:
+            error_msg = translator.get("Error restoring configuration: {error}").format(
+                error=error
+            )
+            console.print(f"[bold red]{error_msg}[/]")
+            return
         console.print(
             f"[bold green]{translator.get('Configuration successfully restored from backup')}.[/]"
         )
@@ -472,11 +444,8 @@ def restore_from_backup(volume, backup_file, docker_manager, translator, project
                 default=True,
                 style=custom_style,
             ).ask():
+                # Returns once every service has stopped
                 docker_manager.stop_services()
-                console.print(
-                    f"[bold cyan]{translator.get('Waiting for services to stop')}...[/]"
-                )
-                time.sleep(2)
 
         if docker_manager.restore_volume(volume, backup_file, project_path):
             if questionary.confirm(
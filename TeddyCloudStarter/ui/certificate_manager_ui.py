@@ -49,20 +49,12 @@ def show_certificate_management_menu(config, translator, security_managers):
                     "text": translator.get("Create additional client certificate"),
                 }
             )
-            from ..config_manager import ConfigManager
-
-            config_manager = ConfigManager()
-            fresh_config = config_manager.config
-            active_certs = []
-            if (
-                "security" in fresh_config
-                and "client_certificates" in fresh_config["security"]
-            ):
-                active_certs = [
-                    cert
-                    for cert in fresh_config["security"]["client_certificates"]
-                    if not cert.get("revoked", False)
-                ]
+            # Listing prefetched by the main menu's warm-up
+            active_certs = [
+                cert
+                for cert in security_managers["client_cert_manager"].list_certificates()
+                if not cert.get("revoked", False)
+            ]
             logger.debug(f"Active client certificates: {active_certs}")
             if active_certs:
                 logger.debug("There are active client certificates. Adding invalidate option.")
@@ -259,11 +251,8 @@ def invalidate_client_certificate(
     config_manager = ConfigManager()
     fresh_config = config_manager.config
 
-    if (
-        "security" not in fresh_config
-        or "client_certificates" not in fresh_config["security"]
-        or not fresh_config["security"]["client_certificates"]
-    ):
+    certificates = client_cert_manager.list_certificates()
+    if not certificates:
         logger.warning("No client certificates found.")
         console.print(
             f"[bold yellow]{translator.get('No client certificates found.')}[/]"
@@ -273,11 +262,7 @@ def invalidate_client_certificate(
             show_certificate_management_menu(config, translator, security_managers)
         return
 
-    active_certs = [
-        cert
-        for cert in fresh_config["security"]["client_certificates"]
-        if not cert.get("revoked", False)
-    ]
+    active_certs = [cert for cert in certificates if not cert.get("revoked", False)]
     logger.debug(f"Active certificates for invalidation: {active_certs}")
 
     if not active_certs:
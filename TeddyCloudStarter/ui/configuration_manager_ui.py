@@ -15,6 +15,7 @@ from ..configuration.nginx_mode import (
     modify_domain_name,
     modify_https_mode,
     modify_ip_restrictions,
+    modify_performance_profile,
     modify_security_settings,
 )
 from ..configuration.reset_operations import perform_reset_operations
@@ -76,6 +77,8 @@ def show_configuration_management_menu(
                 ),
             },
             {"id": "change_tc_branch", "text": translator.get("Change TeddyCloud image branch")},
+            {"id": "change_logging", "text": translator.get("Change logging profile")},
+            {"id": "configure_io", "text": translator.get("Configure storage I/O profile and resource limits")},
             {"id": "reset", "text": translator.get("Reset TeddyCloudStarter")},
             {"id": "refresh", "text": translator.get("Refresh server configuration")},
             {"id": "back", "text": translator.get("Back to main menu")},
@@ -107,6 +110,10 @@ def show_configuration_management_menu(
                     "id": "modify_ip_filtering",
                     "text": translator.get("Configure IP address filtering"),
                 },
+                {
+                    "id": "modify_performance",
+                    "text": translator.get("Change nginx performance profile"),
+                },
             ]
 
             # Add basic auth bypass option if basic auth is configured
@@ -151,8 +158,9 @@ def show_configuration_management_menu(
 
         elif selected_id == "change_mode":
             logger.info("User chose to change deployment mode.")
-            wizard.select_deployment_mode()
-            config_manager.save()
+            with config_manager.transaction():
+                wizard.select_deployment_mode()
+                config_manager.save()
             logger.debug("Deployment mode changed and config saved.")
 
             # --- Begin: Additional steps after deployment mode change ---
@@ -215,8 +223,27 @@ def show_configuration_management_menu(
                 from ..configuration.generator import generate_docker_compose
                 from ..configurations import TEMPLATES
                 generate_docker_compose(config_manager.config, translator, TEMPLATES)
-                logger.success("TeddyCloud image branch updated. User should restart container.")
-                console.print(f"[green]{translator.get('TeddyCloud image branch updated. Please restart the container to apply changes.')}[/]")
+                logger.success("TeddyCloud image branch updated.")
+                console.print(f"[green]{translator.get('TeddyCloud image branch updated.')}[/]")
+                if questionary.confirm(
+                    translator.get("Pull the new image and recreate TeddyCloud now?"),
+                    default=True,
+                    style=custom_style,
+                ).ask():
+                    project_path = config_manager.config.get("environment", {}).get("path")
+                    DockerManager(translator=translator).upgrade_services(
+                        project_path=project_path
+                    )
+                else:
+                    console.print(f"[yellow]{translator.get('Please restart the container to apply changes.')}[/]")
+
+        elif selected_id == "change_logging":
+            logger.info("User chose to change the logging profile.")
+            change_logging_profile(config_manager, translator)
+
+        elif selected_id == "configure_io":
+            logger.info("User chose to configure the storage I/O profile.")
+            configure_io_profile(config_manager, translator)
 
         elif selected_id == "reset":
             logger.info("User chose to reset TeddyCloudStarter.")
@@ -268,16 +295,22 @@ def show_configuration_management_menu(
 
         elif selected_id == "modify_security":
             logger.info("User chose to modify security settings.")
-            modify_security_settings(
-                config_manager.config, translator, security_managers
-            )
-            config_manager.save()
+            with config_manager.transaction():
+                modify_security_settings(
+                    config_manager.config, translator, security_managers
+                )
+                config_manager.save()
 
         elif selected_id == "modify_ip_filtering":
             logger.info("User chose to configure IP address filtering.")
             modify_ip_restrictions(config_manager.config, translator, security_managers)
             config_manager.save()
 
+        elif selected_id == "modify_performance":
+            logger.info("User chose to change the nginx performance profile.")
+            modify_performance_profile(config_manager.config, translator)
+            config_manager.save()
+
         elif selected_id == "modify_auth_bypass":
             logger.info("User chose to configure basic auth bypass IPs.")
             from ..configuration.nginx_mode import configure_auth_bypass_ips
@@ -290,6 +323,294 @@ def show_configuration_management_menu(
         logger.debug("Returning to configuration management menu loop.")
 
 
+def prompt_logging_profile(translator, current_profile):
+    """
+    Prompt user to select the logging profile.
+
+    Args:
+        translator: The translator instance for localization
+        current_profile: The profile selected by default
+
+    Returns:
+        str: The selected profile ('debug', 'standard' or 'production')
+    """
+    from ..configuration.logging_profile import (
+        LOGGING_PROFILE_DESCRIPTIONS,
+        LOGGING_PROFILES,
+    )
+
+    choices = [
+        {
+            "id": profile,
+            "text": f"{translator.get(profile.capitalize())} - {translator.get(LOGGING_PROFILE_DESCRIPTIONS[profile])}",
+        }
+        for profile in LOGGING_PROFILES
+    ]
+    choice_texts = [choice["text"] for choice in choices]
+    default_text = next(
+        (choice["text"] for choice in choices if choice["id"] == current_profile),
+        choice_texts[0],
+    )
+    selected_text = questionary.select(
+        translator.get("Select logging profile:"),
+        choices=choice_texts,
+        default=default_text,
+        style=custom_style,
+    ).ask()
+    for choice in choices:
+        if choice["text"] == selected_text:
+            return choice["id"]
+    return current_profile
+
+
+def change_logging_profile(config_manager, translator):
+    """
+    Change the logging profile, regenerate the configuration files and offer
+    to recreate the affected services.
+
+    Args:
+        config_manager: The configuration manager instance
+        translator: The translator instance for localization
+    """
+    from ..configuration.generator import generate_docker_compose, generate_nginx_configs
+    from ..configuration.logging_profile import DEFAULT_LOGGING_PROFILE
+    from ..configurations import TEMPLATES
+
+    config = config_manager.config
+    current_profile = config.get("logging_profile", DEFAULT_LOGGING_PROFILE)
+    profile = prompt_logging_profile(translator, current_profile)
+    if profile == current_profile:
+        console.print(f"[bold cyan]{translator.get('Logging profile unchanged.')}[/]")
+        return
+
+    config["logging_profile"] = profile
+    config_manager.save()
+    logger.info(f"Logging profile set to {profile}")
+    if not generate_docker_compose(config, translator, TEMPLATES):
+        return
+    if config.get("mode") == "nginx" and not generate_nginx_configs(
+        config, translator, TEMPLATES
+    ):
+        return
+    console.print(
+        f"[green]{translator.get('Logging profile updated to')} {profile}.[/]"
+    )
+    # Environment and log driver options only apply to recreated containers
+    if questionary.confirm(
+        translator.get("Recreate the affected services now?"),
+        default=True,
+        style=custom_style,
+    ).ask():
+        project_path = config.get("environment", {}).get("path")
+        DockerManager(translator=translator).upgrade_services(project_path=project_path)
+    else:
+        console.print(
+            f"[yellow]{translator.get('Please restart the container to apply changes.')}[/]"
+        )
+
+
+def prompt_io_profile(translator, current_profile):
+    """
+    Prompt user to select the storage I/O profile.
+
+    Args:
+        translator: The translator instance for localization
+        current_profile: The profile selected by default
+
+    Returns:
+        str: The selected profile ('standard' or 'sdcard')
+    """
+    from ..configuration.io_profile import IO_PROFILE_DESCRIPTIONS, IO_PROFILES
+
+    choices = [
+        {
+            "id": profile,
+            "text": f"{translator.get('SD card' if profile == 'sdcard' else profile.capitalize())} - {translator.get(IO_PROFILE_DESCRIPTIONS[profile])}",
+        }
+        for profile in IO_PROFILES
+    ]
+    choice_texts = [choice["text"] for choice in choices]
+    default_text = next(
+        (choice["text"] for choice in choices if choice["id"] == current_profile),
+        choice_texts[0],
+    )
+    selected_text = questionary.select(
+        translator.get("Select storage I/O profile:"),
+        choices=choice_texts,
+        default=default_text,
+        style=custom_style,
+    ).ask()
+    for choice in choices:
+        if choice["text"] == selected_text:
+            return choice["id"]
+    return current_profile
+
+
+def prompt_resource_limits(translator, services, current_limits):
+    """
+    Prompt user for memory and CPU limits per service.
+
+    Args:
+        translator: The translator instance for localization
+        services: Service names to ask for
+        current_limits: Limits currently configured per service
+
+    Returns:
+        dict: Service name to {"memory", "cpus"}; services without limits are omitted
+    """
+    from ..configuration.io_profile import MEMORY_PATTERN
+
+    def _valid_cpus(text):
+        try:
+            return not text.strip() or float(text) > 0
+        except ValueError:
+            return False
+
+    limits = {}
+    for service in services:
+        current = current_limits.get(service, {})
+        memory = questionary.text(
+            translator.get("Memory limit for {service} (e.g. 256m, empty for none):").format(
+                service=service
+            ),
+            default=str(current.get("memory", "")),
+            validate=lambda text: not text.strip() or bool(MEMORY_PATTERN.match(text.strip())),
+            style=custom_style,
+        ).ask()
+        cpus = questionary.text(
+            translator.get("CPU limit for {service} (e.g. 0.5, empty for none):").format(
+                service=service
+            ),
+            default=str(current.get("cpus", "")),
+            validate=_valid_cpus,
+            style=custom_style,
+        ).ask()
+        service_limits = {}
+        if memory and memory.strip():
+            service_limits["memory"] = memory.strip().lower()
+        if cpus and cpus.strip():
+            service_limits["cpus"] = float(cpus)
+        if service_limits:
+            limits[service] = service_limits
+    return limits
+
+
+def display_write_reduction_report(config, translator):
+    """
+    Show how much the running containers write into paths the SD card
+    profile keeps in RAM.
+
+    Args:
+        config: The configuration dictionary
+        translator: The translator instance for localization
+    """
+    from rich.table import Table
+
+    from ..configuration.io_profile import estimate_write_reduction
+    from ..utilities.resource_monitor import format_bytes
+
+    report = estimate_write_reduction(config)
+    table = Table(title=translator.get("Expected write reduction"), box=None)
+    table.add_column(translator.get("Container"), style="cyan")
+    table.add_column(translator.get("Data stored per day of uptime"), justify="right")
+    table.add_column(translator.get("Status"))
+    total = 0.0
+    for entry in report:
+        if entry["bytes_per_day"] is None:
+            rate, status = "-", translator.get("not running")
+        else:
+            rate = format_bytes(entry["bytes_per_day"])
+            if entry["in_ram"]:
+                status = translator.get("already in RAM")
+            else:
+                status = translator.get("moves to RAM")
+                total += entry["bytes_per_day"]
+        table.add_row(entry["container"], rate, status)
+    console.print(table)
+    console.print(
+        f"[dim]{translator.get('Size of the files in these paths divided by the container uptime; overwritten or rotated data is not counted.')}[/]"
+    )
+    console.print(
+        f"[yellow]{translator.get('nginx logs are written to Docker log files on disk and are not reduced by this profile; the production logging profile writes the least.')}[/]"
+    )
+    if total:
+        console.print(
+            f"[green]{translator.get('At least {amount} per day fewer writes to disk.').format(amount=format_bytes(total))}[/]"
+        )
+
+
+def configure_io_profile(config_manager, translator):
+    """
+    Configure the storage I/O profile and per-service resource limits,
+    regenerate the configuration files and offer to recreate the services.
+
+    Args:
+        config_manager: The configuration manager instance
+        translator: The translator instance for localization
+    """
+    from ..configuration.generator import generate_docker_compose, generate_nginx_configs
+    from ..configuration.io_profile import DEFAULT_IO_PROFILE, RESOURCE_SERVICES
+    from ..configurations import TEMPLATES
+
+    config = config_manager.config
+    io_config = dict(config.get("io", {}))
+    previous = dict(io_config)
+
+    io_config["profile"] = prompt_io_profile(
+        translator, io_config.get("profile", DEFAULT_IO_PROFILE)
+    )
+    if io_config["profile"] == "sdcard":
+        io_config["cache_in_ram"] = questionary.confirm(
+            translator.get("Keep the TeddyCloud cache in RAM as well? It is emptied on every restart."),
+            default=io_config.get("cache_in_ram", False),
+            style=custom_style,
+        ).ask()
+    else:
+        io_config.pop("cache_in_ram", None)
+
+    if questionary.confirm(
+        translator.get("Configure memory and CPU limits per service? tmpfs mounts count towards the memory limit."),
+        default=bool(io_config.get("resource_limits")),
+        style=custom_style,
+    ).ask():
+        services = [
+            service
+            for service in RESOURCE_SERVICES
+            if config.get("mode") == "nginx" or service == "teddycloud"
+        ]
+        io_config["resource_limits"] = prompt_resource_limits(
+            translator, services, io_config.get("resource_limits", {})
+        )
+
+    if io_config == previous:
+        console.print(f"[bold cyan]{translator.get('Storage settings unchanged.')}[/]")
+        return
+
+    if io_config["profile"] == "sdcard" and previous.get("profile") != "sdcard":
+        display_write_reduction_report(dict(config, io=io_config), translator)
+
+    config["io"] = io_config
+    config_manager.save()
+    logger.info(f"Storage I/O settings updated: {io_config}")
+    if not generate_docker_compose(config, translator, TEMPLATES):
+        return
+    if config.get("mode") == "nginx" and not generate_nginx_configs(
+        config, translator, TEMPLATES
+    ):
+        return
+    if questionary.confirm(
+        translator.get("Recreate the affected services now?"),
+        default=True,
+        style=custom_style,
+    ).ask():
+        project_path = config.get("environment", {}).get("path")
+        DockerManager(translator=translator).upgrade_services(project_path=project_path)
+    else:
+        console.print(
+            f"[yellow]{translator.get('Please restart the container to apply changes.')}[/]"
+        )
+
+
 def handle_reset_wizard(translator, config_manager=None):
     logger.debug("Entering handle_reset_wizard.")
     console.print(
@@ -2,13 +2,13 @@
 """
 Docker management UI for TeddyCloudStarter.
 """
-import time
 
 import questionary
 from rich import box
 from rich.table import Table
 
 from ..utilities.log_viewer import display_live_logs
+from ..utilities.resource_monitor import display_resource_dashboard
 from ..wizard.ui_helpers import console, custom_style
 from ..utilities.logger import logger
 
@@ -111,6 +111,20 @@ def create_menu_choices(running_services, stopped_services, services, translator
         choices.append(
             {"id": "restart_all", "text": translator.get("Restart all services")}
         )
+        choices.append(
+            {
+                "id": "restart_rolling",
+                "text": translator.get("Rolling restart (one service at a time)"),
+            }
+        )
+
+    if running_services:
+        choices.append(
+            {
+                "id": "upgrade",
+                "text": translator.get("Update images and recreate changed services"),
+            }
+        )
 
     if running_services:
         if len(running_services) == len(services):
@@ -146,6 +160,9 @@ def create_menu_choices(running_services, stopped_services, services, translator
         choices.append(
             {"id": "logs_all", "text": translator.get("Live logs from all services")}
         )
+        choices.append(
+            {"id": "resources", "text": translator.get("Live resource dashboard")}
+        )
         choices.append(
             {
                 "id": "logs_specific",
@@ -172,21 +189,30 @@ def handle_docker_action(
         logger.info(f"Starting services: {action_id}")
         docker_manager.start_services(project_path=project_path)
         console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
-        time.sleep(2)
         return False
 
     elif action_id == "restart_all":
         logger.info("Restarting all services.")
         docker_manager.restart_services(project_path=project_path)
         console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
-        time.sleep(2)
+        return False
+
+    elif action_id == "restart_rolling":
+        logger.info("Rolling restart of all services.")
+        docker_manager.rolling_restart_services(project_path=project_path)
+        console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
+        return False
+
+    elif action_id == "upgrade":
+        logger.info("Upgrading services with pre-pulled images.")
+        docker_manager.upgrade_services(project_path=project_path)
+        console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
         return False
 
     elif action_id in ["stop_all", "stop_running"]:
         logger.info(f"Stopping services: {action_id}")
         docker_manager.stop_services(project_path=project_path)
         console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
-        time.sleep(2)
         return False
 
     elif action_id == "start_specific":
@@ -212,6 +238,11 @@ def handle_docker_action(
         display_live_logs(docker_manager, project_path=project_path)
         return False
 
+    elif action_id == "resources":
+        logger.info("Displaying live resource dashboard.")
+        display_resource_dashboard(docker_manager)
+        return False
+
     elif action_id == "logs_specific":
         logger.debug("User chose to view live logs from a specific service.")
         return handle_live_logs_specific_service(
@@ -264,7 +295,6 @@ def handle_start_specific_service(
     if selected_id != "back":
         docker_manager.start_service(selected_id, project_path=project_path)
         console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
-        time.sleep(2)
 
     return False
 
@@ -301,7 +331,6 @@ def handle_restart_specific_service(
     if selected_id != "back":
         docker_manager.restart_service(selected_id, project_path=project_path)
         console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
-        time.sleep(2)
 
     return False
 
@@ -338,7 +367,6 @@ def handle_stop_specific_service(
     if selected_id != "back":
         docker_manager.stop_service(selected_id, project_path=project_path)
         console.print(f"[bold cyan]{translator.get('Refreshing service status')}...[/]")
-        time.sleep(2)
 
     return False
 
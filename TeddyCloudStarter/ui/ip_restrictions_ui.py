@@ -2,6 +2,8 @@
 """
 UI module for IP restrictions configuration in TeddyCloudStarter.
 """
+import os
+
 import questionary
 
 from ..utilities.validation import validate_ip_address
@@ -83,6 +85,29 @@ def prompt_for_ip_address(translator):
     return result
 
 
+def prompt_for_ip_import_file(translator):
+    """
+    Prompt user for a text or CSV file with IP addresses to import.
+
+    Args:
+        translator: The translator instance for localization
+
+    Returns:
+        str: The file path or empty string to cancel
+    """
+    logger.debug("Prompting user for an IP list file to import.")
+    console.print(
+        f"[cyan]{translator.get('One or more IP addresses or CIDR ranges per line, separated by spaces, commas or semicolons. Text after # is ignored.')}[/]"
+    )
+    result = questionary.path(
+        translator.get("Path to the IP list file (leave empty to cancel):"),
+        style=custom_style,
+        validate=lambda path: os.path.isfile(path) if path else True,
+    ).ask()
+    logger.info(f"User selected IP list file: {result}")
+    return result
+
+
 def confirm_no_ips_continue(translator):
     """
     Ask user if they want to continue with no IP restrictions.
@@ -169,12 +194,13 @@ def prompt_ip_management_action(translator):
         translator: The translator instance for localization
 
     Returns:
-        str: The selected action identifier ('show', 'add', 'remove', 'clear', or 'save')
+        str: The selected action identifier ('show', 'add', 'import', 'remove', 'clear', or 'save')
     """
     logger.debug("Prompting user for IP management action.")
     choices = [
         {"id": "show", "text": translator.get("Show current IP restrictions")},
         {"id": "add", "text": translator.get("Add IP address")},
+        {"id": "import", "text": translator.get("Import IP addresses from file")},
         {"id": "remove", "text": translator.get("Remove IP address")},
         {"id": "clear", "text": translator.get("Clear all IP restrictions")},
         {"id": "save", "text": translator.get("Save and return")},
@@ -379,12 +405,13 @@ def prompt_auth_bypass_management_action(translator):
         translator: The translator instance for localization
 
     Returns:
-        str: The selected action identifier ('show', 'add', 'remove', 'clear', or 'save')
+        str: The selected action identifier ('show', 'add', 'import', 'remove', 'clear', or 'save')
     """
     logger.debug("Prompting user for auth bypass management action.")
     choices = [
         {"id": "show", "text": translator.get("Show current bypass IPs")},
         {"id": "add", "text": translator.get("Add bypass IP address")},
+        {"id": "import", "text": translator.get("Import bypass IP addresses from file")},
         {"id": "remove", "text": translator.get("Remove bypass IP address")},
         {"id": "clear", "text": translator.get("Clear all bypass IPs")},
         {"id": "save", "text": translator.get("Save and return")},
@@ -596,3 +596,67 @@ def prompt_nginx_type(translator):
         if choice["text"] == selected_text:
             return choice["id"]
     return "standard"
+
+
+def prompt_performance_profile(translator, current_profile="auto"):
+    """
+    Prompt user to select the nginx performance profile.
+
+    Args:
+        translator: The translator instance for localization
+        current_profile: The profile selected by default
+
+    Returns:
+        str: The selected profile ('auto', 'small', 'standard' or 'large')
+    """
+    from ..configuration.performance import PERFORMANCE_PROFILES, PROFILE_DESCRIPTIONS
+
+    choices = [
+        {
+            "id": profile,
+            "text": f"{translator.get(profile.capitalize())} - {translator.get(PROFILE_DESCRIPTIONS[profile])}",
+        }
+        for profile in PERFORMANCE_PROFILES
+    ]
+    choice_texts = [choice["text"] for choice in choices]
+    default_text = next(
+        (choice["text"] for choice in choices if choice["id"] == current_profile),
+        choice_texts[0],
+    )
+    selected_text = questionary.select(
+        translator.get("Select nginx performance profile:"),
+        choices=choice_texts,
+        default=default_text,
+        style=custom_style,
+    ).ask()
+    for choice in choices:
+        if choice["text"] == selected_text:
+            return choice["id"]
+    return current_profile
+
+
+def prompt_upstream_keepalive(translator, profile_default, current_value=None):
+    """
+    Prompt user for the size of the keepalive pool from nginx-auth to TeddyCloud.
+
+    Args:
+        translator: The translator instance for localization
+        profile_default: Pool size of the selected performance profile
+        current_value: Pool size currently set in the configuration, if any
+
+    Returns:
+        Optional[int]: The pool size (0 disables the pool), or None to use the
+        profile default
+    """
+    answer = questionary.text(
+        translator.get(
+            "Idle connections kept open to TeddyCloud per nginx worker (0 disables, leave empty for the profile default of {default}):"
+        ).format(default=profile_default),
+        default="" if current_value is None else str(current_value),
+        validate=lambda text: not text.strip()
+        or (text.strip().isdigit() and int(text.strip()) <= 1024),
+        style=custom_style,
+    ).ask()
+    if answer is None or not answer.strip():
+        return None
+    return int(answer.strip())
@@ -1,21 +1,42 @@
 #!/usr/bin/env python3
 """
 Utilities package for TeddyCloudStarter.
+
+Re-exports other than the logger are resolved lazily so that importing a
+single utility module does not pull in questionary, prompt_toolkit and dnspython.
 """
+import importlib
 
-from .file_system import (
-    browse_directory,
-    create_directory,
-    ensure_project_directories,
-    get_directory_contents,
-)
-from .log_viewer import display_live_logs
 from .logger import TeddyLogger, get_logger, logger
-from .network import check_domain_resolvable, check_port_available
-from .validation import (
-    ConfigValidator,
-    validate_config,
-    validate_domain_name,
-    validate_ip_address,
-)
-from .version import check_for_updates, compare_versions, get_pypi_version
+
+_EXPORTS = {
+    "browse_directory": "file_system",
+    "create_directory": "file_system",
+    "ensure_project_directories": "file_system",
+    "get_directory_contents": "file_system",
+    "display_live_logs": "log_viewer",
+    "display_resource_dashboard": "resource_monitor",
+    "check_domain_resolvable": "network",
+    "check_port_available": "network",
+    "collapse_ip_networks": "network",
+    "parse_ip_entries": "network",
+    "ConfigValidator": "validation",
+    "validate_config": "validation",
+    "validate_domain_name": "validation",
+    "validate_ip_address": "validation",
+    "check_for_updates": "version",
+    "compare_versions": "version",
+    "get_pypi_version": "version",
+    "WarmupScheduler": "warmup",
+}
+
+__all__ = ["TeddyLogger", "get_logger", "logger"] + list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Anonymization engine for TeddyCloudStarter support packages.
+Compiles all anonymization rules into a single pattern, streams files line by
+line and derives stable pseudonyms from a keyed hash, so the same value maps
+to the same token across every file of a support package without keeping a
+table of every value seen.
+"""
+import functools
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import tempfile
+from typing import IO, Optional
+
+from .logger import logger
+
+# Every rule starts at the beginning of a word; the shared word-start guard in
+# front of the alternation lets the engine skip all other positions at once.
+# Order matters: at any given position the first matching alternative wins,
+# so more specific rules come before more generic ones.
+ANONYMIZATION_RULES = (
+    ("url", r"(?P<url_scheme>https?://)(?P<url_host>[a-zA-Z0-9.-]+)"),
+    ("email", r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
+    ("uuid", r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}\b"),
+    ("mac", r"(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}\b"),
+    ("ipv4", r"(?:\d{1,3}\.){3}\d{1,3}\b"),
+    (
+        "user",
+        r"(?P<user_key>user(?:name)?[:=]\s*)(?P<user_quote>[\"'])"
+        r"(?P<user_value>.*?)(?P=user_quote)",
+    ),
+    (
+        "host",
+        r"(?P<host_key>host(?:name)?[:=]\s*)(?P<host_quote>[\"'])"
+        r"(?P<host_value>.*?)(?P=host_quote)",
+    ),
+    ("serial", r"[A-Z0-9]{8,}\b"),
+)
+
+PSEUDONYM_FORMATS = {
+    "domain": "domain-{token}.invalid",
+    "email": "user-{token}@anonymized.invalid",
+    "uuid": "uuid-{token}",
+    "mac": "mac-{token}",
+    "ipv4": "ip-{token}",
+    "user": "user-{token}",
+    "host": "host-{token}",
+    "serial": "serial-{token}",
+}
+
+# Hex digits of the keyed hash kept per token; 48 bits make collisions between
+# the values of one support package practically impossible
+TOKEN_LENGTH = 12
+
+# Recently hashed values kept per anonymizer; bounds memory while repeated
+# values (IPs, MACs) skip the HMAC
+TOKEN_CACHE_SIZE = 4096
+
+SENSITIVE_INI_FIELDS = frozenset(
+    field.lower()
+    for field in (
+        "mqtt.hostname",
+        "mqtt.username",
+        "mqtt.password",
+        "mqtt.identification",
+        "mqtt.topic",
+        "core.host_url",
+        "core.server.bind_ip",
+        "core.allowOrigin",
+        "core.flex_uid",
+        "cloud.remote_hostname",
+        "hass.name",
+        "hass.id",
+        "core.server_cert.data.ca",
+        "toniebox.field2",
+        "toniebox.field6",
+    )
+)
+
+SENSITIVE_INI_PREFIXES = ("core.server_cert.data.", "core.client_cert.data.")
+
+_COMPILED_PATTERN = re.compile(
+    r"\b(?=\w)(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in ANONYMIZATION_RULES)
+    + ")"
+)
+
+
+class Anonymizer:
+    """
+    Single-pass anonymizer with stable pseudonyms.
+
+    One instance should be shared by all files of a support package so that,
+    for example, the same IP address is replaced by the same token in the
+    nginx logs, the teddycloud logs and the configuration files.
+    """
+
+    def __init__(self, key: Optional[bytes] = None):
+        """
+        Initialize the anonymizer.
+
+        Args:
+            key: Secret key of the pseudonym hash; a random key per instance
+                keeps tokens from being matched across support packages
+        """
+        self._key = key or secrets.token_bytes(32)
+        self._replacements = 0
+        self._token = functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)(self._hash)
+
+    @property
+    def replacement_count(self) -> int:
+        """Number of values that have been pseudonymized so far."""
+        return self._replacements
+
+    def pseudonym(self, kind: str, value: str) -> str:
+        """
+        Return the stable pseudonym for a value.
+
+        Tokens are derived from an HMAC of the kind and value, so memory use
+        does not grow with the number of distinct values.
+
+        Args:
+            kind: The kind of value (e.g. "ipv4", "mac", "domain")
+            value: The original value
+
+        Returns:
+            str: The pseudonym, identical for repeated calls with the same value
+        """
+        self._replacements += 1
+        return self._token(kind, value.lower())
+
+    def _hash(self, kind: str, value: str) -> str:
+        digest = hmac.new(
+            self._key, f"{kind}\0{value}".encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return PSEUDONYM_FORMATS[kind].format(token=digest[:TOKEN_LENGTH])
+
+    def _replace(self, match) -> str:
+        kind = match.lastgroup
+        if kind == "url":
+            return match.group("url_scheme") + self.pseudonym(
+                "domain", match.group("url_host")
+            )
+        if kind in ("user", "host"):
+            quote = match.group(f"{kind}_quote")
+            return (
+                match.group(f"{kind}_key")
+                + quote
+                + self.pseudonym(kind, match.group(f"{kind}_value"))
+                + quote
+            )
+        return self.pseudonym(kind, match.group(kind))
+
+    def anonymize_text(self, text: str) -> str:
+        """
+        Anonymize a piece of text in a single regex pass.
+
+        Args:
+            text: The text to anonymize
+
+        Returns:
+            str: The anonymized text
+        """
+        return _COMPILED_PATTERN.sub(self._replace, text)
+
+    def anonymize_stream(self, source: IO[str], target: IO[str]) -> int:
+        """
+        Anonymize a text stream line by line.
+
+        Args:
+            source: Readable text stream
+            target: Writable text stream
+
+        Returns:
+            int: Number of lines processed
+        """
+        sub = _COMPILED_PATTERN.sub
+        replace = self._replace
+        lines = 0
+        for line in source:
+            target.write(sub(replace, line))
+            lines += 1
+        return lines
+
+    def anonymize_file(self, file_path) -> int:
+        """
+        Anonymize a file in place with constant memory usage.
+
+        The result is written to a temporary file next to the original and
+        moved over it once complete.
+
+        Args:
+            file_path: Path to the file to anonymize
+
+        Returns:
+            int: Number of lines processed
+        """
+        logger.debug(f"Anonymizing file: {file_path}")
+        file_path = str(file_path)
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(file_path) or ".", suffix=".anon"
+        )
+        try:
+            with open(
+                file_path, "r", encoding="utf-8", errors="replace"
+            ) as source, os.fdopen(fd, "w", encoding="utf-8") as target:
+                lines = self.anonymize_stream(source, target)
+            os.replace(temp_path, file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logger.info(f"Anonymized {lines} lines in {file_path}")
+        return lines
+
+    def anonymize_config_ini(self, file_path) -> int:
+        """
+        Anonymize sensitive fields of a teddycloud config.ini in place.
+
+        Args:
+            file_path: Path to the config.ini file
+
+        Returns:
+            int: Number of fields that were anonymized
+        """
+        logger.debug(f"Anonymizing config.ini file: {file_path}")
+        file_path = str(file_path)
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(file_path) or ".", suffix=".anon"
+        )
+        anonymized = 0
+        try:
+            with open(
+                file_path, "r", encoding="utf-8", errors="replace"
+            ) as source, os.fdopen(fd, "w", encoding="utf-8") as target:
+                for line in source:
+                    stripped = line.strip()
+                    if stripped and not stripped.startswith(";") and "=" in line:
+                        field_name = line.split("=", 1)[0].strip()
+                        if (
+                            field_name.lower() in SENSITIVE_INI_FIELDS
+                            or field_name.startswith(SENSITIVE_INI_PREFIXES)
+                            or ".key" in field_name
+                        ):
+                            target.write(f"{field_name}=ANONYMIZED\n")
+                            anonymized += 1
+                            continue
+                    target.write(line)
+            os.replace(temp_path, file_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logger.info(f"Anonymized {anonymized} fields in {file_path}")
+        return anonymized
+
+    def anonymize_config_json(self, file_path) -> None:
+        """
+        Anonymize a TeddyCloudStarter config.json in place.
+
+        Domain and hostname use the same pseudonyms as the log files.
+
+        Args:
+            file_path: Path to the config.json file
+        """
+        logger.debug(f"Anonymizing config.json file: {file_path}")
+        with open(file_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        if "nginx" in config and config["nginx"].get("domain"):
+            config["nginx"]["domain"] = self.pseudonym(
+                "domain", config["nginx"]["domain"]
+            )
+
+        if "user_info" in config:
+            config["user_info"] = {
+                "name": "Anonymized User",
+                "email": "anonymized@email.com",
+            }
+
+        if "environment" in config and config["environment"].get("hostname"):
+            config["environment"]["hostname"] = self.pseudonym(
+                "host", config["environment"]["hostname"]
+            )
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=2)
+        logger.info(f"config.json file anonymized: {file_path}")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Subprocess execution layer for TeddyCloudStarter.
+Runs external commands with an explicit working directory, a timeout and
+timing capture, and offers a bounded worker pool for concurrent execution.
+The process-wide working directory is never changed, so commands can safely
+run in parallel.
+"""
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, List, Optional, Sequence
+
+from .logger import logger
+
+# Timeout for short commands such as version probes or `docker ps`
+DEFAULT_TIMEOUT = 60
+
+# Timeout for compose operations that may pull images or wait for containers
+COMPOSE_TIMEOUT = 900
+
+# Upper bound for concurrently running commands
+MAX_WORKERS = 4
+
+# Number of recent command timings kept for diagnostics
+TIMING_HISTORY = 200
+
+COMPOSE_FILE = "docker-compose.yml"
+
+# Project name set in the generated docker-compose.yml
+COMPOSE_PROJECT = "teddycloudstarter"
+
+_timings: Deque[Dict] = deque(maxlen=TIMING_HISTORY)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class CommandResult:
+    """Outcome of a command run through run_command()."""
+
+    def __init__(self, args, returncode, stdout, stderr, duration):
+        self.args = list(args)
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        """True if the command exited with status 0."""
+        return self.returncode == 0
+
+    def check_returncode(self) -> None:
+        """Raise CalledProcessError if the command failed."""
+        if self.returncode != 0:
+            raise subprocess.CalledProcessError(
+                self.returncode, self.args, self.stdout, self.stderr
+            )
+
+
+def _record_timing(args, cwd, returncode, duration) -> None:
+    _timings.append(
+        {
+            "command": " ".join(str(arg) for arg in args),
+            "cwd": cwd,
+            "returncode": returncode,
+            "duration": duration,
+        }
+    )
+    logger.debug(
+        f"Command '{' '.join(str(arg) for arg in args)}' finished with {returncode} in {duration:.2f}s"
+    )
+
+
+def run_command(
+    args: Sequence[str],
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    capture: bool = True,
+    check: bool = False,
+    stdout=None,
+    stderr=None,
+    input: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> CommandResult:
+    """
+    Run a command and wait for it to finish.
+
+    Args:
+        args: Command and arguments
+        cwd: Working directory for the command (the caller's is never changed)
+        timeout: Seconds after which the command is killed, None for no limit
+        capture: Capture stdout and stderr as text; otherwise they are inherited
+        check: Raise CalledProcessError if the command fails
+        stdout: Explicit stdout target (e.g. an open file), overrides capture
+        stderr: Explicit stderr target, overrides capture
+        input: Text passed to the command's stdin
+        env: Environment for the command
+
+    Returns:
+        CommandResult: Return code, output and duration
+
+    Raises:
+        subprocess.TimeoutExpired: If the timeout elapsed
+        subprocess.CalledProcessError: If check is set and the command failed
+        FileNotFoundError: If the command or the working directory is missing
+    """
+    if capture:
+        stdout = subprocess.PIPE if stdout is None else stdout
+        stderr = subprocess.PIPE if stderr is None else stderr
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            list(args),
+            cwd=cwd,
+            timeout=timeout,
+            stdout=stdout,
+            stderr=stderr,
+            input=input,
+            env=env,
+            text=True,
+        )
+    except subprocess.TimeoutExpired:
+        _record_timing(args, cwd, None, time.perf_counter() - start)
+        logger.error(f"Command timed out after {timeout}s: {' '.join(args)}")
+        raise
+    result = CommandResult(
+        args,
+        completed.returncode,
+        completed.stdout,
+        completed.stderr,
+        time.perf_counter() - start,
+    )
+    _record_timing(args, cwd, result.returncode, result.duration)
+    if check:
+        result.check_returncode()
+    return result
+
+
+def open_process(args: Sequence[str], cwd: Optional[str] = None, **kwargs) -> subprocess.Popen:
+    """
+    Start a long-running command without waiting for it (e.g. a log follower).
+
+    Args:
+        args: Command and arguments
+        cwd: Working directory for the command
+        **kwargs: Additional subprocess.Popen arguments
+
+    Returns:
+        subprocess.Popen: The running process
+    """
+    logger.debug(f"Starting process '{' '.join(args)}' in {cwd}")
+    return subprocess.Popen(list(args), cwd=cwd, **kwargs)
+
+
+def compose_args(data_dir: str, *args: str, compose_cmd: Optional[List[str]] = None) -> List[str]:
+    """
+    Build a docker compose command bound to a project directory.
+
+    The compose file and project directory are passed explicitly so the
+    command does not depend on the current working directory.
+
+    Args:
+        data_dir: Directory containing docker-compose.yml
+        *args: Compose sub-command and its arguments
+        compose_cmd: Base compose command, defaults to ["docker", "compose"]
+
+    Returns:
+        List[str]: The full command
+    """
+    base = list(compose_cmd or ["docker", "compose"])
+    return base + [
+        "--project-directory",
+        data_dir,
+        "-f",
+        os.path.join(data_dir, COMPOSE_FILE),
+        *args,
+    ]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_WORKERS, thread_name_prefix="tcs-command"
+            )
+        return _executor
+
+
+def submit_command(args: Sequence[str], **kwargs) -> Future:
+    """
+    Run a command on the shared worker pool.
+
+    Args:
+        args: Command and arguments
+        **kwargs: Arguments for run_command()
+
+    Returns:
+        Future: Resolves to the CommandResult
+    """
+    return _get_executor().submit(run_command, args, **kwargs)
+
+
+def run_parallel(commands: Iterable[Dict]) -> List[CommandResult]:
+    """
+    Run several commands concurrently, bounded by the worker pool size.
+
+    Args:
+        commands: Keyword argument dictionaries for run_command(), each with "args"
+
+    Returns:
+        List[CommandResult]: Results in the order of the given commands
+    """
+    futures = []
+    for command in commands:
+        command = dict(command)
+        futures.append(submit_command(command.pop("args"), **command))
+    return [future.result() for future in futures]
+
+
+def get_command_timings() -> List[Dict]:
+    """
+    Return the most recent command timings, oldest first.
+
+    Returns:
+        List[Dict]: Entries with command, cwd, returncode and duration
+    """
+    return list(_timings)
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Live container resource dashboard for TeddyCloudStarter.
+Reads a single long-lived `docker stats` stream, keeps per-container time
+series in fixed-size ring buffers and renders them as sparklines at a capped
+frame rate, so watching the system adds as little load as possible.
+"""
+import json
+import re
+import subprocess
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from rich import box
+from rich.console import Console
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+
+from .log_viewer import capture_keypress
+from .logger import logger
+from .process import COMPOSE_PROJECT, open_process, run_command
+
+console = Console()
+
+# Samples kept per metric and container (docker stats emits about one per second)
+HISTORY_SIZE = 60
+
+# Upper bound for dashboard redraws per second
+MAX_FPS = 2
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+
+
+class RingSeries:
+    """Fixed-size time series backed by a preallocated array."""
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self._values = array("d", [0.0] * size)
+        self._size = size
+        self._next = 0
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        """Add a sample, overwriting the oldest one once the buffer is full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    @property
+    def last(self) -> float:
+        """The most recent sample, 0.0 if there is none."""
+        return self._values[self._next - 1] if self._count else 0.0
+
+    def values(self) -> List[float]:
+        """Return the samples, oldest first."""
+        if self._count < self._size:
+            return list(self._values[: self._count])
+        return list(self._values[self._next :]) + list(self._values[: self._next])
+
+
+def parse_size(value: str) -> float:
+    """
+    Parse a docker stats size such as "12.5MiB" or "3.4kB" into bytes.
+
+    Args:
+        value: Size string
+
+    Returns:
+        float: Size in bytes, 0.0 if it cannot be parsed
+    """
+    match = re.match(r"\s*([0-9.]+)\s*([a-zA-Z]*)", value)
+    if not match:
+        return 0.0
+    number, unit = match.groups()
+    return float(number) * _UNITS.get(unit.lower() or "b", 1)
+
+
+def parse_percent(value: str) -> float:
+    """Parse a docker stats percentage such as "12.5%"."""
+    try:
+        return float(value.strip().rstrip("%"))
+    except ValueError:
+        return 0.0
+
+
+def format_bytes(value: float) -> str:
+    """Format a byte count with a binary unit."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GiB"
+
+
+def sparkline(values: List[float], maximum: Optional[float] = None) -> str:
+    """
+    Render samples as a sparkline.
+
+    Args:
+        values: Samples, oldest first
+        maximum: Value mapped to the highest bar, defaults to the largest sample
+
+    Returns:
+        str: One character per sample
+    """
+    if not values:
+        return ""
+    top = maximum or max(values) or 1.0
+    last = len(SPARK_CHARS) - 1
+    return "".join(
+        SPARK_CHARS[min(int(value / top * last + 0.5), last)] for value in values
+    )
+
+
+class ContainerStats:
+    """Time series of one container's resource usage."""
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.cpu = RingSeries(size)
+        self.memory = RingSeries(size)
+        self.memory_limit = 0.0
+        self.net_rx = RingSeries(size)
+        self.net_tx = RingSeries(size)
+        self.block_read = RingSeries(size)
+        self.block_write = RingSeries(size)
+        self.pids = 0
+        self._totals = None
+        self._sampled_at = None
+
+    def add_sample(self, sample: Dict[str, str], now: float) -> None:
+        """
+        Record a docker stats sample; I/O totals are converted into rates.
+
+        Args:
+            sample: One decoded `docker stats --format "{{json .}}"` line
+            now: Time the sample was read
+        """
+        self.cpu.append(parse_percent(sample.get("CPUPerc", "0")))
+        usage, _, limit = sample.get("MemUsage", "0B / 0B").partition("/")
+        self.memory.append(parse_size(usage))
+        self.memory_limit = parse_size(limit)
+        rx, _, tx = sample.get("NetIO", "0B / 0B").partition("/")
+        read, _, write = sample.get("BlockIO", "0B / 0B").partition("/")
+        totals = (parse_size(rx), parse_size(tx), parse_size(read), parse_size(write))
+        if self._totals is not None and now > self._sampled_at:
+            elapsed = now - self._sampled_at
+            rates = [max(new - old, 0.0) / elapsed for new, old in zip(totals, self._totals)]
+            self.net_rx.append(rates[0])
+            self.net_tx.append(rates[1])
+            self.block_read.append(rates[2])
+            self.block_write.append(rates[3])
+        self._totals = totals
+        self._sampled_at = now
+        try:
+            self.pids = int(sample.get("PIDs", "0"))
+        except ValueError:
+            self.pids = 0
+
+
+class StatsCollector:
+    """Reads one `docker stats` stream in the background."""
+
+    def __init__(self, containers: List[str], history_size: int = HISTORY_SIZE):
+        self.containers = containers
+        self.stats: Dict[str, ContainerStats] = {
+            name: ContainerStats(history_size) for name in containers
+        }
+        self.lock = threading.Lock()
+        self.updated = threading.Event()
+        self._process = None
+        self._thread = None
+
+    def start(self) -> bool:
+        """
+        Start the stats stream.
+
+        Returns:
+            bool: True if the stream was started
+        """
+        try:
+            self._process = open_process(
+                ["docker", "stats", "--format", "{{json .}}", *self.containers],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError as e:
+            logger.error(f"Could not start docker stats: {e}")
+            return False
+        self._thread = threading.Thread(
+            target=self._read, name="tcs-docker-stats", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _read(self) -> None:
+        for line in self._process.stdout:
+            # docker stats clears the screen between frames with ANSI sequences
+            line = _ANSI_ESCAPE.sub("", line).strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                sample = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            name = sample.get("Name", "")
+            if name in self.stats:
+                with self.lock:
+                    self.stats[name].add_sample(sample, time.monotonic())
+                self.updated.set()
+
+    def stop(self) -> None:
+        """Stop the stats stream."""
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+
+def get_running_containers() -> List[str]:
+    """
+    List the running containers of the TeddyCloudStarter project.
+
+    Returns:
+        List[str]: Container names
+    """
+    try:
+        result = run_command(
+            [
+                "docker",
+                "ps",
+                "--filter",
+                f"label=com.docker.compose.project={COMPOSE_PROJECT}",
+                "--format",
+                "{{.Names}}",
+            ]
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"Could not list containers: {e}")
+        return []
+    return sorted(result.stdout.split()) if result.ok else []
+
+
+def _render(collector: StatsCollector, title: str, controls: str, _translate) -> Panel:
+    table = Table(box=box.SIMPLE_HEAD, expand=True)
+    table.add_column(_translate("Container"), style="cyan", no_wrap=True)
+    table.add_column("CPU", justify="right", no_wrap=True)
+    table.add_column("", style="green", no_wrap=True)
+    table.add_column(_translate("Memory"), justify="right", no_wrap=True)
+    table.add_column("", style="magenta", no_wrap=True)
+    table.add_column(_translate("Net rx/tx"), justify="right", no_wrap=True)
+    table.add_column(_translate("Block r/w"), justify="right", no_wrap=True)
+    table.add_column("PIDs", justify="right")
+    width = max(min(console.width // 6, HISTORY_SIZE), 10)
+    with collector.lock:
+        for name, stats in collector.stats.items():
+            cpu = stats.cpu.values()[-width:]
+            memory = stats.memory.values()[-width:]
+            table.add_row(
+                name,
+                f"{stats.cpu.last:.1f}%",
+                # Scale CPU to at least one core so idle noise stays flat
+                sparkline(cpu, max(max(cpu, default=0.0), 100.0)),
+                format_bytes(stats.memory.last),
+                sparkline(memory, stats.memory_limit or None),
+                f"{format_bytes(stats.net_rx.last)}/s {format_bytes(stats.net_tx.last)}/s",
+                f"{format_bytes(stats.block_read.last)}/s {format_bytes(stats.block_write.last)}/s",
+                str(stats.pids),
+            )
+    return Panel(table, title=title, subtitle=controls, border_style="blue")
+
+
+def display_resource_dashboard(docker_manager):
+    """
+    Show live CPU, memory, network and block I/O of the running services.
+
+    Args:
+        docker_manager: The DockerManager instance
+    """
+    translator = getattr(docker_manager, "translator", None)
+
+    def _translate(text):
+        """Helper to translate text if translator is available."""
+        if translator:
+            return translator.get(text)
+        return text
+
+    containers = get_running_containers()
+    if not containers:
+        console.print(f"[bold yellow]{_translate('No running services to monitor.')}[/]")
+        return
+
+    collector = StatsCollector(containers)
+    if not collector.start():
+        console.print(f"[bold red]{_translate('Failed to start stats process.')}[/]")
+        return
+
+    title = f"[bold green]{_translate('Resource Dashboard')}[/]"
+    controls = f"[bold yellow][Q]{_translate('uit')}[/]"
+    frame_interval = 1.0 / MAX_FPS
+    try:
+        with Live(
+            _render(collector, title, controls, _translate),
+            auto_refresh=False,
+            console=console,
+        ) as live:
+            last_frame = 0.0
+            while True:
+                if capture_keypress() == "q":
+                    break
+                # Redraw only for new samples and never above MAX_FPS
+                if collector.updated.wait(timeout=0.1):
+                    now = time.monotonic()
+                    if now - last_frame >= frame_interval:
+                        collector.updated.clear()
+                        last_frame = now
+                        live.update(
+                            _render(collector, title, controls, _translate),
+                            refresh=True,
+                        )
+                    else:
+                        time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+        console.print(f"\n[bold green]{_translate('Resource dashboard closed.')}[/]")
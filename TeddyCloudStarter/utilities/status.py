@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Read-only status collection for TeddyCloudStarter.
+Gathers service states, certificate expiries and a configuration summary
+without the interactive UI, the update check or docker compose, reusing
+cached Docker and certificate data where possible.
+"""
+import datetime
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config_manager import DEFAULT_CONFIG_PATH, ConfigManager, write_file_atomic
+from .logger import logger
+from .process import COMPOSE_PROJECT, run_command
+
+# Seconds a cached Docker service snapshot is reused before docker is asked again
+DOCKER_CACHE_TTL = 30
+
+DOCKER_TIMEOUT = 10
+
+_DOCKER_PS_FORMAT = (
+    '{{.Label "com.docker.compose.service"}}\t{{.Names}}\t{{.State}}'
+    "\t{{.Status}}\t{{.Image}}"
+)
+
+
+def _cache_path(config_path: str) -> str:
+    return os.path.join(os.path.dirname(config_path), "status_cache.json")
+
+
+def _load_cache(cache_path: str) -> Dict[str, Any]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def query_service_states() -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Query the state of all TeddyCloudStarter containers with a single docker call.
+
+    Returns:
+        Optional[Dict[str, Dict[str, str]]]: Service name to state information,
+        or None if docker could not be queried
+    """
+    try:
+        result = run_command(
+            [
+                "docker",
+                "ps",
+                "--all",
+                "--filter",
+                f"label=com.docker.compose.project={COMPOSE_PROJECT}",
+                "--format",
+                _DOCKER_PS_FORMAT,
+            ],
+            timeout=DOCKER_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"Could not query docker: {e}")
+        return None
+    if result.returncode != 0:
+        logger.error(f"docker ps failed: {result.stderr.strip()}")
+        return None
+
+    services = {}
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 5:
+            continue
+        service, name, state, status, image = parts
+        services[service or name] = {
+            "container": name,
+            "state": state,
+            "status": status,
+            "image": image,
+        }
+    return services
+
+
+def read_certificate_expiry(cert_path: str) -> Optional[str]:
+    """
+    Read the expiry date of a certificate.
+
+    Args:
+        cert_path: Path to a PEM certificate
+
+    Returns:
+        Optional[str]: Expiry as ISO 8601 UTC timestamp, or None on failure
+    """
+    try:
+        result = run_command(
+            ["openssl", "x509", "-noout", "-enddate", "-in", cert_path],
+            timeout=DOCKER_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"Could not read certificate {cert_path}: {e}")
+        return None
+    if result.returncode != 0 or "=" not in result.stdout:
+        return None
+    not_after = result.stdout.strip().split("=", 1)[1]
+    try:
+        expiry = datetime.datetime.strptime(not_after, "%b %d %H:%M:%S %Y %Z")
+    except ValueError:
+        return None
+    return expiry.replace(tzinfo=datetime.timezone.utc).isoformat()
+
+
+def find_certificates(project_path: str) -> List[Path]:
+    """
+    List the certificates managed in a project.
+
+    Args:
+        project_path: The project path
+
+    Returns:
+        List[Path]: Existing server, CA and client certificate files
+    """
+    data_dir = Path(project_path) / "data"
+    candidates = [
+        data_dir / "server_certs" / "server.crt",
+        data_dir / "client_certs" / "ca" / "ca.crt",
+    ]
+    clients_dir = data_dir / "client_certs" / "clients"
+    if clients_dir.is_dir():
+        candidates.extend(sorted(clients_dir.glob("*.crt")))
+    return [path for path in candidates if path.is_file()]
+
+
+def summarize_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the configuration summary shown by the status command.
+
+    Args:
+        config: The configuration dictionary
+
+    Returns:
+        Dict[str, Any]: Non-sensitive configuration summary
+    """
+    summary = {
+        "version": config.get("version", ""),
+        "mode": config.get("mode", ""),
+        "project_path": config.get("environment", {}).get("path", ""),
+        "teddycloud_image_tag": config.get("teddycloud_image_tag", "latest"),
+        "boxes": len(config.get("boxes", []) or []),
+    }
+    if config.get("mode") == "nginx":
+        nginx_config = config.get("nginx", {})
+        security = nginx_config.get("security", {})
+        summary.update(
+            {
+                "domain": nginx_config.get("domain", ""),
+                "https_mode": nginx_config.get("https_mode", ""),
+                "security_type": security.get("type", ""),
+                "allowed_ips": len(security.get("allowed_ips", [])),
+                "auth_bypass_ips": len(security.get("auth_bypass_ips", [])),
+            }
+        )
+    elif config.get("mode") == "direct":
+        summary["ports"] = config.get("ports", {})
+    return summary
+
+
+def collect_status(
+    config_path: str = DEFAULT_CONFIG_PATH, max_age: float = DOCKER_CACHE_TTL
+) -> Dict[str, Any]:
+    """
+    Collect the current status of a TeddyCloudStarter installation.
+
+    Docker is queried at most once per max_age seconds; certificate expiries
+    are only re-read when the certificate file changes.
+
+    Args:
+        config_path: Path to the configuration file
+        max_age: Maximum age in seconds of a reused Docker snapshot
+
+    Returns:
+        Dict[str, Any]: Status document suitable for JSON output
+    """
+    now = time.time()
+    status: Dict[str, Any] = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
+    }
+    if not os.path.exists(config_path):
+        status.update({"configured": False, "healthy": False})
+        return status
+
+    config = ConfigManager(config_path=config_path).config
+    status["configured"] = True
+    status["config"] = summarize_config(config)
+
+    cache_path = _cache_path(config_path)
+    cache = _load_cache(cache_path)
+    cache_changed = False
+
+    docker_cache = cache.get("docker", {})
+    if docker_cache and now - docker_cache.get("timestamp", 0) <= max_age:
+        services = docker_cache.get("services")
+        services_checked_at = docker_cache["timestamp"]
+    else:
+        services = query_service_states()
+        services_checked_at = now
+        if services is not None:
+            cache["docker"] = {"timestamp": now, "services": services}
+            cache_changed = True
+    status["services"] = services if services is not None else {}
+    status["services_checked_at"] = datetime.datetime.fromtimestamp(
+        services_checked_at, datetime.timezone.utc
+    ).isoformat()
+    status["docker_available"] = services is not None
+
+    cert_cache = cache.get("certificates", {})
+    certificates = []
+    project_path = status["config"]["project_path"]
+    seen = set()
+    for cert_path in find_certificates(project_path) if project_path else []:
+        key = str(cert_path)
+        seen.add(key)
+        stat_result = cert_path.stat()
+        stamp = [stat_result.st_mtime_ns, stat_result.st_size]
+        entry = cert_cache.get(key)
+        if not entry or entry.get("stamp") != stamp:
+            entry = {"stamp": stamp, "not_after": read_certificate_expiry(key)}
+            cert_cache[key] = entry
+            cache_changed = True
+        days_left = None
+        if entry["not_after"]:
+            expiry = datetime.datetime.fromisoformat(entry["not_after"])
+            days_left = (expiry.timestamp() - now) // 86400
+        certificates.append(
+            {
+                "path": key,
+                "name": cert_path.stem,
+                "not_after": entry["not_after"],
+                "days_left": int(days_left) if days_left is not None else None,
+            }
+        )
+    for stale in set(cert_cache) - seen:
+        del cert_cache[stale]
+        cache_changed = True
+    cache["certificates"] = cert_cache
+    status["certificates"] = certificates
+
+    if cache_changed:
+        try:
+            write_file_atomic(cache_path, json.dumps(cache))
+        except OSError as e:
+            logger.warning(f"Could not write status cache: {e}")
+
+    status["healthy"] = bool(status["services"]) and all(
+        service["state"] == "running" for service in status["services"].values()
+    )
+    return status
+
+
+def print_status(status: Dict[str, Any], as_json: bool = False) -> None:
+    """
+    Print a status document.
+
+    Args:
+        status: The status document from collect_status()
+        as_json: Print machine-readable JSON instead of a text summary
+    """
+    if as_json:
+        print(json.dumps(status, indent=2))
+        return
+    if not status.get("configured"):
+        print("TeddyCloudStarter is not configured.")
+        return
+    summary = status["config"]
+    print(f"Mode: {summary['mode']}  Project: {summary['project_path']}")
+    print(f"Healthy: {'yes' if status['healthy'] else 'no'}")
+    for name, service in sorted(status["services"].items()):
+        print(f"  {name:<20} {service['state']:<10} {service['status']}")
+    for cert in status["certificates"]:
+        print(f"  {cert['name']:<20} expires {cert['not_after']} ({cert['days_left']} days)")
@@ -12,7 +12,9 @@ import zipfile
 from pathlib import Path
 
 from rich.console import Console
+from .anonymizer import Anonymizer
 from .logger import logger
+from .process import COMPOSE_TIMEOUT, compose_args, run_command, submit_command
 
 console = Console()
 
@@ -33,6 +35,7 @@ class SupportPackageCreator:
         self.config_manager = config_manager
         self.temp_dir = None
         self.anonymize = anonymize
+        self.anonymizer = Anonymizer()
         logger.info("SupportPackageCreator initialized.")
 
     def create_support_package(self, output_path=None):
@@ -79,60 +82,61 @@ class SupportPackageCreator:
 
         services = ["nginx-edge", "nginx-auth", "teddycloud", "teddycloud-certbot"]
 
-        for service in services:
-            try:
-                log_path = log_dir / f"{service}.log"
-                console.print(f"[cyan]Collecting logs for {service}...[/]")
+        data_dir = os.path.join(self.project_path, "data")
+        if not os.path.exists(data_dir):
+            console.print(f"[yellow]Warning: data directory not found at {data_dir}[/]")
+            for service in services:
+                self._fallback_to_docker_logs(service, log_dir)
+            return
 
-                original_dir = os.getcwd()
+        compose_cmd = ["docker", "compose"]
+        try:
+            run_command(["docker", "compose", "version"], check=True)
+        except (subprocess.SubprocessError, FileNotFoundError):
+            compose_cmd = ["docker-compose"]
+
+        # Logs are captured concurrently; anonymization shares one pseudonym
+        # table and therefore runs sequentially afterwards.
+        console.print(f"[cyan]Collecting logs for {', '.join(services)}...[/]")
+        pending = {}
+        for service in services:
+            log_file = open(log_dir / f"{service}.log", "w", encoding="utf-8")
+            log_file.write(f"--- Logs from {service} ---\n\n")
+            log_file.flush()
+            pending[service] = (
+                log_file,
+                submit_command(
+                    compose_args(
+                        data_dir, "logs", "--no-color", service, compose_cmd=compose_cmd
+                    ),
+                    cwd=data_dir,
+                    stdout=log_file,
+                    timeout=COMPOSE_TIMEOUT,
+                ),
+            )
 
+        for service, (log_file, future) in pending.items():
+            log_path = log_dir / f"{service}.log"
+            try:
                 try:
-                    data_dir = os.path.join(self.project_path, "data")
-                    if not os.path.exists(data_dir):
-                        console.print(
-                            f"[yellow]Warning: data directory not found at {data_dir}[/]"
-                        )
-                        continue
-
-                    os.chdir(data_dir)
-
-                    compose_cmd = ["docker", "compose"]
-                    try:
-                        subprocess.run(
-                            ["docker", "compose", "version"],
-                            check=True,
-                            capture_output=True,
-                            text=True,
-                        )
-                    except (subprocess.SubprocessError, FileNotFoundError):
-                        compose_cmd = ["docker-compose"]
-
-                    result = subprocess.run(
-                        compose_cmd + ["logs", "--no-color", service],
-                        capture_output=True,
-                        text=True,
+                    result = future.result()
+                finally:
+                    log_file.close()
+                if result.returncode == 0:
+                    console.print(
+                        f"[green]Successfully collected logs for {service}[/]"
                     )
+                    logger.info(f"Logs collected for service: {service}")
 
-                    if result.returncode == 0:
-                        with open(log_path, "w", encoding="utf-8") as log_file:
-                            log_file.write(f"--- Logs from {service} ---\n\n")
-                            log_file.write(result.stdout)
-                        console.print(
-                            f"[green]Successfully collected logs for {service}[/]"
-                        )
-                        logger.info(f"Logs collected for service: {service}")
-
-                        if self.anonymize:
-                            console.print(f"[cyan]Anonymizing logs for {service}...[/]")
-                            self._anonymize_log_file(log_path)
-                            logger.debug(f"Logs anonymized for service: {service}")
-                    else:
-                        console.print(
-                            f"[yellow]docker-compose logs failed for {service}, trying docker logs directly...[/]"
-                        )
-                        self._fallback_to_docker_logs(service, log_dir)
-                finally:
-                    os.chdir(original_dir)
+                    if self.anonymize:
+                        console.print(f"[cyan]Anonymizing logs for {service}...[/]")
+                        self._anonymize_log_file(log_path)
+                        logger.debug(f"Logs anonymized for service: {service}")
+                else:
+                    console.print(
+                        f"[yellow]docker-compose logs failed for {service}, trying docker logs directly...[/]"
+                    )
+                    self._fallback_to_docker_logs(service, log_dir)
 
             except Exception as e:
                 console.print(
@@ -145,14 +149,14 @@ class SupportPackageCreator:
         logger.debug(f"Fallback to docker logs for service: {service}")
         try:
             log_path = log_dir / f"{service}.log"
-            result = subprocess.run(
-                ["docker", "logs", service], capture_output=True, text=True
-            )
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                result = run_command(
+                    ["docker", "logs", service],
+                    stdout=log_file,
+                    timeout=COMPOSE_TIMEOUT,
+                )
 
             if result.returncode == 0:
-                with open(log_path, "w", encoding="utf-8") as log_file:
-                    log_file.write(result.stdout)
-
                 if self.anonymize:
                     console.print(
                         f"[cyan]Anonymizing logs for {service} (fallback method)...[/]"
@@ -170,6 +174,8 @@ class SupportPackageCreator:
             logger.error(f"Error collecting logs for service {service} using fallback method: {e}")
 
     def _collect_configs(self):
+        from ..docker.images import HELPER_IMAGE
+
         logger.debug("Collecting configuration files.")
         config_dir = Path(self.temp_dir) / "configs"
         config_dir.mkdir(exist_ok=True)
@@ -217,7 +223,7 @@ class SupportPackageCreator:
             volume_temp_dir = Path(self.temp_dir) / "volume_temp"
             volume_temp_dir.mkdir(exist_ok=True)
 
-            check_result = subprocess.run(
+            check_result = run_command(
                 [
                     "docker",
                     "ps",
@@ -227,8 +233,6 @@ class SupportPackageCreator:
                     "{{.Names}}",
                 ],
                 check=True,
-                capture_output=True,
-                text=True,
             )
 
             files_to_extract = ["config.ini"]
@@ -242,7 +246,7 @@ class SupportPackageCreator:
                 for file in files_to_extract:
                     try:
                         dest_path = volume_temp_dir / file
-                        copy_result = subprocess.run(
+                        copy_result = run_command(
                             [
                                 "docker",
                                 "cp",
@@ -250,8 +254,6 @@ class SupportPackageCreator:
                                 str(dest_path),
                             ],
                             check=True,
-                            capture_output=True,
-                            text=True,
                         )
 
                         if os.path.exists(dest_path):
@@ -274,7 +276,7 @@ class SupportPackageCreator:
 
                 temp_container = "temp_support_config_access"
 
-                check_result = subprocess.run(
+                check_result = run_command(
                     [
                         "docker",
                         "ps",
@@ -285,15 +287,13 @@ class SupportPackageCreator:
                         "{{.Names}}",
                     ],
                     check=True,
-                    capture_output=True,
-                    text=True,
                 )
 
                 if temp_container in check_result.stdout:
-                    subprocess.run(["docker", "rm", "-f", temp_container], check=True)
+                    run_command(["docker", "rm", "-f", temp_container], check=True)
 
                 try:
-                    create_result = subprocess.run(
+                    create_result = run_command(
                         [
                             "docker",
                             "create",
@@ -301,14 +301,12 @@ class SupportPackageCreator:
                             temp_container,
                             "-v",
                             "teddycloudstarter_config:/config",
-                            "nginx:stable-alpine",
+                            HELPER_IMAGE,
                         ],
                         check=True,
-                        capture_output=True,
-                        text=True,
                     )
                 except subprocess.CalledProcessError:
-                    create_result = subprocess.run(
+                    create_result = run_command(
                         [
                             "docker",
                             "create",
@@ -316,17 +314,15 @@ class SupportPackageCreator:
                             temp_container,
                             "-v",
                             "config:/config",
-                            "nginx:stable-alpine",
+                            HELPER_IMAGE,
                         ],
                         check=True,
-                        capture_output=True,
-                        text=True,
                     )
 
                 for file in files_to_extract:
                     try:
                         dest_path = volume_temp_dir / file
-                        copy_result = subprocess.run(
+                        copy_result = run_command(
                             [
                                 "docker",
                                 "cp",
@@ -334,8 +330,6 @@ class SupportPackageCreator:
                                 str(dest_path),
                             ],
                             check=True,
-                            capture_output=True,
-                            text=True,
                         )
 
                         if os.path.exists(dest_path):
@@ -348,7 +342,7 @@ class SupportPackageCreator:
                     except Exception:
                         pass
 
-                subprocess.run(["docker", "rm", "-f", temp_container], check=True)
+                run_command(["docker", "rm", "-f", temp_container], check=True)
 
         except Exception as e:
             console.print(
@@ -419,50 +413,10 @@ class SupportPackageCreator:
             logger.error(f"Error creating zip archive: {e}")
             raise
 
-    def _anonymize_text(self, text, patterns_and_replacements):
-        logger.debug("Anonymizing text with provided patterns.")
-        import re
-
-        anonymized = text
-        for pattern, replacement in patterns_and_replacements:
-            anonymized = re.sub(pattern, replacement, anonymized)
-
-        return anonymized
-
     def _anonymize_log_file(self, file_path):
         logger.debug(f"Anonymizing log file: {file_path}")
         try:
-            patterns = [
-                (r"\b(?:\d{1,3}\.){3}\d{1,3}\b", "xxx.xxx.xxx.xxx"),
-                (
-                    r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-                    "anonymized@email.com",
-                ),
-                (r"https?://([a-zA-Z0-9.-]+)", r"https://anonymized-domain.com"),
-                (r"\b([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})\b", "xx:xx:xx:xx:xx:xx"),
-                (
-                    r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b",
-                    "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx",
-                ),
-                (r"\b[A-Z0-9]{8,}\b", "ANONYMIZED-SERIAL"),
-                (
-                    r'\buser(?:name)?[:=]\s*["\'](.*?)["\']\b',
-                    r'username: "anonymized-user"',
-                ),
-                (
-                    r'\bhost(?:name)?[:=]\s*["\'](.*?)["\']\b',
-                    r'hostname: "anonymized-host"',
-                ),
-            ]
-
-            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                content = f.read()
-
-            anonymized_content = self._anonymize_text(content, patterns)
-
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(anonymized_content)
-
+            self.anonymizer.anonymize_file(file_path)
             logger.info(f"Log file anonymized: {file_path}")
         except Exception as e:
             console.print(
@@ -473,60 +427,7 @@ class SupportPackageCreator:
     def _anonymize_config_ini(self, file_path):
         logger.debug(f"Anonymizing config.ini file: {file_path}")
         try:
-            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
-
-            sensitive_fields = [
-                "mqtt.hostname",
-                "mqtt.username",
-                "mqtt.password",
-                "mqtt.identification",
-                "mqtt.topic",
-                "core.host_url",
-                "core.server.bind_ip",
-                "core.allowOrigin",
-                "core.flex_uid",
-                "cloud.remote_hostname",
-                "hass.name",
-                "hass.id",
-                "core.server_cert.data.ca",
-                "toniebox.field2",
-                "toniebox.field6",
-            ]
-
-            anonymized_lines = []
-            for line in lines:
-                if line.strip() == "" or line.strip().startswith(";"):
-                    anonymized_lines.append(line)
-                    continue
-
-                parts = line.split("=", 1)
-                if len(parts) == 2:
-                    field_name = parts[0].strip()
-
-                    should_anonymize = False
-                    for sensitive_field in sensitive_fields:
-                        if field_name.lower() == sensitive_field.lower():
-                            should_anonymize = True
-                            break
-
-                    if (
-                        field_name.startswith("core.server_cert.data.")
-                        or field_name.startswith("core.client_cert.data.")
-                        or ".key" in field_name
-                    ):
-                        should_anonymize = True
-
-                    if should_anonymize:
-                        anonymized_lines.append(f"{field_name}=ANONYMIZED\n")
-                    else:
-                        anonymized_lines.append(line)
-                else:
-                    anonymized_lines.append(line)
-
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.writelines(anonymized_lines)
-
+            self.anonymizer.anonymize_config_ini(file_path)
             console.print("[green]Successfully anonymized config.ini file[/]")
             logger.info(f"config.ini file anonymized: {file_path}")
         except Exception as e:
@@ -538,24 +439,7 @@ class SupportPackageCreator:
     def _anonymize_config_json(self, file_path):
         logger.debug(f"Anonymizing config.json file: {file_path}")
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
-
-            if "nginx" in config and "domain" in config["nginx"]:
-                config["nginx"]["domain"] = "anonymized-domain.com"
-
-            if "user_info" in config:
-                config["user_info"] = {
-                    "name": "Anonymized User",
-                    "email": "anonymized@email.com",
-                }
-
-            if "environment" in config and "hostname" in config["environment"]:
-                config["environment"]["hostname"] = "anonymized-hostname"
-
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2)
-
+            self.anonymizer.anonymize_config_json(file_path)
             logger.info(f"config.json file anonymized: {file_path}")
         except Exception as e:
             console.print(
@@ -7,6 +7,9 @@ import os
 import subprocess
 from typing import Any, Dict, List, Tuple
 
+from ..configuration.io_profile import DEFAULT_IO_PROFILE, IO_PROFILES, MEMORY_PATTERN
+from ..configuration.logging_profile import LOGGING_PROFILES
+from ..configuration.performance import PERFORMANCE_PROFILES
 from .network import validate_domain_name, validate_ip_address
 from .logger import logger
 
@@ -77,6 +80,38 @@ class ConfigValidator:
                 ).format(mode=config["mode"], valid_modes=", ".join(valid_modes))
             )
 
+        if config.get("logging_profile", "debug") not in LOGGING_PROFILES:
+            logger.warning(f"Invalid logging profile: {config['logging_profile']}")
+            errors.append(
+                self.translate(
+                    "Invalid logging profile: {profile}. Must be one of: {valid_profiles}"
+                ).format(
+                    profile=config["logging_profile"],
+                    valid_profiles=", ".join(LOGGING_PROFILES),
+                )
+            )
+
+        io_config = config.get("io", {})
+        if io_config.get("profile", DEFAULT_IO_PROFILE) not in IO_PROFILES:
+            logger.warning(f"Invalid I/O profile: {io_config['profile']}")
+            errors.append(
+                self.translate("Invalid I/O profile: {profile}").format(
+                    profile=io_config["profile"]
+                )
+            )
+        for service, limits in io_config.get("resource_limits", {}).items():
+            memory = str(limits.get("memory", "0"))
+            cpus = limits.get("cpus", 1)
+            if not MEMORY_PATTERN.match(memory) or not (
+                isinstance(cpus, (int, float)) and cpus > 0
+            ):
+                logger.warning(f"Invalid resource limits for {service}: {limits}")
+                errors.append(
+                    self.translate("Invalid resource limits for {service}").format(
+                        service=service
+                    )
+                )
+
         if config["mode"] == "direct":
             logger.debug("Validating direct mode configuration.")
             valid, mode_errors = self.validate_direct_mode(config)
@@ -175,6 +210,26 @@ class ConfigValidator:
                 )
             )
 
+        if nginx_config.get("performance_profile", "standard") not in PERFORMANCE_PROFILES:
+            logger.warning(
+                f"Invalid performance profile: {nginx_config['performance_profile']}"
+            )
+            errors.append(
+                self.translate("Invalid performance profile: {profile}").format(
+                    profile=nginx_config["performance_profile"]
+                )
+            )
+
+        keepalive = nginx_config.get("upstream_keepalive", 0)
+        # bool is an int subclass, but true/false is no pool size
+        if isinstance(keepalive, bool) or not isinstance(keepalive, int) or keepalive < 0:
+            logger.warning(f"Invalid upstream keepalive pool size: {keepalive}")
+            errors.append(
+                self.translate("Invalid upstream keepalive pool size: {size}").format(
+                    size=keepalive
+                )
+            )
+
         if "security" not in nginx_config:
             logger.warning("Nginx configuration requires security settings.")
             errors.append(
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Background cache warm-up for TeddyCloudStarter.
+While a menu waits for input, a single low-priority thread fills the caches
+that submenus read first (service status, certificate and backup listings),
+so they usually open without waiting for docker or OpenSSL.
+"""
+import collections
+import os
+import sys
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from .logger import logger
+
+# Niceness of the warm-up thread and the processes it starts (Linux only)
+WARMUP_NICENESS = 10
+
+
+def _lower_priority() -> None:
+    """Lower the scheduling priority of the calling thread where supported."""
+    # On Linux every thread has its own priority, inherited by child processes
+    if sys.platform.startswith("linux") and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), WARMUP_NICENESS)
+        except OSError as e:
+            logger.debug(f"Could not lower warm-up priority: {e}")
+
+
+def file_stamps(directory, suffix: str = "") -> Optional[Tuple]:
+    """
+    Stat the files in a directory to key a listing cache on.
+
+    Unlike the directory mtime, the stamps also change when a file is
+    overwritten in place. Nothing is created or modified.
+
+    Args:
+        directory: Directory to scan
+        suffix: Only include file names ending with this suffix
+
+    Returns:
+        Optional[Tuple]: Sorted (name, mtime_ns, size) tuples, or None if the
+            directory cannot be read
+    """
+    try:
+        with os.scandir(directory) as entries:
+            stamps = []
+            for entry in entries:
+                if not entry.name.endswith(suffix):
+                    continue
+                try:
+                    stat_result = entry.stat()
+                except OSError:
+                    continue
+                stamps.append(
+                    (entry.name, stat_result.st_mtime_ns, stat_result.st_size)
+                )
+    except OSError:
+        return None
+    return tuple(sorted(stamps))
+
+
+class WarmupScheduler:
+    """Runs warm-up tasks one at a time in a background thread."""
+
+    def __init__(self, max_pending: int = 8, delay: float = 0.2):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_pending: Maximum number of queued tasks; further ones are dropped
+            delay: Seconds to wait before the first task, so the menu renders first
+        """
+        self.max_pending = max_pending
+        self.delay = delay
+        self._queue = collections.deque()
+        self._pending = set()
+        self._thread: Optional[threading.Thread] = None
+        self._cancelled = threading.Event()
+        self._idle = threading.Condition()
+
+    def submit(self, name: str, func: Callable, *args, **kwargs) -> bool:
+        """
+        Queue a warm-up task.
+
+        Tasks only fill caches, their results are discarded. A task whose name
+        is already queued or running is not queued again.
+
+        Args:
+            name: Unique task name
+            func: Callable filling a cache
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            bool: True if the task was queued
+        """
+        with self._idle:
+            if name in self._pending or len(self._queue) >= self.max_pending:
+                return False
+            self._cancelled.clear()
+            self._queue.append((name, func, args, kwargs))
+            self._pending.add(name)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tcs-warmup", daemon=True
+                )
+                self._thread.start()
+        return True
+
+    def cancel(self) -> None:
+        """Drop all queued tasks; a running task finishes, but nothing follows it."""
+        with self._idle:
+            self._cancelled.set()
+            for name, *_ in self._queue:
+                self._pending.discard(name)
+            self._queue.clear()
+            self._idle.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no task is queued or running.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait indefinitely
+
+        Returns:
+            bool: True if idle, False on timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._thread is None, timeout)
+
+    def _run(self) -> None:
+        _lower_priority()
+        self._cancelled.wait(self.delay)
+        while True:
+            with self._idle:
+                if self._cancelled.is_set() or not self._queue:
+                    self._thread = None
+                    self._idle.notify_all()
+                    return
+                name, func, args, kwargs = self._queue.popleft()
+            start = time.perf_counter()
+            try:
+                func(*args, **kwargs)
+                logger.debug(f"Warm-up {name} took {time.perf_counter() - start:.2f}s")
+            except Exception as e:
+                logger.debug(f"Warm-up {name} failed: {e}")
+            finally:
+                with self._idle:
+                    self._pending.discard(name)
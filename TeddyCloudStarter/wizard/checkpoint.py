@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Setup wizard checkpoints for TeddyCloudStarter.
+Each completed wizard step is recorded together with content hashes of what
+it produced (configuration answers, key material, generated files, image IDs).
+If a setup is interrupted, the next launch resumes at the first step that was
+not completed or whose outputs changed since, instead of starting over.
+Within the deployment step, the HTTPS and security answers are recorded as
+they are given, so a failure in one does not repeat the key generation of the
+other.
+"""
+import datetime
+import hashlib
+import json
+import os
+import subprocess
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config_manager import DEFAULT_CONFIG_PATH, write_file_atomic
+from ..utilities.logger import logger
+from ..utilities.process import run_command
+
+CHECKPOINT_FILE = "setup_checkpoint.json"
+
+# Wizard steps in execution order; starting the services completes the setup
+SETUP_STEPS = ("project_path", "deployment", "configuration_files", "images")
+
+# Configuration keys set while selecting and configuring the deployment mode
+DEPLOYMENT_KEYS = ("mode", "ports", "nginx", "logging_profile", "io")
+
+
+def hash_file(path: str) -> Optional[str]:
+    """Return the SHA-256 of a file's content, None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_data(data: Any) -> str:
+    """Return the SHA-256 of JSON-serialisable data in canonical form."""
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Parts of the deployment step that produce key material, recorded as soon as
+# each is answered; a part whose files are unchanged is not asked again
+DEPLOYMENT_PARTS = ("https", "security")
+
+
+def _part_settings(part: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the nginx settings that select the key material of a part."""
+    nginx_config = config.get("nginx", {})
+    if part == "https":
+        # Server certificates are issued for the domain
+        return {
+            "domain": nginx_config.get("domain", ""),
+            "https_mode": nginx_config.get("https_mode", ""),
+        }
+    return {"security": {"type": nginx_config.get("security", {}).get("type", "")}}
+
+
+def _part_key_material(part: str, settings: Dict[str, Any], data_dir: str) -> List[str]:
+    """Return the key and credential files a deployment part produced."""
+    if part == "https":
+        if settings.get("https_mode") not in ("self_signed", "user_provided"):
+            return []
+        server_certs = os.path.join(data_dir, "server_certs")
+        return [os.path.join(server_certs, "server.crt"), os.path.join(server_certs, "server.key")]
+    security_type = settings.get("security", {}).get("type")
+    if security_type == "client_cert":
+        ca_dir = os.path.join(data_dir, "client_certs", "ca")
+        return [os.path.join(ca_dir, "ca.crt"), os.path.join(ca_dir, "ca.key")]
+    if security_type == "basic_auth":
+        return [os.path.join(data_dir, "security", ".htpasswd")]
+    return []
+
+
+def _key_material(config: Dict[str, Any], data_dir: str) -> List[str]:
+    """Return the key and credential files the deployment answers depend on."""
+    if config.get("mode") != "nginx":
+        return []
+    paths = []
+    for part in DEPLOYMENT_PARTS:
+        paths += _part_key_material(part, _part_settings(part, config), data_dir)
+    return paths
+
+
+def _data_dir(config: Dict[str, Any]) -> str:
+    return os.path.join(config.get("environment", {}).get("path") or "", "data")
+
+
+def image_ids(images: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Return the local image ID of each image.
+
+    Args:
+        images: Image references
+
+    Returns:
+        Dict[str, Optional[str]]: Image to ID, None if it is not present
+    """
+    ids = {}
+    for image in images:
+        try:
+            result = run_command(["docker", "image", "inspect", "--format", "{{.Id}}", image])
+            ids[image] = result.stdout.strip() if result.ok else None
+        except (OSError, subprocess.SubprocessError):
+            ids[image] = None
+    return ids
+
+
+def collect_outputs(
+    step: str, config: Dict[str, Any], recorded: Optional[Dict[str, Any]] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Hash the current outputs of a wizard step.
+
+    Args:
+        step: Step name from SETUP_STEPS
+        config: The configuration dictionary
+        recorded: Outputs recorded for the step, used for the image names
+
+    Returns:
+        Dict[str, Optional[str]]: Output name to content hash
+    """
+    data_dir = _data_dir(config)
+    if step == "project_path":
+        return {"path": hash_data(config.get("environment", {}).get("path") or "")}
+    if step == "deployment":
+        outputs = {"config": hash_data({key: config.get(key) for key in DEPLOYMENT_KEYS})}
+        outputs.update((path, hash_file(path)) for path in _key_material(config, data_dir))
+        return outputs
+    if step == "configuration_files":
+        from ..configuration.apply import render_artifacts
+
+        return {path: hash_file(path) for path in render_artifacts(config, data_dir)}
+    if step == "images":
+        return image_ids(recorded or {})
+    raise ValueError(f"Unknown setup step: {step}")
+
+
+class SetupCheckpoint:
+    """Checkpoint file of an unfinished setup wizard run."""
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            config_path: Path of the configuration file; the checkpoint is
+                stored next to it
+        """
+        self.path = os.path.join(os.path.dirname(config_path), CHECKPOINT_FILE)
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._parts: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._steps = data.get("steps", {})
+                self._parts = data.get("parts", {})
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Ignoring unreadable setup checkpoint {self.path}: {e}")
+
+    def exists(self) -> bool:
+        """Return True if an unfinished setup was recorded."""
+        return os.path.exists(self.path)
+
+    def _write(self) -> None:
+        write_file_atomic(
+            self.path, json.dumps({"steps": self._steps, "parts": self._parts}, indent=2)
+        )
+
+    def start(self) -> None:
+        """Mark a setup as in progress, keeping steps recorded earlier."""
+        self._write()
+
+    def resume_step(self, config: Dict[str, Any]) -> Optional[str]:
+        """
+        Find the first step that is not completed or whose outputs changed,
+        and forget it and every later step.
+
+        Args:
+            config: The current configuration dictionary
+
+        Returns:
+            Optional[str]: The step to resume at, None if all are completed
+        """
+        for index, step in enumerate(SETUP_STEPS):
+            recorded = self._steps.get(step, {}).get("outputs")
+            if recorded is None or collect_outputs(step, config, recorded) != recorded:
+                if recorded is not None:
+                    logger.info(f"Outputs of setup step {step} changed, repeating it.")
+                for later in SETUP_STEPS[index:]:
+                    self._steps.pop(later, None)
+                if index < SETUP_STEPS.index("deployment"):
+                    # The deployment parts belong to another project path
+                    self._parts = {}
+                return step
+        return None
+
+    def is_completed(self, step: str) -> bool:
+        """Return True if the step was recorded as completed."""
+        return step in self._steps
+
+    def record(self, step: str, config: Dict[str, Any], outputs: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a step as completed.
+
+        Args:
+            step: Step name from SETUP_STEPS
+            config: The configuration dictionary after the step
+            outputs: Output hashes, collected from the configuration if omitted
+        """
+        if outputs is None:
+            outputs = collect_outputs(step, config)
+        self._steps[step] = {
+            "outputs": outputs,
+            "completed": datetime.datetime.now().isoformat(),
+        }
+        self._write()
+        logger.debug(f"Setup step {step} recorded in {self.path}")
+
+    def record_part(self, part: str, config: Dict[str, Any]) -> None:
+        """
+        Record a part of the deployment step as answered.
+
+        Recorded outside the configuration transaction of the step, so the
+        answer and the hashes of its key material survive when a later part
+        fails.
+
+        Args:
+            part: Part name from DEPLOYMENT_PARTS
+            config: The configuration dictionary after the part
+        """
+        settings = _part_settings(part, config)
+        paths = _part_key_material(part, settings, _data_dir(config))
+        self._parts[part] = {
+            "settings": settings,
+            "outputs": {path: hash_file(path) for path in paths},
+        }
+        self._write()
+        logger.debug(f"Deployment part {part} recorded in {self.path}")
+
+    def restore_parts(self, config: Dict[str, Any]) -> List[str]:
+        """
+        Prepare the configuration for repeating the deployment step.
+
+        Answers of recorded parts whose key material is unchanged are put back,
+        so their prompts and key generation are skipped. The answers of all
+        other parts are cleared, so they are asked again.
+
+        Args:
+            config: The configuration dictionary, updated in place
+
+        Returns:
+            List[str]: The parts whose answers were restored
+        """
+        data_dir = _data_dir(config)
+        restored = []
+        for part in DEPLOYMENT_PARTS:
+            recorded = self._parts.get(part)
+            if recorded is not None:
+                settings = recorded.get("settings", {})
+                paths = _part_key_material(part, settings, data_dir)
+                if {path: hash_file(path) for path in paths} == recorded.get("outputs"):
+                    nginx_config = config.setdefault("nginx", {})
+                    for key, value in settings.items():
+                        if isinstance(value, dict):
+                            nginx_config.setdefault(key, {}).update(value)
+                        else:
+                            nginx_config[key] = value
+                    restored.append(part)
+                    continue
+                logger.info(f"Key material of deployment part {part} changed, asking again.")
+                del self._parts[part]
+            nginx_config = config.get("nginx")
+            if nginx_config:
+                if part == "https":
+                    nginx_config["https_mode"] = ""
+                else:
+                    nginx_config.setdefault("security", {})["type"] = ""
+        return restored
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the setup has finished."""
+        self._steps = {}
+        self._parts = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove setup checkpoint {self.path}: {e}")
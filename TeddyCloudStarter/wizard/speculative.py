@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Speculative background work for the setup wizard.
+Steps whose inputs are known before the user has answered every prompt
+(pulling the images of the selected mode, generating the RSA keys of the
+certificate authority and the certificates) run on a small low-priority pool
+while the remaining prompts are answered. When the wizard finishes, results
+the final configuration uses are kept and everything else is discarded.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from ..docker.images import ImageManager, required_images
+from ..utilities.logger import logger
+from ..utilities.process import run_command
+from ..utilities.warmup import _lower_priority
+
+# RSA key size per purpose, matching the sizes used when generating in place
+KEY_BITS = {"ca": 4096, "server": 2048, "client": 4096}
+
+SPECULATIVE_WORKERS = 3
+
+
+def _pull_image(image: str) -> bool:
+    """Pull an image unless it is present; True if it was pulled here."""
+    image_manager = ImageManager()
+    if image_manager.inspect(image) is not None:
+        return False
+    success, error = image_manager.pull(image)
+    if not success:
+        raise RuntimeError(error)
+    return True
+
+
+def _generate_key(path: str, bits: int) -> str:
+    """Generate an unencrypted RSA private key at path."""
+    result = run_command(
+        [
+            "openssl",
+            "genpkey",
+            "-algorithm",
+            "RSA",
+            "-pkeyopt",
+            f"rsa_keygen_bits:{bits}",
+            "-out",
+            path,
+        ]
+    )
+    if not result.ok:
+        raise RuntimeError(result.stderr.strip())
+    return path
+
+
+class SpeculativeSetup:
+    """Runs predictable setup steps ahead of the prompts that need them."""
+
+    def __init__(self, max_workers: int = SPECULATIVE_WORKERS):
+        """
+        Initialize the speculative setup.
+
+        Args:
+            max_workers: Maximum number of steps running at the same time
+        """
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._staging_dir: Optional[str] = None
+        self._images: Dict[str, Future] = {}
+        self._keys: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _submit(self, func: Callable, *args) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="tcs-speculative",
+                initializer=_lower_priority,
+            )
+        return self._executor.submit(func, *args)
+
+    def pull_images(self, images: Iterable[str]) -> None:
+        """
+        Start pulling images that are not present yet.
+
+        Args:
+            images: Image references; images already requested are skipped
+        """
+        with self._lock:
+            for image in images:
+                if image not in self._images:
+                    logger.debug(f"Speculatively pulling {image}")
+                    self._images[image] = self._submit(_pull_image, image)
+
+    def prepare_keys(self, purposes: Iterable[str]) -> None:
+        """
+        Start generating private keys in a private staging directory.
+
+        Args:
+            purposes: Key purposes from KEY_BITS; keys already requested are skipped
+        """
+        with self._lock:
+            if self._staging_dir is None:
+                self._staging_dir = tempfile.mkdtemp(prefix="tcs-keys-")
+            for purpose in purposes:
+                if purpose not in self._keys:
+                    logger.debug(f"Speculatively generating {purpose} key")
+                    path = os.path.join(self._staging_dir, f"{purpose}.key")
+                    self._keys[purpose] = self._submit(
+                        _generate_key, path, KEY_BITS[purpose]
+                    )
+
+    def take_key(self, purpose: str) -> Optional[str]:
+        """
+        Hand over a prepared key, waiting for it if it is being generated.
+
+        Used as CertificateAuthority.key_provider. The caller owns the
+        returned file and must move it out of the staging directory.
+
+        Args:
+            purpose: Key purpose from KEY_BITS
+
+        Returns:
+            Optional[str]: Path of the key, None if no key was prepared
+        """
+        with self._lock:
+            future = self._keys.pop(purpose, None)
+        # A key that has not started yet is not worth waiting for
+        if future is None or future.cancel():
+            return None
+        try:
+            path = future.result()
+        except (OSError, subprocess.SubprocessError, RuntimeError) as e:
+            logger.debug(f"Speculative {purpose} key failed: {e}")
+            return None
+        logger.info(f"Using speculatively generated {purpose} key.")
+        return path
+
+    def finish(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Keep the results the final configuration uses and discard the rest.
+
+        Unused keys are deleted and images pulled here that the configuration
+        does not use are removed again, once their pull has finished.
+
+        Args:
+            config: The final configuration, None to discard everything
+        """
+        with self._lock:
+            keys, self._keys = self._keys, {}
+            images, self._images = self._images, {}
+            staging_dir, self._staging_dir = self._staging_dir, None
+            executor, self._executor = self._executor, None
+        needed = required_images(config) if config else set()
+        for image, future in images.items():
+            if image in needed or future.cancel():
+                continue
+            future.add_done_callback(
+                lambda done, image=image: self._discard_image(image, done)
+            )
+        for future in keys.values():
+            future.cancel()
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        if executor is not None:
+            executor.shutdown(wait=False)
+        logger.debug(
+            f"Speculative setup finished, kept images: {sorted(needed & set(images))}"
+        )
+
+    @staticmethod
+    def _discard_image(image: str, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None or not future.result():
+            return
+        try:
+            run_command(["docker", "image", "rm", image])
+            logger.debug(f"Removed speculatively pulled image {image}")
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Could not remove speculatively pulled image {image}: {e}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the support package anonymizer against synthetic nginx stream logs.
+Run from the repository root: python benchmarks/anonymizer_benchmark.py --size-mb 300
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TeddyCloudStarter.utilities.anonymizer import Anonymizer  # noqa: E402
+
+
+def _random_line(rng, macs, ips):
+    """Build one line in the nginx-auth stream_detailed log format."""
+    return (
+        f"nginx-auth  | StreamLog: {rng.choice(ips)} [19/Oct/2026:10:12:{rng.randint(10, 59)} +0000] "
+        f"TCP 200 {rng.randint(100, 90000)} {rng.randint(100, 9000)} "
+        f"{rng.random() * 100:.3f} TLSv1.2 ECDHE-RSA-AES128-GCM-SHA256 "
+        f"FP={rng.getrandbits(160):040x} MAC={rng.choice(macs)} REJ=0 "
+        f"BACKEND=authorized_backend VERIFY=SUCCESS "
+        f"SESSION_ID={rng.getrandbits(256):064X} SESSION_REUSE=. "
+        f"CLIENT_STATUS=client_authorized CLIENT_DN=CN=b'{rng.choice(macs)}' "
+        f"CLIENT_SN={rng.getrandbits(64):016X} host=\"https://prod.de.tbs.toys\"\n"
+    )
+
+
+def generate_log(path, size_mb, seed=42):
+    """Write a synthetic stream log of roughly size_mb megabytes."""
+    rng = random.Random(seed)
+    macs = [
+        ":".join(f"{rng.randint(0, 255):02x}" for _ in range(6)) for _ in range(200)
+    ]
+    ips = [f"192.168.{rng.randint(0, 255)}.{rng.randint(1, 254)}" for _ in range(500)]
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            line = _random_line(rng, macs, ips)
+            f.write(line)
+            written += len(line)
+    return written
+
+
+def run_benchmark(size_mb):
+    """Generate a log file, anonymize it and print the throughput."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, "nginx-auth.log")
+        print(f"Generating {size_mb} MB of synthetic nginx stream logs...")
+        size = generate_log(log_path, size_mb)
+
+        anonymizer = Anonymizer()
+        start = time.perf_counter()
+        lines = anonymizer.anonymize_file(log_path)
+        elapsed = time.perf_counter() - start
+
+        print(f"Lines:        {lines}")
+        print(f"Replacements: {anonymizer.replacement_count}")
+        print(f"Elapsed:      {elapsed:.2f} s")
+        print(f"Throughput:   {size / (1024 * 1024) / elapsed:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size-mb", type=int, default=300, help="Size of the generated log in MB"
+    )
+    run_benchmark(parser.parse_args().size_mb)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the nginx-auth box routing (extended nginx mode) with many boxes.
+Starts the generated nginx-auth configuration and a TLS stub for TeddyCloud in
+Docker, then measures connections per second through port 9443.
+Run from the repository root: python benchmarks/box_routing_benchmark.py --boxes 10 100 1000
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import shutil
+import socket
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TeddyCloudStarter.configuration.generator import render_nginx_configs  # noqa: E402
+from TeddyCloudStarter.configurations import TEMPLATES  # noqa: E402
+from TeddyCloudStarter.utilities.process import run_command  # noqa: E402
+
+NETWORK = "tcs-bench"
+UPSTREAM = "tcs-bench-teddycloud"
+AUTH = "tcs-bench-nginx-auth"
+
+# Stands in for TeddyCloud: accepts the box certificate and answers at once
+UPSTREAM_CONF = """events {}
+stream {
+    server {
+        listen 443 ssl;
+        ssl_certificate /certs/server/teddy-cert.nginx.pem;
+        ssl_certificate_key /certs/server/teddy-key.nginx.pem;
+        ssl_verify_client optional_no_ca;
+        return "ok";
+    }
+}
+http {
+    server {
+        listen 80;
+        return 200 "ok";
+    }
+}
+"""
+
+
+def _openssl(*args):
+    run_command(["openssl", *args], check=True)
+
+
+def _self_signed(cert_path, key_path, subject, serial=1):
+    _openssl(
+        "req", "-x509", "-new", "-key", key_path, "-out", cert_path,
+        "-subj", subject, "-days", "30", "-set_serial", str(serial),
+    )
+
+
+def prepare_certificates(work_dir, box_count):
+    """
+    Create server credentials, one upstream credential directory per box and
+    one client certificate per box.
+
+    Returns:
+        tuple: List of (fingerprint, mac, cert_path) per box, and the shared key
+    """
+    certs = os.path.join(work_dir, "certs")
+    server = os.path.join(certs, "server")
+    os.makedirs(server)
+    key = os.path.join(work_dir, "ec.key")
+    _openssl("ecparam", "-name", "prime256v1", "-genkey", "-noout", "-out", key)
+
+    server_cert = os.path.join(server, "teddy-cert.nginx.pem")
+    _self_signed(server_cert, key, "/CN=teddycloud")
+    shutil.copyfile(key, os.path.join(server, "teddy-key.nginx.pem"))
+    # nginx-auth's HTTP server expects the certificate under these names
+    shutil.copyfile(server_cert, os.path.join(server, "server.crt"))
+    shutil.copyfile(key, os.path.join(server, "server.key"))
+    os.makedirs(os.path.join(certs, "client"))
+    shutil.copyfile(server_cert, os.path.join(certs, "client", "ca_chain.pem"))
+
+    boxes = []
+    for index in range(box_count):
+        mac = f"{index + 1:012x}"
+        box_dir = os.path.join(certs, "client", mac)
+        os.makedirs(box_dir)
+        # Separate files per box so nginx has to load each box's credentials
+        shutil.copyfile(server_cert, os.path.join(box_dir, "client.pem"))
+        shutil.copyfile(key, os.path.join(box_dir, "private.pem"))
+
+        box_cert = os.path.join(work_dir, f"box-{mac}.crt")
+        _self_signed(box_cert, key, f"/CN={mac}", serial=index + 2)
+        with open(box_cert, "r", encoding="utf-8") as f:
+            der = ssl.PEM_cert_to_DER_cert(f.read())
+        boxes.append((hashlib.sha1(der).hexdigest(), mac, box_cert))
+    return boxes, key
+
+
+def render_auth_config(work_dir, boxes, cache):
+    """Render nginx-auth.conf for the given boxes."""
+    config = {
+        "mode": "nginx",
+        "nginx": {
+            "domain": "teddycloud.local",
+            "https_mode": "self_signed",
+            "nginx_type": "extended",
+            "performance_profile": "standard",
+            "security": {"type": "none", "allowed_ips": [], "auth_bypass_ips": []},
+        },
+        "boxes": [{"crt_fingerprint": fp, "macaddress": mac} for fp, mac, _ in boxes],
+    }
+    content = render_nginx_configs(config, TEMPLATES, work_dir)["nginx-auth.conf"]
+    if not cache:
+        content = re.sub(
+            r"proxy_ssl_certificate_cache [^;]*;", "proxy_ssl_certificate_cache off;", content
+        )
+    path = os.path.join(work_dir, "nginx-auth.conf")
+    with open(path, "w", newline="\n") as f:
+        f.write(content)
+    upstream_path = os.path.join(work_dir, "upstream.conf")
+    with open(upstream_path, "w", newline="\n") as f:
+        f.write(UPSTREAM_CONF)
+    return path, upstream_path
+
+
+def _docker(*args, check=True):
+    return run_command(["docker", *args], check=check, timeout=300)
+
+
+def start_containers(work_dir, auth_conf, upstream_conf, image, port):
+    """Start the TeddyCloud stub and nginx-auth on a private network."""
+    certs = os.path.join(work_dir, "certs")
+    _docker("network", "create", NETWORK)
+    _docker(
+        "run", "-d", "--name", UPSTREAM, "--network", NETWORK,
+        "--network-alias", "teddycloud-app",
+        "-v", f"{upstream_conf}:/etc/nginx/nginx.conf:ro",
+        "-v", f"{certs}:/certs:ro",
+        image,
+    )
+    _docker(
+        "run", "-d", "--name", AUTH, "--network", NETWORK,
+        "-p", f"127.0.0.1:{port}:9443",
+        "-v", f"{auth_conf}:/etc/nginx/nginx.conf:ro",
+        "-v", f"{certs}:/teddycloud/certs:ro",
+        "-v", f"{os.path.join(certs, 'server')}:/etc/nginx/certificates:ro",
+        image,
+    )
+
+
+def stop_containers():
+    """Remove the benchmark containers and network."""
+    _docker("rm", "-f", AUTH, UPSTREAM, check=False)
+    _docker("network", "rm", NETWORK, check=False)
+
+
+def _client_contexts(boxes, key):
+    contexts = []
+    for _, _, cert in boxes:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        context.set_ciphers("ALL:@SECLEVEL=0")
+        context.load_cert_chain(cert, key)
+        contexts.append(context)
+    return contexts
+
+
+def _connect(context, port):
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        with context.wrap_socket(sock) as tls:
+            data = b""
+            while True:
+                chunk = tls.recv(64)
+                if not chunk:
+                    break
+                data += chunk
+    return data == b"ok"
+
+
+def wait_until_ready(contexts, port, timeout=30.0):
+    """Wait until a connection through nginx-auth reaches the stub."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if _connect(contexts[0], port):
+                return True
+        except OSError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def run_load(contexts, port, duration, concurrency, seed=42):
+    """Open connections with random box certificates for duration seconds."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(worker_id):
+        rng = random.Random(seed + worker_id)
+        local, failed = [], 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = _connect(rng.choice(contexts), port)
+            except OSError:
+                ok = False
+            if ok:
+                local.append(time.perf_counter() - start)
+            else:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - start
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_benchmark(box_counts, duration, concurrency, image, cache):
+    """Benchmark every box count and print connections per second."""
+    print(f"{'Boxes':>6} {'Cache':>6} {'Conn/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'Errors':>7}")
+    for box_count in box_counts:
+        with tempfile.TemporaryDirectory() as work_dir:
+            boxes, key = prepare_certificates(work_dir, box_count)
+            auth_conf, upstream_conf = render_auth_config(work_dir, boxes, cache)
+            contexts = _client_contexts(boxes, key)
+            port = _free_port()
+            stop_containers()
+            try:
+                start_containers(work_dir, auth_conf, upstream_conf, image, port)
+                if not wait_until_ready(contexts, port):
+                    logs = _docker("logs", AUTH, check=False)
+                    print(f"nginx-auth did not become ready:\n{logs.stdout}{logs.stderr}")
+                    continue
+                latencies, errors, elapsed = run_load(contexts, port, duration, concurrency)
+            finally:
+                stop_containers()
+        if latencies:
+            latencies.sort()
+            p50 = statistics.median(latencies) * 1000
+            p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+        else:
+            p50 = p95 = 0.0
+        print(
+            f"{box_count:>6} {'on' if cache else 'off':>6} {len(latencies) / elapsed:>9.1f} "
+            f"{p50:>8.2f} {p95:>8.2f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--boxes", type=int, nargs="+", default=[10, 100, 1000],
+        help="Numbers of registered boxes to benchmark",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallel clients")
+    parser.add_argument("--image", default="nginx:1.28-alpine", help="nginx image")
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Disable the upstream certificate cache for comparison",
+    )
+    args = parser.parse_args()
+    run_benchmark(args.boxes, args.duration, args.concurrency, args.image, not args.no_cache)
@@ -0,0 +1,57 @@
+"""Tests for the support package anonymizer."""
+
+import io
+import tracemalloc
+
+import pytest
+
+from TeddyCloudStarter.utilities.anonymizer import Anonymizer
+
+pytestmark = pytest.mark.unit
+
+
+def test_pseudonyms_are_stable_and_case_insensitive():
+    anonymizer = Anonymizer()
+    first = anonymizer.anonymize_text("from 192.168.1.10 mac AA:BB:CC:DD:EE:FF")
+    second = anonymizer.anonymize_text("to 192.168.1.10 mac aa:bb:cc:dd:ee:ff")
+    assert "192.168.1.10" not in first
+    assert first.split()[1] == second.split()[1]
+    assert first.split()[3] == second.split()[3]
+
+
+def test_tokens_depend_on_the_key_and_kind():
+    assert Anonymizer(b"a").pseudonym("ipv4", "10.0.0.1") == Anonymizer(b"a").pseudonym(
+        "ipv4", "10.0.0.1"
+    )
+    assert Anonymizer(b"a").pseudonym("ipv4", "10.0.0.1") != Anonymizer(b"b").pseudonym(
+        "ipv4", "10.0.0.1"
+    )
+    anonymizer = Anonymizer(b"a")
+    assert (
+        anonymizer.pseudonym("user", "x")[5:] != anonymizer.pseudonym("host", "x")[5:]
+    )
+
+
+def test_url_and_quoted_values_keep_their_syntax():
+    anonymizer = Anonymizer(b"k")
+    text = anonymizer.anonymize_text("GET https://box.example.com/x username='alice'")
+    assert text.startswith("GET https://domain-")
+    assert ".invalid/x username='user-" in text
+    assert "alice" not in text and "example" not in text
+
+
+def test_memory_does_not_grow_with_distinct_values():
+    anonymizer = Anonymizer()
+    source = io.StringIO(
+        "".join(
+            f"session {n:010d}ABCDEF client 10.{n % 256}.{n // 256 % 256}.1\n"
+            for n in range(20000)
+        )
+    )
+    tracemalloc.start()
+    anonymizer.anonymize_stream(source, io.StringIO())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The output buffer dominates; a pseudonym table would add several MB
+    assert peak < 4 * 1024 * 1024
+    assert anonymizer.replacement_count == 40000
@@ -0,0 +1,94 @@
+"""Tests for the indexed Toniebox registry."""
+
+import pytest
+
+from TeddyCloudStarter.configuration.box_registry import (
+    BoxRegistry,
+    normalize_fingerprint,
+    normalize_mac,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_normalisation():
+    assert normalize_mac("AA:BB-cc.DD EE:ff") == "aabbccddeeff"
+    assert normalize_mac(None) == ""
+    assert normalize_fingerprint(" AB:cd:EF ") == "abcdef"
+
+
+def test_accepts_list_and_dict_and_skips_boxes_without_mac():
+    boxes = [{"macaddress": "AA:BB:CC:DD:EE:01"}, {"boxName": "no mac"}]
+    assert [box["macaddress"] for box in BoxRegistry(boxes)] == ["aabbccddee01"]
+    registry = BoxRegistry({"one": {"macaddress": "aabbccddee01"}})
+    assert "AA:BB:CC:DD:EE:01" in registry
+    assert len(BoxRegistry(None)) == 0
+
+
+def test_duplicate_macs_are_merged_into_the_first():
+    registry = BoxRegistry(
+        [
+            {"macaddress": "aabbccddee01", "boxName": "old", "boxModel": "x"},
+            {"macaddress": "AA:BB:CC:DD:EE:01", "boxName": "new"},
+        ]
+    )
+    assert registry.to_list() == [
+        {"macaddress": "aabbccddee01", "boxName": "new", "boxModel": "x"}
+    ]
+
+
+def test_lookup_by_fingerprint_follows_updates_and_removal():
+    registry = BoxRegistry([{"macaddress": "aabbccddee01", "crt_fingerprint": "AA:01"}])
+    assert registry.find_by_fingerprint("aa01")["macaddress"] == "aabbccddee01"
+
+    registry.update("aabbccddee01", {"crt_fingerprint": "bb02"})
+    assert registry.find_by_fingerprint("aa01") is None
+    assert registry.find_by_fingerprint("BB:02")["macaddress"] == "aabbccddee01"
+
+    assert registry.remove("AA:BB:CC:DD:EE:01")
+    assert not registry.remove("aabbccddee01")
+    assert registry.find_by_fingerprint("bb02") is None
+
+
+def test_add_rejects_missing_and_duplicate_macs():
+    registry = BoxRegistry([{"macaddress": "aabbccddee01"}])
+    with pytest.raises(ValueError):
+        registry.add({"boxName": "no mac"})
+    with pytest.raises(ValueError):
+        registry.add({"macaddress": "AA:BB:CC:DD:EE:01"})
+
+
+def test_update_adds_unknown_box_and_ignores_mac_field():
+    registry = BoxRegistry()
+    registry.update("AA:BB:CC:DD:EE:02", {"macaddress": "ignored", "boxName": "b"})
+    assert registry.get("aabbccddee02") == {
+        "macaddress": "aabbccddee02",
+        "boxName": "b",
+    }
+    registry.update("aabbccddee02", {"macaddress": "ignored"})
+    assert registry.get("aabbccddee02")["macaddress"] == "aabbccddee02"
+
+
+def test_render_view_keeps_box_order_and_last_owner_of_a_fingerprint():
+    registry = BoxRegistry(
+        [
+            {"macaddress": "aabbccddee01", "crt_fingerprint": "ff"},
+            {"macaddress": "aabbccddee02"},
+            {"macaddress": "aabbccddee03", "crt_fingerprint": "01"},
+            {"macaddress": "aabbccddee04", "crt_fingerprint": "FF"},
+        ]
+    )
+    assert registry.render_view == [("01", "aabbccddee03"), ("ff", "aabbccddee04")]
+    assert registry.render_view is registry.render_view
+
+    registry.remove("aabbccddee04")
+    assert registry.render_view == [("ff", "aabbccddee01"), ("01", "aabbccddee03")]
+
+
+def test_store_writes_copies():
+    registry = BoxRegistry([{"macaddress": "aabbccddee01", "tags": ["a"]}])
+    config = {}
+    registry.store(config)
+    config["boxes"][0]["tags"].append("b")
+    assert registry.get("aabbccddee01")["tags"] == ["a"]
+    assert BoxRegistry.from_config(config).get("aabbccddee01")["tags"] == ["a", "b"]
@@ -0,0 +1,87 @@
+"""Tests for the setup wizard checkpoint."""
+
+import pytest
+
+from TeddyCloudStarter.wizard.checkpoint import SetupCheckpoint, collect_outputs
+
+pytestmark = pytest.mark.unit
+
+
+def _config(project_path, **nginx):
+    config = {"environment": {"path": str(project_path)}, "mode": "nginx"}
+    if nginx:
+        config["nginx"] = nginx
+    return config
+
+
+def _server_certs(project_path):
+    server_certs = project_path / "data" / "server_certs"
+    server_certs.mkdir(parents=True)
+    (server_certs / "server.crt").write_text("certificate")
+    (server_certs / "server.key").write_text("key")
+    return server_certs
+
+
+def test_restore_parts_keeps_https_answer_when_security_failed(tmp_path):
+    _server_certs(tmp_path)
+    checkpoint = SetupCheckpoint(str(tmp_path / "config.json"))
+    answered = _config(
+        tmp_path,
+        domain="box.local",
+        https_mode="self_signed",
+        security={"type": "basic_auth"},
+    )
+    checkpoint.record_part("https", answered)
+
+    # The security part failed, so its transaction was rolled back
+    reloaded = SetupCheckpoint(str(tmp_path / "config.json"))
+    config = _config(tmp_path)
+    assert reloaded.restore_parts(config) == ["https"]
+    assert config["nginx"]["domain"] == "box.local"
+    assert config["nginx"]["https_mode"] == "self_signed"
+    assert config["nginx"]["security"]["type"] == ""
+
+
+def test_restore_parts_asks_again_when_key_material_changed(tmp_path):
+    server_certs = _server_certs(tmp_path)
+    htpasswd = tmp_path / "data" / "security" / ".htpasswd"
+    htpasswd.parent.mkdir(parents=True)
+    htpasswd.write_text("user:hash")
+    checkpoint = SetupCheckpoint(str(tmp_path / "config.json"))
+    config = _config(
+        tmp_path,
+        domain="box.local",
+        https_mode="self_signed",
+        security={"type": "basic_auth"},
+    )
+    checkpoint.record_part("https", config)
+    checkpoint.record_part("security", config)
+
+    (server_certs / "server.key").write_text("replaced key")
+    assert checkpoint.restore_parts(config) == ["security"]
+    assert config["nginx"]["https_mode"] == ""
+    assert config["nginx"]["security"]["type"] == "basic_auth"
+
+
+def test_resume_before_deployment_forgets_parts(tmp_path):
+    _server_certs(tmp_path)
+    checkpoint = SetupCheckpoint(str(tmp_path / "config.json"))
+    config = _config(tmp_path, domain="box.local", https_mode="self_signed")
+    checkpoint.record_part("https", config)
+
+    assert checkpoint.resume_step(config) == "project_path"
+    assert checkpoint.restore_parts(config) == []
+    assert config["nginx"]["https_mode"] == ""
+
+
+def test_deployment_outputs_hash_key_material_of_both_parts(tmp_path):
+    _server_certs(tmp_path)
+    config = _config(
+        tmp_path,
+        domain="box.local",
+        https_mode="self_signed",
+        security={"type": "client_cert"},
+    )
+    outputs = collect_outputs("deployment", config)
+    names = sorted(path.rsplit("/", 1)[-1] for path in outputs if path != "config")
+    assert names == ["ca.crt", "ca.key", "server.crt", "server.key"]
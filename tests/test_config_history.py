@@ -0,0 +1,88 @@
+"""Tests for the compressed configuration history."""
+
+import json
+
+import pytest
+
+from TeddyCloudStarter.config_history import ConfigHistory
+
+pytestmark = pytest.mark.unit
+
+
+def _config(**values):
+    config = {"version": "0.6.1", "mode": "direct", "last_modified": "now"}
+    config.update(values)
+    return config
+
+
+def test_record_skips_unchanged_snapshot(tmp_path):
+    history = ConfigHistory(tmp_path / "config.json")
+    first = history.record(_config())
+    second = history.record(_config(last_modified="later"))
+    assert first is second
+    assert len(history.entries()) == 1
+
+
+def test_record_lists_changed_keys_and_loads_snapshot(tmp_path):
+    history = ConfigHistory(tmp_path / "config.json")
+    history.record(_config())
+    entry = history.record(_config(mode="nginx"))
+    assert entry["changed_keys"] == ["mode"]
+    assert history.entries()[0]["id"] == entry["id"]
+    assert history.load(entry["id"])["mode"] == "nginx"
+    assert history.diff_keys(entry["id"], _config()) == ["mode"]
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    history = ConfigHistory(tmp_path / "config.json")
+    history.record(_config())
+    history.record(_config(mode="nginx"))
+    history.record(_config())
+    assert len(history.entries()) == 3
+    assert len(list(history.objects_dir.iterdir())) == 2
+
+
+def test_retention_drops_oldest_entries_and_objects(tmp_path):
+    history = ConfigHistory(tmp_path / "config.json", limit=2)
+    for port in range(4):
+        history.record(_config(ports={"teddycloud": port}))
+    entries = history.entries()
+    assert [history.load(e["id"])["ports"]["teddycloud"] for e in entries] == [3, 2]
+    assert len(list(history.objects_dir.iterdir())) == 2
+
+
+def test_unknown_entry_raises_key_error(tmp_path):
+    history = ConfigHistory(tmp_path / "config.json")
+    with pytest.raises(KeyError):
+        history.load("missing")
+
+
+def test_legacy_backups_are_migrated_then_limited_on_next_record(tmp_path):
+    for timestamp in (100, 200, 300):
+        backup = tmp_path / f"config.json.backup.{timestamp}"
+        backup.write_text(json.dumps(_config(ports={"teddycloud": timestamp})))
+
+    history = ConfigHistory(tmp_path / "config.json", limit=2)
+    entries = history.entries()
+
+    assert [entry["timestamp"] for entry in entries] == [300, 200, 100]
+    assert not list(tmp_path.glob("config.json.backup.*"))
+    assert len(json.loads(history.index_path.read_text())) == 3
+
+    entry = history.record(_config(mode="nginx"))
+    assert [e["id"] for e in history.entries()] == [entry["id"], entries[0]["id"]]
+    assert len(list(history.objects_dir.iterdir())) == 2
+
+
+def test_legacy_backups_are_kept_if_the_index_cannot_be_written(tmp_path, monkeypatch):
+    backup = tmp_path / "config.json.backup.100"
+    backup.write_text(json.dumps(_config()))
+    history = ConfigHistory(tmp_path / "config.json")
+
+    def fail():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(history, "_write_index", fail)
+    with pytest.raises(OSError):
+        history.entries()
+    assert backup.exists()
@@ -0,0 +1,97 @@
+"""Tests for the shared configuration store, journal and transactions."""
+
+import json
+import threading
+
+import pytest
+
+from TeddyCloudStarter import config_manager
+from TeddyCloudStarter.config_manager import GENERATION_KEY, ConfigManager
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def manager(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"app_settings": {"config_journal": True}, "x": 0}))
+    return ConfigManager(config_path=str(path))
+
+
+def test_saves_are_journaled_and_replayed(manager):
+    for value in (1, 2):
+        manager.config["x"] = value
+        manager.save()
+    journal = manager._store.journal_path
+    assert [json.loads(line)["generation"] for line in open(journal)] == [1, 2]
+    assert json.loads(open(manager.config_path).read())["x"] == 0
+    assert manager.reload()["x"] == 2
+
+
+def test_stale_journal_is_not_replayed_over_newer_config(manager, monkeypatch):
+    monkeypatch.setattr(config_manager, "JOURNAL_COMPACT_ENTRIES", 2)
+    for value in (1, 2):
+        manager.config["x"] = value
+        manager.save()
+
+    # The full save writes config.json, then crashes before removing the journal
+    def crash(path):
+        raise OSError("crashed")
+
+    monkeypatch.setattr(config_manager.os, "remove", crash)
+    manager.config["x"] = 3
+    with pytest.raises(OSError):
+        manager.save()
+    monkeypatch.undo()
+
+    config = manager.reload()
+    assert config["x"] == 3
+    assert config[GENERATION_KEY] == 3
+
+
+def test_transaction_defers_saves_of_its_own_thread_only(manager):
+    saved_in_thread = []
+
+    def background_save():
+        manager.config["y"] = "background"
+        manager.save()
+        with open(manager._store.journal_path) as journal:
+            saved_in_thread.extend(json.loads(line)["set"].get("y") for line in journal)
+
+    with manager.transaction() as config:
+        config["x"] = 10
+        manager.save()
+        thread = threading.Thread(target=background_save)
+        thread.start()
+        thread.join()
+        assert manager._store.in_transaction
+
+    assert saved_in_thread == ["background"]
+    assert manager.reload()["x"] == 10
+
+
+def test_failed_transaction_rolls_back(manager):
+    with pytest.raises(RuntimeError):
+        with manager.transaction() as config:
+            config["x"] = 5
+            manager.save()
+            raise RuntimeError
+    assert manager.config["x"] == 0
+    assert not manager._store.in_transaction
+
+
+def test_restore_reports_the_failure_reason(manager):
+    success, error = manager.restore("missing")
+    assert not success
+    assert "missing" in error and "does not exist" in error
+
+
+def test_restore_brings_back_a_recorded_entry(manager):
+    manager.config["x"] = 1
+    manager.save()
+    manager.backup()
+    entry_id = manager.history().entries()[0]["id"]
+    manager.config["x"] = 2
+    manager.save()
+    assert manager.restore(entry_id) == (True, "")
+    assert manager.config["x"] == 1
@@ -0,0 +1,101 @@
+"""Tests for IP address normalisation and merging."""
+
+import ipaddress
+import random
+
+import pytest
+
+from TeddyCloudStarter.utilities.network import collapse_ip_networks, parse_ip_entries
+
+pytestmark = pytest.mark.unit
+
+
+def _reference(entries):
+    """Collapse entries with the ipaddress module, formatted like collapse_ip_networks."""
+    networks = [ipaddress.ip_network(entry, strict=False) for entry in entries]
+    result = []
+    for version in (4, 6):
+        collapsed = ipaddress.collapse_addresses(
+            n for n in networks if n.version == version
+        )
+        for network in sorted(collapsed):
+            if network.prefixlen == network.max_prefixlen:
+                result.append(str(network.network_address))
+            else:
+                result.append(str(network))
+    return result
+
+
+def _random_entries(rng, count):
+    """Random entries in small address spaces, so many of them overlap or touch."""
+    entries = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            address = ipaddress.IPv4Address(0x0A000000 + rng.randrange(1 << 12))
+            prefix = rng.randint(20, 32)
+        else:
+            address = ipaddress.IPv6Address(
+                (0x2001_0DB8 << 96) + rng.randrange(1 << 12)
+            )
+            prefix = rng.randint(116, 128)
+        entries.append(
+            str(address)
+            if prefix == address.max_prefixlen and rng.random() < 0.5
+            else f"{address}/{prefix}"
+        )
+    return entries
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_matches_ipaddress_collapse_addresses(seed):
+    rng = random.Random(seed)
+    entries = _random_entries(rng, rng.randint(1, 300))
+    collapsed, invalid = collapse_ip_networks(entries)
+    assert invalid == []
+    assert collapsed == _reference(entries)
+
+
+def test_adjacent_ranges_are_merged_and_host_bits_cleared():
+    collapsed, _ = collapse_ip_networks(
+        ["192.168.1.7/24", "192.168.0.0/24", "10.0.0.1", "10.0.0.0/31", "::1"]
+    )
+    assert collapsed == ["10.0.0.0/31", "192.168.0.0/23", "::1"]
+
+
+def test_unaligned_range_is_split_into_fewest_networks():
+    collapsed, _ = collapse_ip_networks(["10.0.0.1", "10.0.0.2/31", "10.0.0.4/30"])
+    assert collapsed == ["10.0.0.1", "10.0.0.2/31", "10.0.0.4/30"]
+    assert collapsed == _reference(["10.0.0.1", "10.0.0.2/31", "10.0.0.4/30"])
+
+
+def test_whole_address_space():
+    assert collapse_ip_networks(["0.0.0.0/0", "1.2.3.4", "::/0"])[0] == [
+        "0.0.0.0/0",
+        "::/0",
+    ]
+
+
+def test_invalid_entries_are_reported():
+    collapsed, invalid = collapse_ip_networks(
+        ["10.0.0.1", "300.1.1.1", "10.0.0.0/33", "host", " ", "fe80::1/129"]
+    )
+    assert collapsed == ["10.0.0.1"]
+    assert invalid == ["300.1.1.1", "10.0.0.0/33", "host", "fe80::1/129"]
+
+
+def test_parse_ip_entries_splits_text_and_csv():
+    lines = [
+        "ip,comment\n",
+        '"10.0.0.1","office" # main\n',
+        "10.0.0.2; 10.0.0.3\t::1\n",
+        "# only a comment\n",
+    ]
+    assert parse_ip_entries(lines) == [
+        "ip",
+        "comment",
+        "10.0.0.1",
+        "office",
+        "10.0.0.2",
+        "10.0.0.3",
+        "::1",
+    ]
@@ -0,0 +1,158 @@
+"""Tests for the dependency-aware service scheduler."""
+
+import pytest
+
+from TeddyCloudStarter.docker import scheduler
+from TeddyCloudStarter.docker.scheduler import ServiceGraph, ServiceScheduler
+
+pytestmark = pytest.mark.unit
+
+
+def _graph(**depends_on):
+    return ServiceGraph(
+        {
+            name: {"depends_on": deps, "container_name": name}
+            for name, deps in depends_on.items()
+        }
+    )
+
+
+NGINX_GRAPH = dict(
+    teddycloud=[],
+    **{"nginx-auth": ["teddycloud"], "nginx-edge": ["teddycloud", "nginx-auth"]},
+    certbot=["nginx-edge"],
+)
+
+
+def test_waves_order_dependencies_first():
+    graph = _graph(**NGINX_GRAPH)
+    assert graph.waves() == [
+        ["teddycloud"],
+        ["nginx-auth"],
+        ["nginx-edge"],
+        ["certbot"],
+    ]
+
+
+def test_waves_reverse_order_dependents_first():
+    graph = _graph(**NGINX_GRAPH)
+    assert graph.waves(reverse=True) == [
+        ["certbot"],
+        ["nginx-edge"],
+        ["nginx-auth"],
+        ["teddycloud"],
+    ]
+
+
+def test_independent_services_share_a_wave():
+    graph = _graph(a=[], b=[], c=["a", "b"], d=["a"])
+    assert graph.waves() == [["a", "b"], ["c", "d"]]
+
+
+def test_waves_ignore_unselected_and_unknown_services():
+    graph = _graph(**NGINX_GRAPH)
+    assert graph.waves(["nginx-edge", "certbot", "missing"]) == [
+        ["nginx-edge"],
+        ["certbot"],
+    ]
+
+
+def test_waves_reject_cycles():
+    graph = _graph(a=["b"], b=["a"], c=[])
+    with pytest.raises(ValueError):
+        graph.waves()
+
+
+def test_with_dependencies_is_transitive():
+    graph = _graph(**NGINX_GRAPH)
+    assert graph.with_dependencies(["certbot"]) == set(NGINX_GRAPH)
+    assert graph.dependents("teddycloud") == ["nginx-auth", "nginx-edge"]
+
+
+def test_from_compose_config_accepts_long_depends_on_syntax():
+    graph = ServiceGraph.from_compose_config(
+        {
+            "services": {
+                "app": {"image": "app", "healthcheck": {"disable": True}},
+                "proxy": {
+                    "depends_on": {"app": {"condition": "service_started"}},
+                    "healthcheck": {"test": ["CMD", "true"]},
+                },
+            }
+        }
+    )
+    assert graph.waves() == [["app"], ["proxy"]]
+    assert graph.services["app"]["healthcheck"] is None
+    assert graph.services["proxy"]["healthcheck"] == ["CMD", "true"]
+
+
+def test_parse_compose_file(tmp_path):
+    compose = tmp_path / "docker-compose.yml"
+    compose.write_text(
+        "name: test\n"
+        "services:\n"
+        "  app:\n"
+        "    container_name: app-1\n"
+        "    image: app:latest\n"
+        "    healthcheck:\n"
+        '      test: ["CMD", "true"]\n'
+        "  proxy:\n"
+        "    depends_on:\n"
+        "      - app\n"
+        "volumes:\n"
+        "  data:\n"
+    )
+    graph = scheduler._parse_compose_file(str(compose))
+    assert graph.waves() == [["app"], ["proxy"]]
+    assert graph.services["app"]["container_name"] == "app-1"
+    assert graph.services["app"]["healthcheck"] == ["CMD", "true"]
+
+
+@pytest.fixture
+def service_scheduler(monkeypatch):
+    monkeypatch.setattr(
+        scheduler, "load_service_graph", lambda *args: _graph(**NGINX_GRAPH)
+    )
+    monkeypatch.setattr(scheduler, "get_service_monitor", lambda: None)
+    instance = ServiceScheduler("/unused")
+    instance.calls = []
+    monkeypatch.setattr(instance, "_compose", lambda *args: instance.calls.append(args))
+    monkeypatch.setattr(
+        instance, "wait_until_ready", lambda service: service != "nginx-auth"
+    )
+    return instance
+
+
+def test_start_creates_containers_once_before_starting(service_scheduler):
+    success, failed = service_scheduler.start(["nginx-edge"])
+    assert not success
+    assert failed == ["nginx-auth", "nginx-edge"]
+    assert service_scheduler.calls == [
+        ("up", "--no-start", "nginx-auth", "nginx-edge", "teddycloud"),
+        ("start", "teddycloud"),
+        ("start", "nginx-auth"),
+    ]
+
+
+def test_upgrade_restarts_running_dependents_of_recreated_services(
+    service_scheduler, monkeypatch
+):
+    monkeypatch.setattr(service_scheduler, "wait_until_ready", lambda service: True)
+    monkeypatch.setattr(service_scheduler, "pull_images", lambda services: {})
+    monkeypatch.setattr(
+        service_scheduler, "changed_services", lambda services: {"teddycloud": "image"}
+    )
+    monkeypatch.setattr(
+        service_scheduler, "_is_running", lambda service: service != "certbot"
+    )
+
+    result = service_scheduler.upgrade()
+
+    assert result["success"]
+    assert result["restarted"] == ["nginx-auth", "nginx-edge"]
+    assert service_scheduler.calls == [
+        ("up", "-d", "--no-deps", "teddycloud"),
+        ("restart", "nginx-auth"),
+        ("restart", "nginx-edge"),
+    ]
+    assert set(result["downtimes"]) == {"teddycloud", "nginx-auth", "nginx-edge"}
@@ -0,0 +1,59 @@
+"""Tests for configuration validation."""
+
+import pytest
+
+from TeddyCloudStarter.configuration.io_profile import IO_PROFILES
+from TeddyCloudStarter.configuration.logging_profile import LOGGING_PROFILES
+from TeddyCloudStarter.configuration.performance import PERFORMANCE_PROFILES
+from TeddyCloudStarter.utilities.validation import validate_config
+
+pytestmark = pytest.mark.unit
+
+
+def _nginx_config(**nginx):
+    config = {
+        "mode": "nginx",
+        "nginx": {
+            "domain": "example.com",
+            "https_mode": "self_signed",
+            "security": {"type": "none", "allowed_ips": []},
+        },
+    }
+    config["nginx"].update(nginx)
+    return config
+
+
+def _errors(config):
+    return validate_config(config)[1]
+
+
+@pytest.mark.parametrize("profile", PERFORMANCE_PROFILES)
+def test_every_performance_profile_is_valid(profile):
+    assert _errors(_nginx_config(performance_profile=profile)) == []
+
+
+def test_every_logging_and_io_profile_is_valid():
+    for logging_profile in LOGGING_PROFILES:
+        for io_profile in IO_PROFILES:
+            config = _nginx_config()
+            config.update(logging_profile=logging_profile, io={"profile": io_profile})
+            assert _errors(config) == []
+
+
+def test_unknown_profiles_are_rejected():
+    config = _nginx_config(performance_profile="huge")
+    config.update(logging_profile="verbose", io={"profile": "ramdisk"})
+    assert len(_errors(config)) == 3
+
+
+@pytest.mark.parametrize("keepalive", [True, -1, "8"])
+def test_invalid_keepalive_sizes_are_rejected(keepalive):
+    assert _errors(_nginx_config(upstream_keepalive=keepalive))
+
+
+def test_resource_limits_use_the_generator_memory_format():
+    config = _nginx_config()
+    config["io"] = {"resource_limits": {"nginx-auth": {"memory": "256m", "cpus": 0.5}}}
+    assert _errors(config) == []
+    config["io"]["resource_limits"]["nginx-auth"]["memory"] = "256 MB"
+    assert _errors(config)
@@ -0,0 +1,63 @@
+"""Tests for the listing caches filled by the background warm-up."""
+
+import os
+
+import pytest
+
+from TeddyCloudStarter.docker.manager import DockerManager
+from TeddyCloudStarter.utilities.warmup import file_stamps
+
+pytestmark = pytest.mark.unit
+
+
+def _docker_manager():
+    # Skip the docker availability check, the listing only reads files
+    manager = DockerManager.__new__(DockerManager)
+    manager._backup_listing = None
+    return manager
+
+
+def test_file_stamps_change_when_file_overwritten_in_place(tmp_path):
+    target = tmp_path / "client.crt"
+    target.write_text("one")
+    (tmp_path / "notes.txt").write_text("ignored")
+    before = file_stamps(tmp_path, ".crt")
+    dir_mtime = os.stat(tmp_path).st_mtime_ns
+
+    target.write_text("changed")
+    os.utime(target, ns=(1, 1))
+
+    assert os.stat(tmp_path).st_mtime_ns == dir_mtime
+    assert [name for name, _, _ in before] == ["client.crt"]
+    assert file_stamps(tmp_path, ".crt") != before
+
+
+def test_file_stamps_missing_directory_is_not_created(tmp_path):
+    missing = tmp_path / "data" / "backup"
+    assert file_stamps(missing) is None
+    assert not missing.exists()
+
+
+def test_volume_backup_listing_is_reused_until_files_change(tmp_path, monkeypatch):
+    backup_dir = tmp_path / "data" / "backup"
+    backup_dir.mkdir(parents=True)
+    backup = backup_dir / "teddycloud-config-backup-20260101-000000.tar.gz"
+    backup.write_bytes(b"old")
+    manager = _docker_manager()
+    calls = []
+    original = DockerManager._list_volume_backups
+
+    def counting(directory):
+        calls.append(directory)
+        return original(directory)
+
+    monkeypatch.setattr(DockerManager, "_list_volume_backups", staticmethod(counting))
+
+    expected = {"teddycloudstarter_config": [backup.name]}
+    assert manager.get_volume_backups(str(tmp_path)) == expected
+    assert manager.get_volume_backups(str(tmp_path)) == expected
+    assert len(calls) == 1
+
+    backup.write_bytes(b"overwritten backup")
+    manager.get_volume_backups(str(tmp_path))
+    assert len(calls) == 2